@@ -32,6 +32,8 @@ from confidence_tom.data.scale_dataset import (  # noqa: E402
 )
 from confidence_tom.eval.static_evaluators import build_static_evaluator  # noqa: E402
 from confidence_tom.infra.client import LLMClient  # noqa: E402
+from confidence_tom.infra.http_pool import closing_shared_clients  # noqa: E402
+from confidence_tom.infra.response_cache import ResponseCache  # noqa: E402
 from confidence_tom.intervention import ModelPricing, trace_to_cost  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-7s | %(message)s")
@@ -181,10 +183,22 @@ async def _backfill(args: argparse.Namespace) -> None:
             "reasoning_per_1k": float(args.large_reasoning_per_1k),
         }
 
-    large_client = LLMClient(**_client_kwargs_from_cfg(cfg.large_worker))
+    response_cache = (
+        ResponseCache(
+            namespace=args.response_cache_namespace,
+            max_bytes=int(args.response_cache_max_gb * 1024**3),
+        )
+        if args.response_cache_namespace
+        else None
+    )
+    large_client = LLMClient(
+        **_client_kwargs_from_cfg(cfg.large_worker), response_cache=response_cache
+    )
     extract_client = None
     if bool(cfg.extractor.enabled):
-        extract_client = LLMClient(**_client_kwargs_from_cfg(cfg.extractor))
+        extract_client = LLMClient(
+            **_client_kwargs_from_cfg(cfg.extractor), response_cache=response_cache
+        )
     large_pricing: ModelPricing | None = _pricing_from_cfg(cfg, str(cfg.large_worker.model))
 
     touched = 0
@@ -254,6 +268,8 @@ async def _backfill(args: argparse.Namespace) -> None:
         if task_changed:
             row["prefix_oracle_steps"] = steps
             _atomic_write(output_path, rows)
+    if response_cache is not None:
+        logger.info("response_cache.stats %s", response_cache.stats())
     logger.info("Done. Updated large-side steps=%d output=%s", touched, output_path)
 
 
@@ -309,6 +325,12 @@ def main() -> None:
     backfill.add_argument("--large-input-per-1k", type=float, default=0.0)
     backfill.add_argument("--large-output-per-1k", type=float, default=0.0)
     backfill.add_argument("--large-reasoning-per-1k", type=float, default=0.0)
+    backfill.add_argument(
+        "--response-cache-namespace",
+        default=None,
+        help="Serve temperature-0 calls from the on-disk response cache under this namespace.",
+    )
+    backfill.add_argument("--response-cache-max-gb", type=float, default=2.0)
 
     args = parser.parse_args()
     if args.command == "progress":
@@ -316,7 +338,7 @@ def main() -> None:
         large_workers = [type("Obj", (), {"family": family}) for family in args.large_families]
         _show_progress(int(args.limit), small_workers, large_workers)
     else:
-        asyncio.run(_backfill(args))
+        asyncio.run(closing_shared_clients(_backfill(args)))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 import hashlib
 import json
@@ -10,6 +11,7 @@ from typing import Any, cast
 import numpy as np
 
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.http_pool import closing_shared_clients
 from confidence_tom.infra.paths import results_root
 
 RESULTS_DIR = results_root()
@@ -20,6 +22,7 @@ OUT_EMBEDDINGS = OUT_DIR / "pilot_embeddings.npz"
 OUT_META = OUT_DIR / "pilot_meta.json"
 
 EMBED_MODEL = "google/gemini-embedding-001"
+EMBED_BATCH_SIZE = 64
 MAX_PER_RUN = 40
 
 
@@ -95,14 +98,19 @@ def main() -> None:
     rows = _load_sample_rows()
     client = LLMClient(model="openai/gpt-5.4")
 
-    embeddings: list[list[float]] = []
+    embeddings = asyncio.run(
+        closing_shared_clients(
+            client.aembed_batch(
+                [cast(str, row["prefix_text"]) for row in rows],
+                model=EMBED_MODEL,
+                batch_size=EMBED_BATCH_SIZE,
+            )
+        )
+    )
     with OUT_ROWS.open("w", encoding="utf-8") as f:
-        for i, row in enumerate(rows, start=1):
-            vec = client.embed_text(cast(str, row["prefix_text"]), model=EMBED_MODEL)
-            embeddings.append(vec)
+        for row in rows:
             f.write(json.dumps(row, ensure_ascii=False) + "\n")
-            if i % 20 == 0:
-                print(f"embedded {i}/{len(rows)}")
+    print(f"embedded {len(rows)} rows")
 
     matrix = np.asarray(embeddings, dtype=np.float32)
     np.savez_compressed(OUT_EMBEDDINGS, embeddings=matrix)
@@ -37,6 +37,7 @@ from confidence_tom.data.scale_dataset import (  # noqa: E402
 )
 from confidence_tom.eval.static_evaluators import build_static_evaluator  # noqa: E402
 from confidence_tom.infra.client import LLMClient  # noqa: E402
+from confidence_tom.infra.http_pool import closing_shared_clients  # noqa: E402
 from confidence_tom.intervention import (  # noqa: E402
     PrefixOracleGainStepResult,
     PrefixOracleGainTaskResult,
@@ -479,7 +480,7 @@ def _add_common_single_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--small-model", required=True)
     parser.add_argument("--small-label", required=True)
     parser.add_argument(
-        "--small-backend", choices=["openrouter", "ollama", "local"], default="openrouter"
+        "--small-backend", choices=["openrouter", "ollama", "local", "replay"], default="openrouter"
     )
     parser.add_argument("--small-local-model-name", default=None)
     parser.add_argument("--small-max-tokens", type=int, default=8192)
@@ -496,7 +497,9 @@ def _add_common_single_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--extractor-enabled", action="store_true")
     parser.add_argument("--extractor-model", default="openai/gpt-5.4")
     parser.add_argument(
-        "--extractor-backend", choices=["openrouter", "ollama", "local"], default="openrouter"
+        "--extractor-backend",
+        choices=["openrouter", "ollama", "local", "replay"],
+        default="openrouter",
     )
     parser.add_argument("--extractor-max-tokens", type=int, default=512)
     parser.add_argument("--task-concurrency", type=int, default=1)
@@ -621,7 +624,7 @@ def main() -> None:
     matrix.add_argument("--livebench-limit", type=int, default=0)
     matrix.add_argument("--output-prefix", default="colab_full_small")
     matrix.add_argument(
-        "--small-backend", choices=["ollama", "openrouter", "local"], default="ollama"
+        "--small-backend", choices=["ollama", "openrouter", "local", "replay"], default="ollama"
     )
     matrix.add_argument("--temperature", type=float, default=0.0)
     matrix.add_argument("--top-p", type=float, default=0.9)
@@ -637,14 +640,16 @@ def main() -> None:
     matrix.add_argument("--extractor-enabled", action="store_true")
     matrix.add_argument("--extractor-model", default="openai/gpt-5.4")
     matrix.add_argument(
-        "--extractor-backend", choices=["openrouter", "ollama", "local"], default="openrouter"
+        "--extractor-backend",
+        choices=["openrouter", "ollama", "local", "replay"],
+        default="openrouter",
     )
     matrix.add_argument("--pull-before-run", action="store_true")
     matrix.add_argument("--delete-after-run", action="store_true")
 
     args = parser.parse_args()
     if args.command == "single":
-        asyncio.run(_run_single(args))
+        asyncio.run(closing_shared_clients(_run_single(args)))
     else:
         _run_matrix(args)
 
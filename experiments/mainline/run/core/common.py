@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 from typing import Any, Optional, cast
 
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
 
 from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.data.scale_dataset import load_livebench_reasoning, load_olympiadbench
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.concurrency import AdaptiveConcurrency
+from confidence_tom.infra.hedging import HedgePolicy
+from confidence_tom.infra.response_cache import ResponseCache
+from confidence_tom.infra.token_budget import TokenBudget
 from confidence_tom.intervention import ModelPricing
 
 
@@ -25,12 +30,69 @@ def client_kwargs_from_cfg(worker_cfg: DictConfig) -> dict[str, Any]:
         "num_ctx": worker_cfg.get("num_ctx"),
         "num_predict": worker_cfg.get("num_predict"),
         "enable_thinking": worker_cfg.get("enable_thinking"),
+        "hedge": hedge_policy_from_cfg(worker_cfg.get("hedge")),
+        "replay_cassette": worker_cfg.get("replay_cassette"),
+        "replay_latency_scale": worker_cfg.get("replay_latency_scale"),
+        "logprob_confidence": bool(worker_cfg.get("logprob_confidence", False)),
+        "top_logprobs": int(worker_cfg.get("top_logprobs", 5)),
+        "token_budget": token_budget_from_cfg(worker_cfg.get("token_budget")),
     }
     valid = set(inspect.signature(LLMClient.__init__).parameters.keys())
     valid.discard("self")
     return {k: v for k, v in raw_kwargs.items() if k in valid}
 
 
+def hedge_policy_from_cfg(hedge_cfg: Optional[DictConfig]) -> Optional[HedgePolicy]:
+    if not hedge_cfg or not bool(hedge_cfg.get("enabled", False)):
+        return None
+    provider = hedge_cfg.get("provider")
+    return HedgePolicy(
+        percentile=float(hedge_cfg.get("percentile", 0.95)),
+        min_samples=int(hedge_cfg.get("min_samples", 20)),
+        initial_delay_sec=float(hedge_cfg.get("initial_delay_sec", 60.0)),
+        provider=cast(dict[str, Any], OmegaConf.to_container(provider)) if provider else None,
+        model=hedge_cfg.get("model"),
+    )
+
+
+def token_budget_from_cfg(budget_cfg: Optional[DictConfig]) -> Optional[TokenBudget]:
+    if not budget_cfg or not bool(budget_cfg.get("enabled", False)):
+        return None
+    window = budget_cfg.get("context_window")
+    return TokenBudget(
+        overflow=str(budget_cfg.get("overflow", "refuse")),
+        min_completion_tokens=int(budget_cfg.get("min_completion_tokens", 256)),
+        margin_tokens=int(budget_cfg.get("margin_tokens", 64)),
+        context_window=int(window) if window else None,
+    )
+
+
+def response_cache_from_cfg(cache_cfg: Optional[DictConfig]) -> Optional[ResponseCache]:
+    if not cache_cfg or not bool(cache_cfg.get("enabled", False)):
+        return None
+    return ResponseCache(
+        namespace=str(cache_cfg.get("namespace") or "default"),
+        max_bytes=int(float(cache_cfg.get("max_gb", 2.0)) * 1024**3),
+        cache_sampled=bool(cache_cfg.get("cache_sampled", False)),
+    )
+
+
+def concurrency_from_cfg(
+    execution_cfg: DictConfig, default: int = 1
+) -> asyncio.Semaphore | AdaptiveConcurrency:
+    concurrency = max(1, int(execution_cfg.get("task_concurrency", default)))
+    adaptive_cfg = execution_cfg.get("adaptive_concurrency") or {}
+    if not bool(adaptive_cfg.get("enabled", False)):
+        return asyncio.Semaphore(concurrency)
+    return AdaptiveConcurrency(
+        concurrency,
+        min_limit=int(adaptive_cfg.get("min", 1)),
+        max_limit=int(adaptive_cfg.get("max", max(concurrency, 16))),
+        window=int(adaptive_cfg.get("window", 20)),
+        name="tasks",
+    )
+
+
 def sanitize_label(text: str) -> str:
     return text.replace("/", "_").replace(":", "_").replace("-", "_").replace(".", "_")
 
@@ -43,6 +105,11 @@ def pricing_from_cfg(cfg: DictConfig, model_name: str) -> Optional[ModelPricing]
         input_per_1k=float(item.get("input_per_1k", 0.0)),
         output_per_1k=float(item.get("output_per_1k", 0.0)),
         reasoning_per_1k=float(item.get("reasoning_per_1k", 0.0)),
+        cached_input_per_1k=(
+            float(item["cached_input_per_1k"])
+            if item.get("cached_input_per_1k") is not None
+            else None
+        ),
     )
     if (
         pricing.input_per_1k == 0.0
@@ -10,6 +10,7 @@ from typing import Any
 
 from confidence_tom.data.scale_dataset import load_livebench_reasoning, load_olympiadbench
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.http_pool import closing_shared_clients
 
 
 def _sha256_text(text: str) -> str:
@@ -190,7 +191,7 @@ def main() -> None:
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    result = asyncio.run(_main_async(args))
+    result = asyncio.run(closing_shared_clients(_main_async(args)))
     output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2))
     print(f"[saved] {output_path}")
     print(json.dumps(result["summary"], ensure_ascii=False, indent=2))
@@ -19,6 +19,7 @@ from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.eval.static_evaluators import build_static_evaluator
 from confidence_tom.infra.client import LLMClient
 from confidence_tom.infra.client_utils import coerce_json_response as _coerce_json_response
+from confidence_tom.infra.http_pool import closing_shared_clients
 from confidence_tom.intervention import (
     InterventionOutcome,
     NextStepOutput,
@@ -228,9 +229,10 @@ async def _run_small_iterative(
         if bool(cfg.embedding.enabled):
             try:
                 logger.info("embedding.start task=%s step=%d", task.id, step_idx)
-                emb = await asyncio.wait_for(
-                    client.aembed_text(
-                        step.reasoning or step.partial_answer, model=str(cfg.embedding.model)
+                # Goes through the persistent embedding cache; steps repeat across runs.
+                (emb,) = await asyncio.wait_for(
+                    client.aembed_batch(
+                        [step.reasoning or step.partial_answer], model=str(cfg.embedding.model)
                     ),
                     timeout=int(cfg.timeouts.embedding_sec),
                 )
@@ -328,12 +330,14 @@ async def _evaluate_task(
         temperature=float(cfg.small_worker.temperature),
         max_tokens=int(cfg.small_worker.max_tokens),
         reasoning_effort=cfg.small_worker.get("reasoning_effort"),
+        backend=cfg.small_worker.get("backend"),
     )
     large_client = LLMClient(
         model=large_model,
         temperature=float(cfg.large_worker.temperature),
         max_tokens=int(cfg.large_worker.max_tokens),
         reasoning_effort=cfg.large_worker.get("reasoning_effort"),
+        backend=cfg.large_worker.get("backend"),
     )
     extract_cfg = cfg.get("extractor", {})
     extract_client = None
@@ -343,6 +347,7 @@ async def _evaluate_task(
             temperature=float(extract_cfg.get("temperature", 0.0)),
             max_tokens=int(extract_cfg.get("max_tokens", 512)),
             reasoning_effort=extract_cfg.get("reasoning_effort"),
+            backend=extract_cfg.get("backend"),
         )
     router = ThresholdRouter(
         min_step_confidence=float(cfg.router.min_step_confidence),
@@ -527,7 +532,7 @@ def main(cfg: DictConfig) -> None:
                 store.save(outcome)
                 logger.info("store.save.done task=%s", task.id)
 
-        asyncio.run(_run_all())
+        asyncio.run(closing_shared_clients(_run_all()))
 
 
 if __name__ == "__main__":
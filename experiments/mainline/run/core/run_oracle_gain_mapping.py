@@ -19,6 +19,7 @@ from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.eval.static_evaluators import build_static_evaluator
 from confidence_tom.infra.client import LLMClient
 from confidence_tom.infra.client_utils import coerce_json_response as _coerce_json_response
+from confidence_tom.infra.http_pool import closing_shared_clients
 from confidence_tom.intervention import (
     NextStepOutput,
     OracleGainStepResult,
@@ -503,7 +504,7 @@ def main(cfg: DictConfig) -> None:
                 continue
             store.save(result)
 
-    asyncio.run(_run_all())
+    asyncio.run(closing_shared_clients(_run_all()))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
 import fcntl
 import hashlib
@@ -13,7 +14,10 @@ from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.data.scale_dataset import load_livebench_reasoning, load_olympiadbench
 from confidence_tom.eval.static_evaluators import build_static_evaluator
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.concurrency import AdaptiveConcurrency
+from confidence_tom.infra.http_pool import closing_shared_clients
 from confidence_tom.infra.paths import project_root, results_root
+from confidence_tom.infra.telemetry import configure_telemetry, format_telemetry_summary
 
 ROOT = project_root()
 RESULTS_DIR = results_root()
@@ -27,6 +31,7 @@ LOCK_PATH = OUT_DIR / ".pilot.lock"
 
 MAX_PER_RUN = 2
 CONCURRENCY = 4
+MAX_CONCURRENCY = 16
 REWRITE_MODEL = "openai/gpt-5.4"
 REWRITE_MAX_TOKENS = 600
 CONTINUE_MAX_TOKENS = 1024
@@ -245,7 +250,7 @@ async def _process_one(
     row: dict[str, Any],
     task_map: dict[str, StaticTask],
     rewrite_client: LLMClient,
-    sem: asyncio.Semaphore,
+    sem: asyncio.Semaphore | AdaptiveConcurrency,
 ) -> dict[str, object]:
     async with sem:
         benchmark, small_model = RUN_SPECS[str(row["run_name"])]
@@ -392,8 +397,9 @@ def _to_markdown(summary: dict[str, object]) -> str:
     return "\n".join(lines)
 
 
-async def amain() -> None:
+async def amain(args: argparse.Namespace) -> None:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
+    configure_telemetry(OUT_DIR / "llm_calls.jsonl")
     lock_file = LOCK_PATH.open("w", encoding="utf-8")
     try:
         fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -411,10 +417,21 @@ async def amain() -> None:
         "livebench_reasoning": _load_task_map("livebench_reasoning"),
     }
     rewrite_client = LLMClient(model=REWRITE_MODEL, max_tokens=REWRITE_MAX_TOKENS)
-    sem = asyncio.Semaphore(CONCURRENCY)
+    sem: asyncio.Semaphore | AdaptiveConcurrency = (
+        AdaptiveConcurrency(
+            args.concurrency,
+            max_limit=max(args.concurrency, args.max_concurrency),
+            name="fragility_rows",
+        )
+        if args.adaptive_concurrency
+        else asyncio.Semaphore(args.concurrency)
+    )
 
     with OUT_ROWS.open("a", encoding="utf-8") as f:
-        for idx, row in enumerate(todo, start=1):
+        completed = 0
+
+        async def run_row(row: dict[str, Any]) -> None:
+            nonlocal completed
             try:
                 result = await _process_one(
                     row,
@@ -422,15 +439,23 @@ async def amain() -> None:
                     rewrite_client,
                     sem,
                 )
-                f.write(json.dumps(result, ensure_ascii=False) + "\n")
-                f.flush()
-                print(f"processed {idx}/{len(todo)}")
             except Exception as exc:
                 error_row = dict(row)
                 error_row["error"] = repr(exc)
+                completed += 1
                 f.write(json.dumps(error_row, ensure_ascii=False) + "\n")
                 f.flush()
-                print(f"error {idx}/{len(todo)}: {exc}")
+                print(f"error {completed}/{len(todo)}: {exc}")
+                return
+            completed += 1
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            print(f"processed {completed}/{len(todo)}")
+
+        await asyncio.gather(*(run_row(row) for row in todo))
+    if isinstance(sem, AdaptiveConcurrency):
+        print(f"Concurrency: {sem.stats()}")
+    print(f"LLM calls:\n{format_telemetry_summary()}")
 
     rows = [row for row in _dedupe_rows() if "error" not in row]
     summary = _summarize(rows)
@@ -441,5 +466,17 @@ async def amain() -> None:
     print(f"Wrote markdown to {OUT_MD}")
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefix fragility pilot")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Start at --concurrency and adapt in-flight rows with AIMD.",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    asyncio.run(closing_shared_clients(amain(parser.parse_args())))
+
+
 if __name__ == "__main__":
-    asyncio.run(amain())
+    main()
@@ -21,24 +21,37 @@ from omegaconf import DictConfig
 from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.eval.static_evaluators import build_static_evaluator
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.concurrency import AdaptiveConcurrency, note_overload
+from confidence_tom.infra.http_pool import closing_shared_clients
+from confidence_tom.infra.prompt_layout import layered_messages, prefix_blocks
+from confidence_tom.infra.response_cache import ResponseCache
+from confidence_tom.infra.telemetry import configure_telemetry, format_telemetry_summary
 from confidence_tom.intervention import (
+    CostBreakdown,
     ExtractedFinalAnswerOutput,
     PrefixOracleGainStepResult,
     PrefixOracleGainTaskResult,
     PrefixSegment,
     SegmentedTraceOutput,
     parse_with_llm_fallback,
+    prompt_cache_summary,
     trace_to_cost,
 )
 from experiments.mainline.run.core.common import (
     client_kwargs_from_cfg as _client_kwargs_from_cfg,
 )
+from experiments.mainline.run.core.common import (
+    concurrency_from_cfg as _concurrency_from_cfg,
+)
 from experiments.mainline.run.core.common import (
     load_static_questions,
 )
 from experiments.mainline.run.core.common import (
     pricing_from_cfg as _pricing_from_cfg,
 )
+from experiments.mainline.run.core.common import (
+    response_cache_from_cfg as _response_cache_from_cfg,
+)
 from experiments.mainline.run.core.common import (
     sanitize_label as _sanitize_label,
 )
@@ -353,19 +366,23 @@ def _prefix_text(segments: list[PrefixSegment]) -> str:
 
 async def _generate_text(
     client: LLMClient,
-    messages: list[dict[str, str]],
+    messages: list[dict[str, Any]],
     timeout_sec: int,
     tag: str,
     task_id: str,
     retry_attempts: int = 1,
     retry_backoff_sec: float = 2.0,
+    early_stop: bool = False,
 ) -> tuple[str, Any]:
     last_exc: Exception | None = None
     attempts = max(1, retry_attempts)
+    generate = (
+        client.agenerate_text_stream_with_trace if early_stop else client.agenerate_text_with_trace
+    )
     for attempt in range(1, attempts + 1):
         try:
             raw, trace = await asyncio.wait_for(
-                client.agenerate_text_with_trace(
+                generate(
                     messages,
                     max_tokens=client.max_tokens,
                     temperature=client.temperature,
@@ -382,6 +399,8 @@ async def _generate_text(
             return raw, trace
         except Exception as exc:
             last_exc = exc
+            if isinstance(exc, asyncio.TimeoutError):
+                note_overload()
             if attempt >= attempts:
                 break
             backoff = retry_backoff_sec * (2 ** (attempt - 1))
@@ -408,6 +427,7 @@ async def _run_full_trace(
     timeout_sec: int,
     retry_attempts: int,
     retry_backoff_sec: float,
+    early_stop: bool = False,
 ) -> tuple[str, str, Any]:
     messages = [
         {"role": "system", "content": _FULL_TRACE_SYSTEM_PROMPT},
@@ -421,6 +441,7 @@ async def _run_full_trace(
         task.id,
         retry_attempts=retry_attempts,
         retry_backoff_sec=retry_backoff_sec,
+        early_stop=early_stop,
     )
     return raw, await _extract_answer_with_fallback(raw, extract_client), trace
 
@@ -453,18 +474,16 @@ async def _run_continue(
     tag: str,
     retry_attempts: int,
     retry_backoff_sec: float,
+    early_stop: bool = False,
 ) -> tuple[str, str, Any]:
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {
-            "role": "user",
-            "content": (
-                f"Problem:\n{task.question}\n\n"
-                f"Reasoning prefix:\n{prefix_text}\n\n"
-                "Continue from this prefix and finish the task."
-            ),
-        },
-    ]
+    # System prompt, problem and earlier segments stay a byte-identical prefix from one
+    # step to the next so provider prompt caches can serve them.
+    messages = layered_messages(
+        system_prompt,
+        f"Problem:\n{task.question}\n\nReasoning prefix:\n",
+        prefix_blocks(prefix_text),
+        "Continue from this prefix and finish the task.",
+    )
     raw, trace = await _generate_text(
         client,
         messages,
@@ -473,18 +492,29 @@ async def _run_continue(
         task.id,
         retry_attempts=retry_attempts,
         retry_backoff_sec=retry_backoff_sec,
+        early_stop=early_stop,
     )
     return raw, await _extract_answer_with_fallback(raw, extract_client), trace
 
 
-async def _map_task(task: StaticTask, cfg: DictConfig) -> PrefixOracleGainTaskResult:
+async def _map_task(
+    task: StaticTask,
+    cfg: DictConfig,
+    response_cache: Optional[ResponseCache] = None,
+) -> PrefixOracleGainTaskResult:
     partial_store = PartialTaskStore(Path(to_absolute_path(str(cfg.output_dir))) / "partials")
-    small_client = LLMClient(**_client_kwargs_from_cfg(cfg.small_worker))
-    large_client = LLMClient(**_client_kwargs_from_cfg(cfg.large_worker))
+    small_client = LLMClient(
+        **_client_kwargs_from_cfg(cfg.small_worker), response_cache=response_cache
+    )
+    large_client = LLMClient(
+        **_client_kwargs_from_cfg(cfg.large_worker), response_cache=response_cache
+    )
     extract_cfg = cfg.get("extractor", {})
     extract_client = None
     if bool(extract_cfg.get("enabled", False)):
-        extract_client = LLMClient(**_client_kwargs_from_cfg(extract_cfg))
+        extract_client = LLMClient(
+            **_client_kwargs_from_cfg(extract_cfg), response_cache=response_cache
+        )
     evaluator = build_static_evaluator(task)
     trace_id = f"{task.id}_{uuid.uuid4().hex[:8]}"
     execution_cfg = cfg.get("execution", {})
@@ -492,6 +522,7 @@ async def _map_task(task: StaticTask, cfg: DictConfig) -> PrefixOracleGainTaskRe
     retry_backoff_sec = float(execution_cfg.get("retry_backoff_sec", 2.0))
     resume_from_partials = bool(execution_cfg.get("resume_from_partials", True))
     retain_partials = bool(execution_cfg.get("retain_partials", True))
+    early_stop = bool(execution_cfg.get("stream_early_stop", False))
 
     resume_payload = partial_store.load(task.id) if resume_from_partials else None
     full_text = ""
@@ -521,6 +552,7 @@ async def _map_task(task: StaticTask, cfg: DictConfig) -> PrefixOracleGainTaskRe
             int(cfg.timeouts.full_trace_sec),
             retry_attempts,
             retry_backoff_sec,
+            early_stop=early_stop,
         )
         segments, parsed_final_answer, parse_incomplete = await _segment_full_trace(
             full_text, extract_client, task.id
@@ -586,6 +618,7 @@ async def _map_task(task: StaticTask, cfg: DictConfig) -> PrefixOracleGainTaskRe
                 tag="small_continue_prefix",
                 retry_attempts=retry_attempts,
                 retry_backoff_sec=retry_backoff_sec,
+                early_stop=early_stop,
             )
         except Exception:
             logger.error(
@@ -607,6 +640,7 @@ async def _map_task(task: StaticTask, cfg: DictConfig) -> PrefixOracleGainTaskRe
                 tag="large_takeover_prefix",
                 retry_attempts=retry_attempts,
                 retry_backoff_sec=retry_backoff_sec,
+                early_stop=early_stop,
             )
         except Exception:
             logger.error(
@@ -718,34 +752,35 @@ def main(cfg: DictConfig) -> None:
         f"{_sanitize_label(str(cfg.large_worker.label))}.json"
     )
     store = ResultStore(out_path)
+    response_cache = _response_cache_from_cfg(cfg.get("response_cache"))
+    if bool(cfg.get("telemetry", {}).get("jsonl", True)):
+        configure_telemetry(output_dir / "llm_calls.jsonl")
     logger.info("Loaded %d tasks for prefix oracle gain mapping", len(questions))
 
     async def _run_all() -> None:
-        execution_cfg = cfg.get("execution", {})
-        concurrency = max(1, int(execution_cfg.get("task_concurrency", 1)))
-        sem = asyncio.Semaphore(concurrency)
+        sem = _concurrency_from_cfg(cfg.get("execution", {}))
         save_lock = asyncio.Lock()
 
         async def _run_one(i: int, task: StaticTask) -> None:
             if store.has(task.id):
                 return
-            async with sem:
-                logger.info("[%d/%d] %s", i, len(questions), task.id)
-                try:
+            # Failures leave the slot as exceptions, so an adaptive limit sees each
+            # timeout exactly once (as overload) in `__aexit__`.
+            try:
+                async with sem:
+                    logger.info("[%d/%d] %s", i, len(questions), task.id)
                     result = await asyncio.wait_for(
-                        _map_task(task, cfg),
+                        _map_task(task, cfg, response_cache),
                         timeout=float(cfg.timeouts.task_sec),
                     )
-                except asyncio.TimeoutError:
-                    logger.error(
-                        "task.timeout task=%s timeout_sec=%s", task.id, cfg.timeouts.task_sec
-                    )
-                    return
-                except Exception:
-                    logger.error("task.error task=%s\n%s", task.id, traceback.format_exc())
-                    return
-                async with save_lock:
-                    store.save(result)
+            except asyncio.TimeoutError:
+                logger.error("task.timeout task=%s timeout_sec=%s", task.id, cfg.timeouts.task_sec)
+                return
+            except Exception:
+                logger.error("task.error task=%s\n%s", task.id, traceback.format_exc())
+                return
+            async with save_lock:
+                store.save(result)
 
         pending = [
             asyncio.create_task(_run_one(i, task))
@@ -754,8 +789,21 @@ def main(cfg: DictConfig) -> None:
         ]
         if pending:
             await asyncio.gather(*pending)
-
-    asyncio.run(_run_all())
+        if isinstance(sem, AdaptiveConcurrency):
+            logger.info("concurrency.stats %s", sem.stats())
+
+    asyncio.run(closing_shared_clients(_run_all()))
+    step_costs = [
+        CostBreakdown.model_validate(step[key])
+        for row in store.rows
+        for step in row.get("prefix_oracle_steps", [])
+        for key in ("small_continue_cost", "large_takeover_cost")
+        if step.get(key)
+    ]
+    logger.info("prompt_cache.stats %s", prompt_cache_summary(step_costs))
+    logger.info("llm_calls.summary\n%s", format_telemetry_summary())
+    if response_cache is not None:
+        logger.info("response_cache.stats %s", response_cache.stats())
 
 
 if __name__ == "__main__":
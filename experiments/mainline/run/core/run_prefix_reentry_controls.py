@@ -15,8 +15,14 @@ from confidence_tom.data.dataset_models import StaticTask
 from confidence_tom.data.scale_dataset import load_livebench_reasoning, load_olympiadbench
 from confidence_tom.eval.static_evaluators import build_static_evaluator
 from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.concurrency import AdaptiveConcurrency
+from confidence_tom.infra.http_pool import closing_shared_clients
 from confidence_tom.infra.paths import project_root, results_root
-from confidence_tom.intervention.voi import trace_to_cost
+from confidence_tom.infra.prompt_layout import layered_messages, prefix_blocks
+from confidence_tom.infra.response_cache import ResponseCache
+from confidence_tom.infra.telemetry import configure_telemetry, format_telemetry_summary
+from confidence_tom.intervention.models import CostBreakdown
+from confidence_tom.intervention.voi import prompt_cache_summary, trace_to_cost
 
 ROOT = project_root()
 RESULTS_DIR = results_root()
@@ -284,6 +290,15 @@ def _safe_rate(rows: list[dict[str, Any]], field: str) -> float | None:
     return sum(int(row[field]) for row in rows) / len(rows)
 
 
+_COST_KEYS = (
+    "full_rerun_cost",
+    "reentry_exact_cost",
+    "reentry_repeat_cost",
+    "reentry_marker_cost",
+    "reentry_fenced_cost",
+)
+
+
 def _summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
     if not rows:
         return {"rows": 0}
@@ -301,6 +316,12 @@ def _summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
         "positive_takeover_given_reentry_mismatch": None,
         "by_benchmark": {},
         "by_small_family": {},
+        "prompt_cache": prompt_cache_summary(
+            CostBreakdown.model_validate(row[key])
+            for row in rows
+            for key in _COST_KEYS
+            if row.get(key)
+        ),
     }
 
     matched = [row for row in rows if int(row["reentry_exact_matches_original_small"]) == 1]
@@ -391,6 +412,7 @@ def _to_markdown(summary: dict[str, Any]) -> str:
         f"- re-entry repeat match rate: `{fmt(summary['reentry_repeat_match_rate'])}`",
         f"- marker boundary match rate: `{fmt(summary['marker_boundary_match_rate'])}`",
         f"- fenced boundary match rate: `{fmt(summary['fenced_boundary_match_rate'])}`",
+        f"- prompt cache hit ratio: `{fmt(summary['prompt_cache']['cache_hit_ratio'])}`",
         (
             "- P(full-trace success | re-entry match): "
             f"`{fmt(summary['full_trace_success_given_reentry_match'])}`"
@@ -439,40 +461,42 @@ def _build_full_trace_messages(question: str) -> list[dict[str, str]]:
     ]
 
 
-def _build_reentry_messages(question: str, prefix_text: str, variant: str) -> list[dict[str, str]]:
+def _build_reentry_messages(question: str, prefix_text: str, variant: str) -> list[dict[str, Any]]:
+    # Laid out as cacheable text parts; the concatenated user text is unchanged.
     if variant == "exact":
-        content = (
-            f"Problem:\n{question}\n\nReasoning prefix:\n{prefix_text}\n\nContinue and finish."
-        )
+        head = f"Problem:\n{question}\n\nReasoning prefix:\n"
+        growing = prefix_blocks(prefix_text)
+        tail = "Continue and finish."
     elif variant == "marker":
-        content = (
-            f"Problem:\n{question}\n\nReasoning prefix:\n{prefix_text}\n\n"
-            "<CONTINUE_FROM_PREFIX>\nContinue from the next step only and finish."
-        )
+        head = f"Problem:\n{question}\n\nReasoning prefix:\n"
+        growing = prefix_blocks(prefix_text)
+        tail = "<CONTINUE_FROM_PREFIX>\nContinue from the next step only and finish."
     elif variant == "fenced":
-        content = (
-            f"Problem:\n{question}\n\n<prefix>\n{prefix_text}\n</prefix>\n\n"
-            "Continue after the prefix and finish."
-        )
+        head = f"Problem:\n{question}\n\n<prefix>\n"
+        growing = [f"{prefix_text}\n"]
+        tail = "</prefix>\n\nContinue after the prefix and finish."
     else:
         raise ValueError(f"Unknown variant: {variant}")
-    return [
-        {"role": "system", "content": REENTRY_SYSTEM_PROMPT},
-        {"role": "user", "content": content},
-    ]
+    return layered_messages(REENTRY_SYSTEM_PROMPT, head, growing, tail)
 
 
 async def _generate_one(
     client: LLMClient,
-    messages: list[dict[str, str]],
+    messages: list[dict[str, Any]],
     *,
     max_tokens: int,
     temperature: float,
+    use_cache: bool = True,
+    early_stop: bool = False,
 ) -> tuple[str, dict[str, Any]]:
-    text, trace = await client.agenerate_text_with_trace(
+    generate = (
+        client.agenerate_text_stream_with_trace if early_stop else client.agenerate_text_with_trace
+    )
+    text, trace = await generate(
         messages,
         max_tokens=max_tokens,
         temperature=temperature,
+        use_cache=use_cache,
     )
     return text, trace_to_cost(trace).model_dump()
 
@@ -487,6 +511,8 @@ async def _process_one(
     reentry_temperature: float,
     small_backend: str,
     small_local_model_name: str | None,
+    response_cache: ResponseCache | None = None,
+    early_stop: bool = False,
 ) -> dict[str, Any]:
     task = task_map[str(row["task_id"])]
     evaluator = build_static_evaluator(task)
@@ -508,6 +534,7 @@ async def _process_one(
             max_tokens=max_tokens,
             backend=small_backend,
             local_model_name=resolved_local_model_name,
+            response_cache=response_cache,
         ),
     )
 
@@ -522,6 +549,7 @@ async def _process_one(
         _build_full_trace_messages(task.question),
         max_tokens=max_tokens,
         temperature=full_rerun_temperature,
+        early_stop=early_stop,
     )
     full_rerun_answer = _answer_or_raw(full_rerun_text)
     full_rerun_eval = evaluator(full_rerun_answer, task)
@@ -531,15 +559,20 @@ async def _process_one(
         _build_reentry_messages(task.question, prefix_text, "exact"),
         max_tokens=max_tokens,
         temperature=reentry_temperature,
+        early_stop=early_stop,
     )
     exact_answer = _answer_or_raw(exact_text)
     exact_eval = evaluator(exact_answer, task)
 
+    # The repeat call measures run-to-run stability, so it must never be served
+    # from the response cache.
     repeat_text, repeat_cost = await _generate_one(
         client,
         _build_reentry_messages(task.question, prefix_text, "exact"),
         max_tokens=max_tokens,
         temperature=reentry_temperature,
+        use_cache=False,
+        early_stop=early_stop,
     )
     repeat_answer = _answer_or_raw(repeat_text)
     repeat_eval = evaluator(repeat_answer, task)
@@ -549,6 +582,7 @@ async def _process_one(
         _build_reentry_messages(task.question, prefix_text, "marker"),
         max_tokens=max_tokens,
         temperature=reentry_temperature,
+        early_stop=early_stop,
     )
     marker_answer = _answer_or_raw(marker_text)
     marker_eval = evaluator(marker_answer, task)
@@ -558,6 +592,7 @@ async def _process_one(
         _build_reentry_messages(task.question, _normalize_prefix_surface(prefix_text), "fenced"),
         max_tokens=max_tokens,
         temperature=reentry_temperature,
+        early_stop=early_stop,
     )
     fenced_answer = _answer_or_raw(fenced_text)
     fenced_eval = evaluator(fenced_answer, task)
@@ -596,6 +631,7 @@ async def amain(args: argparse.Namespace) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     out_rows = output_dir / "reentry_rows.jsonl"
     out_summary = output_dir / "reentry_summary.json"
+    configure_telemetry(output_dir / "llm_calls.jsonl")
     out_md = (
         ROOT
         / "docs"
@@ -651,7 +687,23 @@ async def amain(args: argparse.Namespace) -> None:
         "livebench_reasoning": _load_task_map("livebench_reasoning"),
     }
     client_cache: dict[str, LLMClient] = {}
-    sem = asyncio.Semaphore(args.concurrency)
+    response_cache = (
+        ResponseCache(
+            namespace=args.response_cache_namespace,
+            max_bytes=int(args.response_cache_max_gb * 1024**3),
+        )
+        if args.response_cache_namespace
+        else None
+    )
+    sem: asyncio.Semaphore | AdaptiveConcurrency = (
+        AdaptiveConcurrency(
+            args.concurrency,
+            max_limit=max(args.concurrency, args.max_concurrency),
+            name="reentry_rows",
+        )
+        if args.adaptive_concurrency
+        else asyncio.Semaphore(args.concurrency)
+    )
 
     async def worker(row: dict[str, Any]) -> dict[str, Any]:
         async with sem:
@@ -664,29 +716,48 @@ async def amain(args: argparse.Namespace) -> None:
                 reentry_temperature=args.reentry_temperature,
                 small_backend=args.small_backend,
                 small_local_model_name=args.small_local_model_name,
+                response_cache=response_cache,
+                early_stop=args.early_stop,
             )
 
     with out_rows.open("a", encoding="utf-8") as f:
-        for idx, row in enumerate(pending, start=1):
+        completed = 0
+
+        async def run_row(row: dict[str, Any]) -> None:
+            nonlocal completed
             try:
                 result = await worker(row)
-                f.write(json.dumps(result, ensure_ascii=False) + "\n")
-                f.flush()
-                print(f"processed {idx}/{len(pending)} :: {row['run_name']} :: {row['prefix_id']}")
             except Exception as exc:
                 error_row = dict(row)
                 error_row["error"] = repr(exc)
+                completed += 1
                 f.write(json.dumps(error_row, ensure_ascii=False) + "\n")
                 f.flush()
                 print(
-                    f"error {idx}/{len(pending)} :: {row['run_name']} :: "
+                    f"error {completed}/{len(pending)} :: {row['run_name']} :: "
                     f"{row['prefix_id']} :: {exc}"
                 )
+                return
+            completed += 1
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            print(
+                f"processed {completed}/{len(pending)} :: {row['run_name']} :: {row['prefix_id']}"
+            )
+
+        # Rows run concurrently under `sem`; the JSONL is keyed by (run_name, prefix_id),
+        # so completion order does not matter.
+        await asyncio.gather(*(run_row(row) for row in pending))
+    if isinstance(sem, AdaptiveConcurrency):
+        print(f"Concurrency: {sem.stats()}")
+    print(f"LLM calls:\n{format_telemetry_summary()}")
 
     rows = [row for row in _dedupe_rows(out_rows) if "error" not in row]
     summary = _summarize(rows)
     out_summary.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
     out_md.write_text(_to_markdown(summary), encoding="utf-8")
+    if response_cache is not None:
+        print(f"Response cache: {response_cache.stats()}")
     print(f"Wrote rows to {out_rows}")
     print(f"Wrote summary to {out_summary}")
     print(f"Wrote markdown to {out_md}")
@@ -704,16 +775,34 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--max-rows", type=int, default=None)
     parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Start at --concurrency and adapt in-flight rows with AIMD.",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=16)
     parser.add_argument("--max-tokens", type=int, default=2048)
+    parser.add_argument(
+        "--early-stop",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Stream completions and stop after the `Final Answer:` line.",
+    )
     parser.add_argument("--full-rerun-temperature", type=float, default=0.0)
     parser.add_argument("--reentry-temperature", type=float, default=0.0)
     parser.add_argument(
         "--small-backend", default="openrouter", choices=["openrouter", "ollama", "local"]
     )
     parser.add_argument("--small-local-model-name", default=None)
+    parser.add_argument(
+        "--response-cache-namespace",
+        default=None,
+        help="Serve temperature-0 calls from the on-disk response cache under this namespace.",
+    )
+    parser.add_argument("--response-cache-max-gb", type=float, default=2.0)
     return parser
 
 
 if __name__ == "__main__":
     args = build_parser().parse_args()
-    asyncio.run(amain(args))
+    asyncio.run(closing_shared_clients(amain(args)))
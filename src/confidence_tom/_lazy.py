@@ -0,0 +1,32 @@
+"""Module ``__getattr__`` shims that import package re-exports on first access."""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: dict[str, tuple[str, ...]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """``(__getattr__, __dir__)`` resolving ``name`` from ``package.<submodule>``.
+
+    ``exports`` maps submodule names to the names they contribute; a resolved
+    value is cached in the package namespace so later lookups are plain reads.
+    """
+    owners = {name: submodule for submodule, names in exports.items() for name in names}
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        submodule = owners.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{submodule}"), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *owners})
+
+    return __getattr__, __dir__
@@ -0,0 +1,274 @@
+"""Execution-match evaluation for BIRD-SQL.
+
+Queries run on read-only (``mode=ro``) connections pooled per database file,
+under a wall-clock and VM-step budget enforced with ``set_progress_handler``,
+so a runaway cartesian join is interrupted instead of stalling a batch. Gold
+result sets are cached in memory and as pickles under
+``cache_root()/bird_gold``, keyed by ``(db_id, sha256(gold_sql))`` and tied to
+the database file's size and mtime; a gold query that fails is cached as a
+failure too, so it is not re-run for every prediction. ``evaluate_many``
+spreads predictions over a process pool. Prediction budgets come from
+``CONFIDENCE_TOM_BIRD_SQL_TIMEOUT_SEC`` and ``CONFIDENCE_TOM_BIRD_SQL_MAX_VM_STEPS``;
+gold queries are trusted and get their own, larger budget from
+``CONFIDENCE_TOM_BIRD_GOLD_TIMEOUT_SEC`` and ``CONFIDENCE_TOM_BIRD_GOLD_MAX_VM_STEPS``
+(0 disables any of them).
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from confidence_tom.infra.paths import cache_root
+
+logger = logging.getLogger(__name__)
+
+Rows = frozenset[tuple[object, ...]]
+
+# VM instructions between progress-handler calls.
+_PROGRESS_STEPS = 1000
+_MAX_IDLE_PER_DB = 4
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class GoldQueryError(RuntimeError):
+    """The gold query itself failed; the failure is cached like a result."""
+
+
+@dataclass(frozen=True)
+class ExecBudget:
+    timeout_sec: float = 30.0
+    max_vm_steps: int = 1_000_000_000
+
+    @classmethod
+    def from_env(cls) -> ExecBudget:
+        return cls(
+            timeout_sec=float(os.getenv("CONFIDENCE_TOM_BIRD_SQL_TIMEOUT_SEC", "30") or 0),
+            max_vm_steps=int(os.getenv("CONFIDENCE_TOM_BIRD_SQL_MAX_VM_STEPS", "1000000000") or 0),
+        )
+
+    @classmethod
+    def gold_from_env(cls) -> ExecBudget:
+        return cls(
+            timeout_sec=float(os.getenv("CONFIDENCE_TOM_BIRD_GOLD_TIMEOUT_SEC", "600") or 0),
+            max_vm_steps=int(os.getenv("CONFIDENCE_TOM_BIRD_GOLD_MAX_VM_STEPS", "0") or 0),
+        )
+
+
+def gold_cache_dir() -> Path:
+    return cache_root() / "bird_gold"
+
+
+_lock = threading.Lock()
+_idle: dict[str, list[sqlite3.Connection]] = {}
+
+
+def _open_ro(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+    )
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+
+@contextmanager
+def _connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    key = str(Path(db_path).resolve())
+    with _lock:
+        idle = _idle.get(key)
+        conn = idle.pop() if idle else None
+    if conn is None:
+        conn = _open_ro(key)
+    try:
+        yield conn
+    except BaseException:
+        conn.close()
+        raise
+    with _lock:
+        idle = _idle.setdefault(key, [])
+        if len(idle) < _MAX_IDLE_PER_DB:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def close_connections() -> None:
+    with _lock:
+        pools = list(_idle.values())
+        _idle.clear()
+    for conns in pools:
+        for conn in conns:
+            conn.close()
+
+
+def run_query(sql: str, db_path: str, budget: Optional[ExecBudget] = None) -> Rows:
+    """Result set of ``sql``; raises ``QueryBudgetExceeded`` past the budget."""
+    budget = budget or ExecBudget.from_env()
+    deadline = time.monotonic() + budget.timeout_sec if budget.timeout_sec > 0 else None
+    max_calls = budget.max_vm_steps // _PROGRESS_STEPS if budget.max_vm_steps > 0 else None
+    calls = 0
+    exceeded = ""
+
+    def progress() -> int:
+        nonlocal calls, exceeded
+        calls += 1
+        if max_calls is not None and calls > max_calls:
+            exceeded = f"more than {budget.max_vm_steps} VM steps"
+        elif deadline is not None and time.monotonic() > deadline:
+            exceeded = f"more than {budget.timeout_sec:g}s"
+        return 1 if exceeded else 0
+
+    with _connection(db_path) as conn:
+        conn.set_progress_handler(progress, _PROGRESS_STEPS)
+        try:
+            return frozenset(map(tuple, conn.execute(sql).fetchall()))
+        except sqlite3.OperationalError as e:
+            if exceeded:
+                raise QueryBudgetExceeded(f"query took {exceeded}") from e
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+
+
+# Rows, or the error message of a failed gold query.
+_gold: dict[tuple[str, str, int, int], Rows | str] = {}
+
+
+def gold_rows(
+    gold_sql: str, db_path: str, db_id: Optional[str] = None, budget: Optional[ExecBudget] = None
+) -> Rows:
+    """``run_query`` for a gold query, cached per ``(db_id, sha256(gold_sql))``.
+
+    Runs under ``ExecBudget.gold_from_env()`` unless ``budget`` is given and
+    raises ``GoldQueryError`` for a failed query, cached or not.
+    """
+    stat = os.stat(db_path)
+    db_id = db_id or Path(db_path).stem
+    digest = hashlib.sha256(gold_sql.encode()).hexdigest()
+    key = (db_id, digest, stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _gold.get(key)
+
+    if cached is None:
+        path = gold_cache_dir() / f"{db_id}-{digest[:24]}.pkl"
+        if path.exists():
+            try:
+                with open(path, "rb") as f:
+                    stored_key, stored = pickle.load(f)
+                if tuple(stored_key) == key:
+                    cached = stored
+            except Exception as e:
+                logger.warning("Ignoring unreadable gold result cache %s: %s", path, e)
+    if cached is None:
+        persist = True
+        try:
+            cached = run_query(gold_sql, db_path, budget or ExecBudget.gold_from_env())
+        except QueryBudgetExceeded as e:
+            # Depends on the budget, so it is only remembered in this process.
+            cached, persist = str(e), False
+        except sqlite3.Error as e:
+            cached = f"{type(e).__name__}: {e}"
+        if isinstance(cached, str):
+            logger.warning("Gold SQL failed on %s: %s", db_id, cached)
+        if persist:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, "wb") as f:
+                    pickle.dump((key, cached), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning("Could not write gold result cache %s: %s", path, e)
+    with _lock:
+        _gold[key] = cached
+    if isinstance(cached, str):
+        raise GoldQueryError(cached)
+    return cached
+
+
+def execution_match(
+    predicted_sql: str,
+    gold_sql: str,
+    db_path: str,
+    db_id: Optional[str] = None,
+    budget: Optional[ExecBudget] = None,
+    gold_budget: Optional[ExecBudget] = None,
+) -> bool:
+    """True when both queries return the same set of rows; errors count as a miss."""
+    try:
+        gold = gold_rows(gold_sql, db_path, db_id, gold_budget)
+    except GoldQueryError:
+        return False
+    except Exception as e:
+        logger.warning("Gold SQL failed on %s: %s", db_id or db_path, e)
+        return False
+    try:
+        return run_query(predicted_sql, db_path, budget or ExecBudget.from_env()) == gold
+    except Exception as e:
+        logger.debug("SQL evaluation error: %s", e)
+        return False
+
+
+def _match_one(
+    item: tuple[str, str, str, Optional[str]], budget: ExecBudget, gold_budget: ExecBudget
+) -> bool:
+    predicted_sql, gold_sql, db_path, db_id = item
+    return execution_match(predicted_sql, gold_sql, db_path, db_id, budget, gold_budget)
+
+
+def evaluate_many(
+    items: Sequence[tuple[str, str, str, Optional[str]]],
+    max_workers: Optional[int] = None,
+    budget: Optional[ExecBudget] = None,
+    gold_budget: Optional[ExecBudget] = None,
+) -> list[bool]:
+    """Execution match for ``(predicted_sql, gold_sql, db_path, db_id)`` items, in order.
+
+    Gold results are filled in this process first so workers only read the
+    cache; items whose gold query failed are misses without reaching a worker.
+    The remaining predictions run in a spawn-context process pool.
+    """
+    budget = budget or ExecBudget.from_env()
+    gold_budget = gold_budget or ExecBudget.gold_from_env()
+    failed: set[tuple[str, str, Optional[str]]] = set()
+    for gold in {(gold_sql, db_path, db_id) for _, gold_sql, db_path, db_id in items}:
+        try:
+            gold_rows(*gold, budget=gold_budget)
+        except GoldQueryError:
+            failed.add(gold)
+        except Exception as e:
+            logger.warning("Gold SQL failed on %s: %s", gold[2] or gold[1], e)
+            failed.add(gold)
+    results = [False] * len(items)
+    pending = [
+        i
+        for i, (_, gold_sql, db_path, db_id) in enumerate(items)
+        if (gold_sql, db_path, db_id) not in failed
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    match = functools.partial(_match_one, budget=budget, gold_budget=gold_budget)
+    if workers <= 1:
+        matched = [match(items[i]) for i in pending]
+    else:
+        # Spawn: forked children must not inherit the parent's pooled connections.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            matched = list(pool.map(match, [items[i] for i in pending]))
+    for i, ok in zip(pending, matched):
+        results[i] = ok
+    return results
@@ -0,0 +1,324 @@
+"""Cached BIRD database schemas and question-driven schema pruning.
+
+``load_schema(db_path)`` reads each SQLite file once: table DDL, columns, keys
+and an inverted index from identifier and sampled text-value tokens to
+columns. The result is kept in memory and as JSON under
+``cache_root()/bird_schema`` (keyed by db id, file size and mtime), so the
+dozens of questions sharing a ``db_id`` do not reopen the database.
+``prompt_schema(..., linking=True)`` renders only the tables and columns that
+share tokens with the question and evidence, falling back to the full
+``CREATE TABLE`` dump when nothing matches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from confidence_tom.infra.paths import cache_root
+
+logger = logging.getLogger(__name__)
+
+_FORMAT = 2
+# Distinct text values per column that feed the value index.
+_VALUES_PER_COLUMN = 200
+_MAX_VALUE_CHARS = 64
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how in is it its list many "
+    "much name of on or please show tell than that the their them there these this "
+    "to was were what when where which who whose with".split()
+)
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: str
+    primary_key: bool = False
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    sql: str
+    columns: tuple[Column, ...]
+    # (column, referenced table, referenced column)
+    foreign_keys: tuple[tuple[str, str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class DatabaseSchema:
+    db_id: str
+    tables: tuple[Table, ...]
+    # token -> [(table, column)]; column is "" for a table-name match.
+    index: dict[str, list[tuple[str, str]]]
+
+    def full_sql(self) -> str:
+        return "\n\n".join(table.sql for table in self.tables)
+
+
+def schema_dir() -> Path:
+    return cache_root() / "bird_schema"
+
+
+def tokens(text: str) -> list[str]:
+    """Lowercased word tokens with naive plural folding and stopwords removed."""
+    out = []
+    for token in _TOKEN_RE.findall(_CAMEL_RE.sub(" ", text).lower()):
+        if len(token) < 2 or token in _STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        out.append(token)
+    return out
+
+
+def _quote(name: str) -> str:
+    if _IDENT_RE.fullmatch(name):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _connect_ro(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def read_schema(db_path: Path, db_id: Optional[str] = None) -> DatabaseSchema:
+    """Introspect ``db_path`` and build its token index (no caching)."""
+    conn = _connect_ro(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type='table' AND sql IS NOT NULL"
+        ).fetchall()
+        tables = []
+        index: dict[str, set[tuple[str, str]]] = {}
+
+        def add(text: str, table: str, column: str) -> None:
+            for token in tokens(text):
+                index.setdefault(token, set()).add((table, column))
+
+        columns_by_table: dict[str, tuple[Column, ...]] = {}
+        primary_keys: dict[str, list[str]] = {}
+        for name, sql in rows:
+            if not sql or name.startswith("sqlite_"):
+                continue
+            info = conn.execute(f"PRAGMA table_info({_quote(name)})").fetchall()
+            columns_by_table[name] = tuple(
+                Column(name=col[1], type=str(col[2] or ""), primary_key=bool(col[5]))
+                for col in info
+            )
+            primary_keys[name] = [col[1] for col in sorted(info, key=lambda c: c[5]) if col[5]]
+        # SQLite resolves REFERENCES case-insensitively; store the declared table name.
+        canonical = {name.casefold(): name for name in columns_by_table}
+
+        for name, sql in rows:
+            if not sql:
+                continue
+            if name.startswith("sqlite_"):
+                tables.append(Table(name=name, sql=sql, columns=()))
+                continue
+            qname = _quote(name)
+            columns = columns_by_table[name]
+            foreign_keys = tuple(
+                _foreign_key(fk, canonical, primary_keys)
+                for fk in conn.execute(f"PRAGMA foreign_key_list({qname})")
+            )
+            tables.append(Table(name, sql, columns, foreign_keys))
+            add(name, name, "")
+            for column in columns:
+                add(column.name, name, column.name)
+                values = conn.execute(
+                    f"SELECT DISTINCT {_quote(column.name)} FROM {qname} "
+                    f"WHERE typeof({_quote(column.name)}) = 'text' "
+                    f"AND length({_quote(column.name)}) <= ? LIMIT ?",
+                    (_MAX_VALUE_CHARS, _VALUES_PER_COLUMN),
+                )
+                for (value,) in values:
+                    # Numbers in values (years, codes) match far too much.
+                    add(re.sub(r"\d+", " ", str(value)), name, column.name)
+    finally:
+        conn.close()
+    return DatabaseSchema(
+        db_id=db_id or db_path.stem,
+        tables=tuple(tables),
+        index={token: sorted(hits) for token, hits in index.items()},
+    )
+
+
+def _foreign_key(
+    fk: tuple[Any, ...], canonical: dict[str, str], primary_keys: dict[str, list[str]]
+) -> tuple[str, str, str]:
+    """``(column, table, column)`` from a ``foreign_key_list`` row.
+
+    ``REFERENCES t`` without a column list targets the primary key of ``t``;
+    the ``seq`` field picks the matching column of a composite key.
+    """
+    _, seq, ref, col, ref_col = fk[:5]
+    ref = canonical.get(str(ref).casefold(), str(ref))
+    if ref_col is None:
+        pk = primary_keys.get(ref, [])
+        ref_col = pk[seq] if seq < len(pk) else col
+    return str(col), ref, str(ref_col)
+
+
+def _to_json(schema: DatabaseSchema) -> dict[str, Any]:
+    return {
+        "format": _FORMAT,
+        "db_id": schema.db_id,
+        "tables": [
+            {
+                "name": t.name,
+                "sql": t.sql,
+                "columns": [[c.name, c.type, c.primary_key] for c in t.columns],
+                "foreign_keys": [list(fk) for fk in t.foreign_keys],
+            }
+            for t in schema.tables
+        ],
+        "index": schema.index,
+    }
+
+
+def _from_json(data: dict[str, Any]) -> DatabaseSchema:
+    if data.get("format") != _FORMAT:
+        raise ValueError(f"schema cache format {data.get('format')} != {_FORMAT}")
+    return DatabaseSchema(
+        db_id=data["db_id"],
+        tables=tuple(
+            Table(
+                name=t["name"],
+                sql=t["sql"],
+                columns=tuple(Column(n, ty, bool(pk)) for n, ty, pk in t["columns"]),
+                foreign_keys=tuple((a, b, c) for a, b, c in t["foreign_keys"]),
+            )
+            for t in data["tables"]
+        ),
+        index={tok: [(a, b) for a, b in hits] for tok, hits in data["index"].items()},
+    )
+
+
+_lock = threading.Lock()
+_schemas: dict[tuple[str, int, int], DatabaseSchema] = {}
+
+
+def load_schema(db_path: Path, db_id: Optional[str] = None) -> DatabaseSchema:
+    """``read_schema`` behind an in-process and an on-disk cache."""
+    db_path = Path(db_path)
+    stat = db_path.stat()
+    key = (str(db_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _schemas.get(key)
+    if cached is not None:
+        return cached
+
+    db_id = db_id or db_path.stem
+    digest = hashlib.sha256(json.dumps([*key, _FORMAT]).encode()).hexdigest()[:16]
+    path = schema_dir() / f"{db_id}-{digest}.json"
+    schema = None
+    if path.exists():
+        try:
+            schema = _from_json(json.loads(path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.warning("Ignoring unreadable schema cache %s: %s", path, e)
+    if schema is None:
+        schema = read_schema(db_path, db_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(_to_json(schema), ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write schema cache %s: %s", path, e)
+    with _lock:
+        _schemas[key] = schema
+    return schema
+
+
+def link_schema(schema: DatabaseSchema, text: str) -> dict[str, set[str]]:
+    """Tables and columns relevant to ``text``; empty when nothing matches.
+
+    A table matched only by name keeps all of its columns. Key columns of kept
+    tables are always kept, and a table whose foreign keys connect two kept
+    tables is added so the join path survives.
+    """
+    hits: dict[str, set[str]] = {}
+    for token in set(tokens(text)):
+        for table_name, column in schema.index.get(token, ()):
+            hits.setdefault(table_name, set()).add(column)
+    if not hits:
+        return {}
+
+    by_name = {t.name: t for t in schema.tables}
+    matched = set(hits)
+    for table in schema.tables:
+        if table.name in matched:
+            continue
+        joined = {ref for _, ref, _ in table.foreign_keys if ref in matched}
+        if len(joined) >= 2:
+            hits[table.name] = {col for col, ref, _ in table.foreign_keys if ref in joined}
+
+    keep: dict[str, set[str]] = {}
+    for name, columns in hits.items():
+        table = by_name[name]
+        if columns == {""}:
+            keep[name] = {c.name for c in table.columns}
+            continue
+        keep[name] = {c for c in columns if c} | {c.name for c in table.columns if c.primary_key}
+    for name in keep:
+        for col, ref, ref_col in by_name[name].foreign_keys:
+            if ref in keep:
+                keep[name].add(col)
+                keep[ref].add(ref_col)
+    return keep
+
+
+def render_schema(schema: DatabaseSchema, keep: dict[str, set[str]]) -> str:
+    """``CREATE TABLE`` statements restricted to the ``keep`` columns."""
+    blocks = []
+    for table in schema.tables:
+        if table.name not in keep:
+            continue
+        kept = [c for c in table.columns if c.name in keep[table.name]]
+        inline_pk = sum(c.primary_key for c in table.columns) == 1
+        lines = [
+            f"  {_quote(c.name)} {c.type}".rstrip()
+            + (" PRIMARY KEY" if inline_pk and c.primary_key else "")
+            for c in kept
+        ]
+        if not inline_pk and (pk := [_quote(c.name) for c in kept if c.primary_key]):
+            lines.append(f"  PRIMARY KEY ({', '.join(pk)})")
+        lines += [
+            f"  FOREIGN KEY ({_quote(col)}) REFERENCES {_quote(ref)}({_quote(ref_col)})"
+            for col, ref, ref_col in table.foreign_keys
+            if col in keep[table.name] and ref in keep
+        ]
+        blocks.append(f"CREATE TABLE {_quote(table.name)} (\n" + ",\n".join(lines) + "\n)")
+    return "\n\n".join(blocks)
+
+
+def prompt_schema(
+    db_path: Path,
+    question: str = "",
+    evidence: str = "",
+    linking: bool = False,
+    db_id: Optional[str] = None,
+) -> str:
+    """Schema text for a prompt: the full DDL, or the linked subset with ``linking``."""
+    schema = load_schema(db_path, db_id)
+    if linking:
+        keep = link_schema(schema, f"{question}\n{evidence}")
+        if keep:
+            return render_schema(schema, keep)
+    return schema.full_sql()
@@ -9,17 +9,19 @@ Setup:
          data/dev/dev.json          -- question list
          data/dev/dev_databases/    -- SQLite database files
 
-The agent receives a natural-language question + database schema and must
+The agent receives a natural-language question + database schema (cached per
+database, optionally pruned to the question; see ``bird_schema``) and must
 produce a valid SQL query. Correctness is evaluated by executing both the
 predicted and ground-truth SQL and comparing result sets (execution match).
 """
 
 import json
 import logging
-import sqlite3
 from pathlib import Path
 from typing import Optional
 
+from confidence_tom.benchmarks.bird_exec import execution_match
+from confidence_tom.benchmarks.bird_schema import prompt_schema
 from confidence_tom.data.task_models import DynamicTask
 
 logger = logging.getLogger(__name__)
@@ -29,25 +31,18 @@ BIRD_DATA_DIR = (
 )
 
 
-def _get_schema(db_path: Path) -> str:
-    """Extract CREATE TABLE statements from a SQLite database."""
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND sql IS NOT NULL")
-    schema_lines = [row[0] for row in cursor.fetchall() if row[0]]
-    conn.close()
-    return "\n\n".join(schema_lines)
-
-
 def load_bird_sql(
     split: str = "dev",
     num_samples: int = 50,
+    schema_linking: bool = False,
 ) -> list[DynamicTask]:
     """Load BIRD-SQL tasks as DynamicTask objects.
 
     Args:
         split: Dataset split ('dev' is the standard evaluation split).
         num_samples: Maximum number of tasks to load.
+        schema_linking: Put only the tables and columns matching the question
+            and evidence in the prompt instead of the full schema.
 
     Returns:
         List of DynamicTask ready for the agent runner.
@@ -89,7 +84,13 @@ def load_bird_sql(
         schema: Optional[str] = None
         if db_path.exists():
             try:
-                schema = _get_schema(db_path)
+                schema = prompt_schema(
+                    db_path,
+                    item["question"],
+                    item.get("evidence", ""),
+                    linking=schema_linking,
+                    db_id=db_id,
+                )
             except Exception as e:
                 logger.warning(f"Could not read schema for {db_id}: {e}")
 
@@ -122,23 +123,13 @@ def load_bird_sql(
     return tasks
 
 
-def evaluate_sql(predicted_sql: str, ground_truth_sql: str, db_path: str) -> bool:
+def evaluate_sql(
+    predicted_sql: str, ground_truth_sql: str, db_path: str, db_id: Optional[str] = None
+) -> bool:
     """Evaluate a predicted SQL by comparing execution results.
 
-    Returns True if the result sets match (execution match metric).
+    Returns True if the result sets match (execution match metric). Queries run
+    read-only under a time/VM-step budget and gold results are cached; see
+    ``bird_exec``.
     """
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(predicted_sql)
-        pred_rows = set(map(tuple, cursor.fetchall()))
-
-        cursor.execute(ground_truth_sql)
-        gt_rows = set(map(tuple, cursor.fetchall()))
-
-        conn.close()
-        return pred_rows == gt_rows
-    except Exception as e:
-        logger.debug(f"SQL evaluation error: {e}")
-        return False
+    return execution_match(predicted_sql, ground_truth_sql, db_path, db_id)
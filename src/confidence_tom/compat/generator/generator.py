@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import collections
 import logging
 import re
@@ -151,14 +150,12 @@ class SubjectGenerator:
             SubjectOutputWithJustification if self.require_justification else SubjectOutput
         )
 
-        RATE_LIMIT_DELAY = 4.5
+        # Pacing between samples is handled by the client's shared rate limiter.
         results = []
         for i in range(self.k_samples):
             logger.info(f"    Running Subject sample {i + 1}/{self.k_samples} [{framing}]")
             result = await self.client.agenerate_parsed(messages, response_model)
             results.append(result)
-            if i < self.k_samples - 1:
-                await asyncio.sleep(RATE_LIMIT_DELAY)
 
         samples: List[SolvedInstance] = []
         gt_choice = extract_choice(ground_truth)
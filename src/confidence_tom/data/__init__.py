@@ -1,6 +1,50 @@
-"""Data layer: task schemas, dataset loaders, and dataset adapters."""
+"""Data layer: task schemas, dataset loaders, and dataset adapters.
 
-from .dataset_models import *  # noqa: F401,F403
-from .dynamic_benchmarks import *  # noqa: F401,F403
-from .scale_dataset import *  # noqa: F401,F403
-from .task_models import *  # noqa: F401,F403
+Re-exports are resolved on first access, so importing a schema does not load
+``datasets``.
+"""
+
+from confidence_tom._lazy import lazy_exports
+
+_EXPORTS = {
+    "dataset_models": ("MCQuestion", "StaticTask"),
+    "dynamic_benchmarks": (
+        "DYNAMIC_BENCHMARKS",
+        "DynamicBenchmarkSpec",
+        "InstallMode",
+        "get_dynamic_benchmark",
+        "list_dynamic_benchmarks",
+    ),
+    "scale_dataset": (
+        "HARD_MMLU_SUBJECTS",
+        "load_arc_challenge",
+        "load_gpqa_mc",
+        "load_gsm8k_mc",
+        "load_harp_mcq",
+        "load_hle_mc_text_only",
+        "load_livebench_reasoning",
+        "load_math_level5",
+        "load_mmlu",
+        "load_mmlu_pro",
+        "load_musr",
+        "load_olympiadbench",
+        "load_scale_experiment_dataset",
+        "load_simplebench_mc",
+        "load_supergpqa_mc",
+        "load_truthfulqa_mc",
+    ),
+    "task_models": (
+        "AgentRun",
+        "ApiTrace",
+        "DynamicTask",
+        "NativeRun",
+        "NativeTaskResult",
+        "RunSummary",
+        "StaticTrace",
+        "TaskResult",
+        "TrajectoryStep",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = sorted(name for names in _EXPORTS.values() for name in names)
@@ -0,0 +1,131 @@
+"""Local cache for benchmark artifacts downloaded over plain HTTP.
+
+``fetch_artifact(url)`` returns a path under ``cache_root()/artifacts``. A copy
+younger than ``CONFIDENCE_TOM_ARTIFACT_MAX_AGE_SEC`` (default one day) is used
+without touching the network; an older one is revalidated with
+``If-None-Match``/``If-Modified-Since`` and only re-downloaded when the server
+reports a change. Downloads stream to disk, and a pinned ``sha256`` is checked
+on every fetch. With ``CONFIDENCE_TOM_OFFLINE=1`` (or ``HF_DATASETS_OFFLINE=1``)
+only cached copies are used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from confidence_tom.infra.paths import cache_root
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1 << 20
+
+
+class ArtifactChecksumError(ValueError):
+    pass
+
+
+def artifacts_offline() -> bool:
+    return any(
+        os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+        for name in ("CONFIDENCE_TOM_OFFLINE", "HF_DATASETS_OFFLINE")
+    )
+
+
+def artifact_dir() -> Path:
+    return cache_root() / "artifacts"
+
+
+def _max_age_sec() -> float:
+    return float(os.getenv("CONFIDENCE_TOM_ARTIFACT_MAX_AGE_SEC", "86400") or 0)
+
+
+def _paths(url: str) -> tuple[Path, Path]:
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", url.rstrip("/").rsplit("/", 1)[-1])[:80]
+    digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+    path = artifact_dir() / f"{digest}-{name}"
+    return path, path.with_name(path.name + ".meta.json")
+
+
+def _read_meta(meta_path: Path) -> dict[str, Any]:
+    try:
+        return dict(json.loads(meta_path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return {}
+
+
+def _verify(path: Path, meta: dict[str, Any], sha256: Optional[str]) -> None:
+    if sha256 and meta.get("sha256") != sha256.lower():
+        raise ArtifactChecksumError(
+            f"{path.name}: sha256 {meta.get('sha256')} does not match pinned {sha256}"
+        )
+
+
+def fetch_artifact(url: str, sha256: Optional[str] = None, timeout: float = 60.0) -> Path:
+    """Local path of ``url``'s content, downloading or revalidating as needed."""
+    path, meta_path = _paths(url)
+    meta = _read_meta(meta_path) if path.exists() else {}
+
+    if meta and (artifacts_offline() or time.time() - meta.get("fetched_at", 0) < _max_age_sec()):
+        _verify(path, meta, sha256)
+        return path
+    if artifacts_offline():
+        raise FileNotFoundError(f"{url} is not cached and offline mode is on")
+
+    import requests
+
+    headers: dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        resp = requests.get(url, headers=headers, timeout=timeout, stream=True)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        if not meta:
+            raise
+        logger.warning("Revalidating %s failed (%s); using cached copy", url, e)
+        _verify(path, meta, sha256)
+        return path
+
+    with resp:
+        if resp.status_code == 304:
+            meta["fetched_at"] = time.time()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.part")
+            sha = hashlib.sha256()
+            with open(tmp, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=_CHUNK):
+                    sha.update(chunk)
+                    f.write(chunk)
+            meta = {
+                "url": url,
+                "sha256": sha.hexdigest(),
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            try:
+                _verify(tmp, meta, sha256)
+            except ArtifactChecksumError:
+                tmp.unlink(missing_ok=True)
+                raise
+            os.replace(tmp, path)
+            logger.info("Downloaded %s (%d bytes)", url, path.stat().st_size)
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    _verify(path, meta, sha256)
+    return path
+
+
+def artifact_digest(url: str, sha256: Optional[str] = None, timeout: float = 60.0) -> str:
+    """sha256 of ``url``'s current content, revalidating the cached copy as needed."""
+    fetch_artifact(url, sha256=sha256, timeout=timeout)
+    return str(_read_meta(_paths(url)[1]).get("sha256") or "")
@@ -0,0 +1,57 @@
+"""Deterministic hash-ranked subsampling.
+
+Each row gets the rank ``sha256(f"{seed}:{row_id}")`` and a sample of ``k`` is
+the ``k`` accepted rows with the smallest ranks, found in one streaming pass
+with a bounded heap. No permutation of the whole dataset is built and rows
+are read in storage order (``datasets`` streaming mode works), and because the
+ranking does not depend on ``k`` the first ``k`` rows of a larger sample are
+exactly the smaller sample.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import itertools
+from collections.abc import Callable, Iterable
+from typing import Optional, TypeVar
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+def hash_rank(row_id: str, seed: int) -> int:
+    return int.from_bytes(hashlib.sha256(f"{seed}:{row_id}".encode()).digest()[:8], "big")
+
+
+def hash_sample(
+    rows: Iterable[R],
+    k: int,
+    *,
+    key: Callable[[R], str],
+    seed: int,
+    convert: Callable[[R], Optional[T]],
+) -> list[T]:
+    """The ``k`` lowest-ranked rows for which ``convert`` is not ``None``, in rank order.
+
+    ``convert`` runs only for rows that would enter the current top ``k``, so
+    most rows of a large dataset cost one hash.
+    """
+    if k <= 0:
+        return []
+    # Max-heap on rank via negation; the counter breaks (improbable) rank ties.
+    heap: list[tuple[int, int, T]] = []
+    counter = itertools.count()
+    for row in rows:
+        rank = hash_rank(key(row), seed)
+        if len(heap) >= k and rank >= -heap[0][0]:
+            continue
+        item = convert(row)
+        if item is None:
+            continue
+        entry = (-rank, next(counter), item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heapreplace(heap, entry)
+    return [item for _, _, item in sorted(heap, key=lambda e: (-e[0], e[1]))]
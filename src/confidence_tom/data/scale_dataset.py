@@ -14,23 +14,129 @@ Supported benchmarks:
 """
 
 import ast
-import io
+import functools
 import json
 import logging
 import random
 import re
+import time
 import zipfile
-from typing import Callable, Optional, cast
-
-import requests
-from datasets import load_dataset
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, cast
 
+from confidence_tom.data.artifact_cache import fetch_artifact
 from confidence_tom.data.dataset_models import MCQuestion
+from confidence_tom.data.sampling import hash_sample
+from confidence_tom.data.snapshot import snapshotted
 
 logger = logging.getLogger(__name__)
 
 # Reproducibility
 _SEED = 42
+_BATCH_SIZE = 256
+
+
+def _load_dataset(*args: Any, **kwargs: Any) -> Any:
+    # `datasets` takes over a second to import; only loaders that use it pay.
+    from datasets import load_dataset
+
+    return load_dataset(*args, **kwargs)
+
+
+def _iter_rows(
+    dataset: Any,
+    columns: list[str],
+    where: Optional[Callable[[Any], Any]] = None,
+    shuffle: bool = True,
+    batch_size: int = _BATCH_SIZE,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(position, row)`` in seeded-shuffle order, decoding only ``columns``.
+
+    ``where`` maps an Arrow batch to a boolean mask, so rejected rows are never
+    turned into Python objects. Positions match ``enumerate`` over the full
+    shuffled dataset, which task ids embed. ``shuffle=False`` reads rows in
+    storage order, which also works for streaming (iterable) datasets.
+    """
+    import pyarrow as pa
+
+    # Streaming datasets may not know their columns before the first batch.
+    if dataset.column_names is not None:
+        columns = [c for c in columns if c in dataset.column_names]
+    dataset = dataset.select_columns(columns)
+    if shuffle:
+        dataset = dataset.shuffle(seed=_SEED)
+    offset = 0
+    for batch in dataset.with_format("arrow").iter(batch_size=batch_size):
+        positions = pa.array(range(offset, offset + batch.num_rows))
+        offset += batch.num_rows
+        if where is not None:
+            mask = where(batch)
+            batch, positions = batch.filter(mask), positions.filter(mask)
+        yield from zip(positions.to_pylist(), batch.to_pylist())
+
+
+def _sample_rows(
+    dataset: Any,
+    columns: list[str],
+    num_samples: int,
+    build: Callable[[dict[str, Any], Optional[int]], Optional[MCQuestion]],
+    *,
+    key: str,
+    where: Optional[Callable[[Any], Any]] = None,
+    sampling: str = "shuffle",
+) -> list[MCQuestion]:
+    """Pick ``num_samples`` questions built from ``dataset`` rows.
+
+    ``sampling="shuffle"`` takes the first accepted rows of the seeded shuffle and
+    passes ``build`` the shuffled position. ``sampling="hash"`` ranks rows by
+    ``sha256(seed:row[key])`` in one pass over storage order (see
+    ``confidence_tom.data.sampling``) and passes ``None``: ids must not depend
+    on position, so growing ``num_samples`` keeps every earlier task.
+    """
+    if sampling == "hash":
+        return hash_sample(
+            (row for _, row in _iter_rows(dataset, columns, where=where, shuffle=False)),
+            num_samples,
+            key=lambda row: str(row[key]),
+            seed=_SEED,
+            convert=lambda row: build(row, None),
+        )
+    if sampling != "shuffle":
+        raise ValueError(f"Unknown sampling mode {sampling!r}; expected 'shuffle' or 'hash'")
+    questions: list[MCQuestion] = []
+    for i, row in _iter_rows(dataset, columns, where=where):
+        if len(questions) >= num_samples:
+            break
+        question = build(row, i)
+        if question is not None:
+            questions.append(question)
+    return questions
+
+
+def _load_sampled(path: str, *args: Any, split: str, sampling: str, streaming: bool) -> Any:
+    if streaming and sampling != "hash":
+        raise ValueError("streaming=True needs sampling='hash'; a full shuffle needs every row")
+    if streaming:
+        return _load_dataset(path, *args, split=split, streaming=True)
+    return _load_dataset(path, *args, split=split)
+
+
+def _str_equals(batch: Any, column: str, value: str, lower: bool = False) -> Any:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = pc.cast(batch.column(column), pa.string())
+    if lower:
+        values = pc.utf8_lower(values)
+    return pc.fill_null(pc.equal(values, value), False)
+
+
+def _list_len_at_least(batch: Any, column: str, n: int) -> Any:
+    import pyarrow.compute as pc
+
+    return pc.fill_null(pc.greater_equal(pc.list_value_length(batch.column(column)), n), False)
+
 
 HARD_MMLU_SUBJECTS = [
     "college_mathematics",
@@ -43,6 +149,7 @@ HARD_MMLU_SUBJECTS = [
 ]
 
 
+@snapshotted("cais/mmlu", seed=_SEED)
 def load_mmlu(
     subjects: Optional[list[str]] = None,
     num_samples: int = 100,
@@ -61,7 +168,7 @@ def load_mmlu(
     """
     logger.info(f"Loading MMLU ({num_samples} questions)...")
 
-    dataset = load_dataset("cais/mmlu", "all", split=split)
+    dataset = _load_dataset("cais/mmlu", "all", split=split)
     dataset = dataset.shuffle(seed=_SEED)
 
     # Filter by subjects if specified
@@ -99,23 +206,19 @@ def load_mmlu(
     return questions
 
 
+@snapshotted("TIGER-Lab/MMLU-Pro", seed=_SEED)
 def load_mmlu_pro(
     num_samples: int = 100,
     split: str = "test",
+    sampling: str = "shuffle",
+    streaming: bool = False,
 ) -> list[MCQuestion]:
     """Load MMLU-Pro questions (10-choice MC, much harder than MMLU)."""
     logger.info(f"Loading MMLU-Pro ({num_samples} questions)...")
 
-    dataset = load_dataset("TIGER-Lab/MMLU-Pro", split=split)
-    dataset = dataset.shuffle(seed=_SEED)
-
     choice_labels = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"]
-    questions: list[MCQuestion] = []
-
-    for i, item in enumerate(dataset):
-        if len(questions) >= num_samples:
-            break
 
+    def build(item: dict[str, Any], i: Optional[int]) -> MCQuestion:
         raw_choices = item["options"]
         correct_idx = int(item["answer_index"])
 
@@ -125,24 +228,34 @@ def load_mmlu_pro(
             if j < len(choice_labels):
                 formatted_choices.append(f"{choice_labels[j]}) {raw_choices[j]}")
 
-        questions.append(
-            MCQuestion(
-                id=f"mmlu_pro_{item['category']}_{i:04d}",
-                question=str(item["question"]),
-                choices=formatted_choices,
-                correct_answer=choice_labels[correct_idx]
-                if correct_idx < len(choice_labels)
-                else "A",
-                category="knowledge_pro",
-                source="mmlu_pro",
-                external_difficulty=item["category"],
-            )
+        suffix = f"{i:04d}" if i is not None else f"q{item['question_id']}"
+        return MCQuestion(
+            id=f"mmlu_pro_{item['category']}_{suffix}",
+            question=str(item["question"]),
+            choices=formatted_choices,
+            correct_answer=choice_labels[correct_idx] if correct_idx < len(choice_labels) else "A",
+            category="knowledge_pro",
+            source="mmlu_pro",
+            external_difficulty=item["category"],
         )
 
+    dataset = _load_sampled(
+        "TIGER-Lab/MMLU-Pro", split=split, sampling=sampling, streaming=streaming
+    )
+    questions = _sample_rows(
+        dataset,
+        ["question_id", "question", "options", "answer_index", "category"],
+        num_samples,
+        build,
+        key="question_id",
+        sampling=sampling,
+    )
+
     logger.info(f"  Loaded {len(questions)} MMLU-Pro questions")
     return questions
 
 
+@snapshotted("allenai/ai2_arc", seed=_SEED)
 def load_arc_challenge(
     num_samples: int = 100,
     split: str = "test",
@@ -157,7 +270,7 @@ def load_arc_challenge(
     """
     logger.info(f"Loading ARC-Challenge ({num_samples} questions)...")
 
-    dataset = load_dataset("allenai/ai2_arc", "ARC-Challenge", split=split)
+    dataset = _load_dataset("allenai/ai2_arc", "ARC-Challenge", split=split)
     dataset = dataset.shuffle(seed=_SEED)
 
     choice_labels = ["A", "B", "C", "D"]
@@ -202,6 +315,7 @@ def load_arc_challenge(
     return questions
 
 
+@snapshotted("truthfulqa/truthful_qa", seed=_SEED)
 def load_truthfulqa_mc(
     num_samples: int = 100,
 ) -> list[MCQuestion]:
@@ -216,7 +330,7 @@ def load_truthfulqa_mc(
     """
     logger.info(f"Loading TruthfulQA MC ({num_samples} questions)...")
 
-    dataset = load_dataset("truthfulqa/truthful_qa", "generation", split="validation")
+    dataset = _load_dataset("truthfulqa/truthful_qa", "generation", split="validation")
     dataset = dataset.shuffle(seed=_SEED)
 
     rng = random.Random(_SEED)
@@ -348,6 +462,7 @@ def _generate_gsm8k_distractors(
     return list(distractors_set)[:3]
 
 
+@snapshotted("openai/gsm8k", seed=_SEED)
 def load_gsm8k_mc(
     num_samples: int = 100,
     split: str = "train",
@@ -362,7 +477,7 @@ def load_gsm8k_mc(
     """
     logger.info(f"Loading GSM8K as MC ({num_samples} questions)...")
 
-    dataset = load_dataset("openai/gsm8k", "main", split=split)
+    dataset = _load_dataset("openai/gsm8k", "main", split=split)
     dataset = dataset.shuffle(seed=_SEED)
 
     rng = random.Random(_SEED)
@@ -413,6 +528,7 @@ def load_gsm8k_mc(
     return questions
 
 
+@snapshotted("HuggingFaceH4/MATH", seed=_SEED)
 def load_math_level5(
     num_samples: int = 100,
 ) -> list[MCQuestion]:
@@ -422,7 +538,7 @@ def load_math_level5(
     """
     logger.info(f"Loading MATH Level 5 ({num_samples} questions)...")
 
-    dataset = load_dataset("HuggingFaceH4/MATH", split="test")
+    dataset = _load_dataset("HuggingFaceH4/MATH", split="test")
     dataset = dataset.shuffle(seed=_SEED)
     dataset = dataset.filter(lambda x: x["level"] == "Level 5")
 
@@ -461,6 +577,7 @@ def load_math_level5(
     return questions
 
 
+@snapshotted("Idavidrein/gpqa", seed=_SEED)
 def load_gpqa_mc(
     num_samples: int = 100,
 ) -> list[MCQuestion]:
@@ -471,7 +588,7 @@ def load_gpqa_mc(
     logger.info(f"Loading GPQA Diamond ({num_samples} questions)...")
 
     # Using the standard huggingface gpqa dataset
-    dataset = load_dataset("Idavidrein/gpqa", "gpqa_diamond", split="train")
+    dataset = _load_dataset("Idavidrein/gpqa", "gpqa_diamond", split="train")
     dataset = dataset.shuffle(seed=_SEED)
 
     rng = random.Random(_SEED)
@@ -530,69 +647,74 @@ def _parse_mc_choices_from_prompt(prompt: str) -> list[str]:
     return choices
 
 
+@snapshotted("cais/hle", seed=_SEED)
 def load_hle_mc_text_only(
     num_samples: int = 10,
     split: str = "test",
+    sampling: str = "shuffle",
+    streaming: bool = False,
 ) -> list[MCQuestion]:
-    """Load text-only multiple-choice subset from CAIS HLE."""
-    logger.info(f"Loading HLE text-only MC ({num_samples} questions)...")
+    """Load text-only multiple-choice subset from CAIS HLE.
 
-    dataset = load_dataset("cais/hle", split=split).shuffle(seed=_SEED)
-    questions: list[MCQuestion] = []
+    ``sampling="hash"`` (optionally with ``streaming=True``) selects rows by hash
+    rank instead of a full shuffle; see ``_sample_rows``.
+    """
+    logger.info(f"Loading HLE text-only MC ({num_samples} questions)...")
 
-    for i, item in enumerate(dataset):
-        if len(questions) >= num_samples:
-            break
+    def text_only_mc(batch: Any) -> Any:
+        import pyarrow.compute as pc
 
-        # Only keep text-only + MC questions
-        img = str(item.get("image", ""))
-        if img.startswith("data:image"):
-            continue
-        if str(item.get("answer_type")) != "multipleChoice":
-            continue
+        has_image = pc.fill_null(pc.starts_with(batch.column("image"), "data:image"), False)
+        return pc.and_(pc.invert(has_image), _str_equals(batch, "answer_type", "multipleChoice"))
 
+    def build(item: dict[str, Any], i: Optional[int]) -> Optional[MCQuestion]:
         question_text = str(item["question"])
         choices = _parse_mc_choices_from_prompt(question_text)
         if len(choices) < 4:
-            continue
+            return None
 
         ans = str(item.get("answer", "")).strip().upper()
         if not ans or ans[0] not in "ABCDEFGHIJ":
-            continue
-
-        questions.append(
-            MCQuestion(
-                id=f"hle_mc_{item['id']}_{i:04d}",
-                question=question_text,
-                choices=choices,
-                correct_answer=ans[0],
-                category="hle_mc",
-                source="hle_mc",
-                external_difficulty=str(item.get("category", "unknown")),
-            )
+            return None
+
+        return MCQuestion(
+            id=f"hle_mc_{item['id']}" + (f"_{i:04d}" if i is not None else ""),
+            question=question_text,
+            choices=choices,
+            correct_answer=ans[0],
+            category="hle_mc",
+            source="hle_mc",
+            external_difficulty=str(item.get("category", "unknown")),
         )
 
+    dataset = _load_sampled("cais/hle", split=split, sampling=sampling, streaming=streaming)
+    # `image_preview` and the other media columns are never decoded.
+    questions = _sample_rows(
+        dataset,
+        ["id", "question", "image", "answer_type", "answer", "category"],
+        num_samples,
+        build,
+        key="id",
+        where=text_only_mc,
+        sampling=sampling,
+    )
+
     logger.info(f"  Loaded {len(questions)} HLE text-only MC questions")
     return questions
 
 
+@snapshotted("m-a-p/SuperGPQA", seed=_SEED)
 def load_supergpqa_mc(
     num_samples: int = 10,
     split: str = "train",
+    sampling: str = "shuffle",
+    streaming: bool = False,
 ) -> list[MCQuestion]:
     """Load SuperGPQA as standardized MC format."""
     logger.info(f"Loading SuperGPQA ({num_samples} questions)...")
 
-    dataset = load_dataset("m-a-p/SuperGPQA", split=split).shuffle(seed=_SEED)
-    questions: list[MCQuestion] = []
-
-    for i, item in enumerate(dataset):
-        if len(questions) >= num_samples:
-            break
-
+    def build(item: dict[str, Any], i: Optional[int]) -> Optional[MCQuestion]:
         options = cast(list[str], item.get("options", []))
-        if len(options) < 4:
-            continue
         if len(options) > 10:
             options = options[:10]
 
@@ -601,34 +723,44 @@ def load_supergpqa_mc(
 
         ans = str(item.get("answer_letter", "")).strip().upper()
         if ans not in labels:
-            continue
-
-        questions.append(
-            MCQuestion(
-                id=f"supergpqa_{item['uuid']}_{i:04d}",
-                question=str(item["question"]),
-                choices=formatted,
-                correct_answer=ans,
-                category="supergpqa",
-                source="supergpqa",
-                external_difficulty=str(item.get("difficulty", "unknown")),
-            )
+            return None
+
+        return MCQuestion(
+            id=f"supergpqa_{item['uuid']}" + (f"_{i:04d}" if i is not None else ""),
+            question=str(item["question"]),
+            choices=formatted,
+            correct_answer=ans,
+            category="supergpqa",
+            source="supergpqa",
+            external_difficulty=str(item.get("difficulty", "unknown")),
         )
 
+    dataset = _load_sampled("m-a-p/SuperGPQA", split=split, sampling=sampling, streaming=streaming)
+    questions = _sample_rows(
+        dataset,
+        ["uuid", "question", "options", "answer_letter", "difficulty"],
+        num_samples,
+        build,
+        key="uuid",
+        where=lambda batch: _list_len_at_least(batch, "options", 4),
+        sampling=sampling,
+    )
+
     logger.info(f"  Loaded {len(questions)} SuperGPQA questions")
     return questions
 
 
+@snapshotted(seed=_SEED, url_param="url")
 def load_simplebench_mc(
     num_samples: int = 10,
     url: str = "https://raw.githubusercontent.com/simple-bench/SimpleBench/main/simple_bench_public.json",
+    sha256: Optional[str] = None,
 ) -> list[MCQuestion]:
     """Load SimpleBench public set and parse MC options from prompt text."""
     logger.info(f"Loading SimpleBench public ({num_samples} questions)...")
 
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    payload = resp.json()
+    path = fetch_artifact(url, sha256=sha256, timeout=30)
+    payload = json.loads(path.read_text(encoding="utf-8"))
     eval_data = payload.get("eval_data", [])
     rng = random.Random(_SEED)
     rng.shuffle(eval_data)
@@ -663,25 +795,26 @@ def load_simplebench_mc(
     return questions
 
 
+@snapshotted(seed=_SEED, url_param="url")
 def load_harp_mcq(
     num_samples: int = 10,
     url: str = "https://github.com/aadityasingh/HARP/raw/refs/heads/main/HARP_mcq.jsonl.zip",
+    sha256: Optional[str] = None,
 ) -> list[MCQuestion]:
     """Load HARP MCQ benchmark from official zip and normalize to MCQuestion."""
     logger.info(f"Loading HARP_mcq ({num_samples} questions)...")
 
-    resp = requests.get(url, timeout=60)
-    resp.raise_for_status()
-
-    zf = zipfile.ZipFile(io.BytesIO(resp.content))
-    name = "HARP_mcq.jsonl" if "HARP_mcq.jsonl" in zf.namelist() else zf.namelist()[0]
+    path = fetch_artifact(url, sha256=sha256, timeout=60)
 
+    # The member is decompressed line by line from the cached archive on disk.
     rows: list[dict[str, object]] = []
-    with zf.open(name) as f:
-        for line in f:
-            if not line.strip():
-                continue
-            rows.append(json.loads(line))
+    with zipfile.ZipFile(path) as zf:
+        name = "HARP_mcq.jsonl" if "HARP_mcq.jsonl" in zf.namelist() else zf.namelist()[0]
+        with zf.open(name) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rows.append(json.loads(line))
 
     rng = random.Random(_SEED)
     rng.shuffle(rows)
@@ -723,6 +856,7 @@ def load_harp_mcq(
     return questions
 
 
+@snapshotted("TAUR-Lab/MuSR", seed=_SEED)
 def load_musr(
     num_samples: int = 30,
     splits: Optional[list[str]] = None,
@@ -730,7 +864,7 @@ def load_musr(
     """Load MuSR multiple-choice tasks across its three official splits."""
     logger.info(f"Loading MuSR ({num_samples} questions)...")
 
-    ds = load_dataset("TAUR-Lab/MuSR")
+    ds = _load_dataset("TAUR-Lab/MuSR")
     selected_splits = splits or ["murder_mysteries", "object_placements", "team_allocation"]
     choice_labels = ["A", "B", "C", "D", "E", "F"]
     rows: list[tuple[str, dict[str, object]]] = []
@@ -776,6 +910,7 @@ def load_musr(
     return questions
 
 
+@snapshotted("Hothan/OlympiadBench", seed=_SEED)
 def load_olympiadbench(
     num_samples: int = 30,
     config_name: str = "OE_TO_maths_en_COMP",
@@ -784,19 +919,39 @@ def load_olympiadbench(
     """Load OlympiadBench text-only open-ended math questions."""
     logger.info(f"Loading OlympiadBench ({num_samples} questions, config={config_name})...")
 
-    dataset = load_dataset("Hothan/OlympiadBench", config_name, split=split).shuffle(seed=_SEED)
+    def text_only_open_ended(batch: Any) -> Any:
+        import pyarrow.compute as pc
+
+        return pc.and_(
+            pc.and_(
+                _str_equals(batch, "modality", "text-only", lower=True),
+                _str_equals(batch, "question_type", "open-ended", lower=True),
+            ),
+            _list_len_at_least(batch, "final_answer", 1),
+        )
+
+    dataset = _load_dataset("Hothan/OlympiadBench", config_name, split=split)
     questions: list[MCQuestion] = []
 
-    for i, item in enumerate(dataset):
+    columns = [
+        "id",
+        "question",
+        "context",
+        "final_answer",
+        "modality",
+        "question_type",
+        "difficulty",
+        "answer_type",
+        "is_multiple_answer",
+        "unit",
+        "subject",
+        "subfield",
+        "language",
+    ]
+    for i, item in _iter_rows(dataset, columns, where=text_only_open_ended):
         if len(questions) >= num_samples:
             break
-        if str(item.get("modality", "")).lower() != "text-only":
-            continue
-        if str(item.get("question_type", "")).lower() != "open-ended":
-            continue
         final_answers = item.get("final_answer", [])
-        if not final_answers:
-            continue
         reference_answer = str(final_answers[0]).strip()
         prompt = str(item["question"]).strip()
         context = item.get("context")
@@ -829,6 +984,7 @@ def load_olympiadbench(
     return questions
 
 
+@snapshotted("livebench/reasoning", seed=_SEED)
 def load_livebench_reasoning(
     num_samples: int = 30,
     split: str = "test",
@@ -836,14 +992,25 @@ def load_livebench_reasoning(
     """Load LiveBench reasoning tasks as open-ended static questions."""
     logger.info(f"Loading LiveBench reasoning ({num_samples} questions)...")
 
-    dataset = load_dataset("livebench/reasoning", split=split).shuffle(seed=_SEED)
+    dataset = _load_dataset("livebench/reasoning", split=split)
     questions: list[MCQuestion] = []
-    for i, item in enumerate(dataset):
+    rows = _iter_rows(
+        dataset,
+        [
+            "question_id",
+            "turns",
+            "ground_truth",
+            "level",
+            "task",
+            "category",
+            "livebench_release_date",
+        ],
+        where=lambda batch: _list_len_at_least(batch, "turns", 1),
+    )
+    for i, item in rows:
         if len(questions) >= num_samples:
             break
         turns = cast(list[str], item.get("turns", []))
-        if not turns:
-            continue
         questions.append(
             MCQuestion(
                 id=f"livebench_reasoning_{item['question_id']}_{i:04d}",
@@ -870,9 +1037,77 @@ def load_livebench_reasoning(
     return questions
 
 
+def _load_gpqa_zero_accuracy(num_samples: int) -> list[MCQuestion]:
+    """GPQA Diamond restricted to questions with 0% non-expert validator accuracy."""
+    logger.info("Filtering GPQA for 0% Non-Expert Accuracy...")
+    dataset = _load_dataset("Idavidrein/gpqa", "gpqa_diamond", split="train")
+    dataset = dataset.shuffle(seed=_SEED)
+    dataset = dataset.filter(lambda x: x["Non-Expert Validator Accuracy"] == 0.0)
+
+    rng = random.Random(_SEED)
+    choice_labels = ["A", "B", "C", "D"]
+    gpqa_qs: list[MCQuestion] = []
+
+    for i, item in enumerate(dataset):
+        if len(gpqa_qs) >= num_samples:
+            break
+
+        correct_ans = str(item["Correct Answer"])
+        distractors = [
+            str(item["Incorrect Answer 1"]),
+            str(item["Incorrect Answer 2"]),
+            str(item["Incorrect Answer 3"]),
+        ]
+
+        all_options = [correct_ans] + distractors
+        rng.shuffle(all_options)
+        correct_idx = all_options.index(correct_ans)
+
+        formatted_choices = [f"{choice_labels[j]}) {all_options[j]}" for j in range(4)]
+
+        gpqa_qs.append(
+            MCQuestion(
+                id=f"gpqa_hard_{item['Record ID']}_{i:04d}",
+                question=str(item["Question"]),
+                choices=formatted_choices,
+                correct_answer=choice_labels[correct_idx],
+                category="science",
+                source="gpqa_diamond",
+                external_difficulty="high_blind_spot",
+            )
+        )
+    return gpqa_qs
+
+
+def _load_sources(
+    loaders: dict[str, Callable[[], list[MCQuestion]]],
+    max_workers: int,
+) -> dict[str, list[MCQuestion]]:
+    """Run source loaders, in a thread pool when ``max_workers > 1``.
+
+    Results come back keyed in ``loaders`` order regardless of completion
+    order, so downstream concatenation and shuffling stay deterministic.
+    """
+
+    def timed(name: str, load: Callable[[], list[MCQuestion]]) -> list[MCQuestion]:
+        started = time.monotonic()
+        questions = load()
+        logger.info("  %s: %d questions in %.1fs", name, len(questions), time.monotonic() - started)
+        return questions
+
+    if max_workers <= 1 or len(loaders) <= 1:
+        return {name: timed(name, load) for name, load in loaders.items()}
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(loaders)), thread_name_prefix="dataset-load"
+    ) as pool:
+        futures = {name: pool.submit(timed, name, load) for name, load in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
 def load_scale_experiment_dataset(
     num_per_source: int = 100,
     counts: Optional[dict[str, int]] = None,
+    max_workers: int = 8,
 ) -> list[MCQuestion]:
     """Load the complete scale experiment dataset focusing on ULTRA-HARD tasks.
 
@@ -881,6 +1116,10 @@ def load_scale_experiment_dataset(
     - GPQA Diamond: Science questions where non-experts score 0%
     - MATH Level 5: Competition-grade mathematical reasoning
     - Hard MMLU: Specialized STEM subjects
+
+    Sources with a zero count are skipped and the rest load concurrently on
+    ``max_workers`` threads (``1`` loads them serially); the combined order
+    does not depend on which source finishes first.
     """
     logger.info("Loading ULTRA-HARD scale experiment dataset (2026 Frontier Edition)...")
 
@@ -904,91 +1143,51 @@ def load_scale_experiment_dataset(
         target.update({k: max(0, int(v)) for k, v in counts.items() if k in target})
 
     # If new frontier text-MC sources are requested, prioritize that composition.
-    if (
-        target["hle_mc"] > 0
-        or target["supergpqa"] > 0
-        or target["simplebench"] > 0
-        or target["truthfulqa_mc"] > 0
-        or target["harp_mcq"] > 0
-        or target["musr"] > 0
-        or target["olympiadbench"] > 0
-        or target["livebench"] > 0
-    ):
-        hle_qs = load_hle_mc_text_only(num_samples=target["hle_mc"])
-        super_qs = load_supergpqa_mc(num_samples=target["supergpqa"])
-        simple_qs = load_simplebench_mc(num_samples=target["simplebench"])
-        truthful_qs = load_truthfulqa_mc(num_samples=target["truthfulqa_mc"])
-        harp_qs = load_harp_mcq(num_samples=target["harp_mcq"])
-        musr_qs = load_musr(num_samples=target["musr"])
-        olympiad_qs = load_olympiadbench(num_samples=target["olympiadbench"])
-        livebench_qs = load_livebench_reasoning(num_samples=target["livebench"])
-        combined = (
-            hle_qs
-            + super_qs
-            + simple_qs
-            + truthful_qs
-            + harp_qs
-            + musr_qs
-            + olympiad_qs
-            + livebench_qs
+    frontier: dict[str, Callable[..., list[MCQuestion]]] = {
+        "hle_mc": load_hle_mc_text_only,
+        "supergpqa": load_supergpqa_mc,
+        "simplebench": load_simplebench_mc,
+        "truthfulqa_mc": load_truthfulqa_mc,
+        "harp_mcq": load_harp_mcq,
+        "musr": load_musr,
+        "olympiadbench": load_olympiadbench,
+        "livebench": load_livebench_reasoning,
+    }
+    if any(target[name] > 0 for name in frontier):
+        loaded = _load_sources(
+            {
+                name: functools.partial(load, num_samples=target[name])
+                for name, load in frontier.items()
+                if target[name] > 0
+            },
+            max_workers,
         )
+        sizes = {name: len(loaded.get(name, [])) for name in frontier}
+        combined = [q for name in frontier for q in loaded.get(name, [])]
         random.Random(_SEED).shuffle(combined)
         logger.info(
             f"Frontier text-MC dataset ready: {len(combined)} total questions "
-            f"(HLE-MC={len(hle_qs)}, SuperGPQA={len(super_qs)}, "
-            f"SimpleBench={len(simple_qs)}, TruthfulQA-MC={len(truthful_qs)}, "
-            f"HARP-MCQ={len(harp_qs)}, MuSR={len(musr_qs)}, "
-            f"OlympiadBench={len(olympiad_qs)}, LiveBench={len(livebench_qs)})"
+            f"(HLE-MC={sizes['hle_mc']}, SuperGPQA={sizes['supergpqa']}, "
+            f"SimpleBench={sizes['simplebench']}, TruthfulQA-MC={sizes['truthfulqa_mc']}, "
+            f"HARP-MCQ={sizes['harp_mcq']}, MuSR={sizes['musr']}, "
+            f"OlympiadBench={sizes['olympiadbench']}, LiveBench={sizes['livebench']})"
         )
         return combined
 
-    # 1. Load MMLU-Pro
-    pro_qs = load_mmlu_pro(num_samples=target["mmlu_pro"])
-
-    # 2. Load GPQA Diamond (Filtered for 0% NEV Accuracy only)
-    logger.info("Filtering GPQA for 0% Non-Expert Accuracy...")
-    dataset = load_dataset("Idavidrein/gpqa", "gpqa_diamond", split="train")
-    dataset = dataset.shuffle(seed=_SEED)
-    dataset = dataset.filter(lambda x: x["Non-Expert Validator Accuracy"] == 0.0)
-
-    rng = random.Random(_SEED)
-    choice_labels = ["A", "B", "C", "D"]
-    gpqa_qs: list[MCQuestion] = []
-
-    for i, item in enumerate(dataset):
-        if len(gpqa_qs) >= target["gpqa"]:
-            break
-
-        correct_ans = str(item["Correct Answer"])
-        distractors = [
-            str(item["Incorrect Answer 1"]),
-            str(item["Incorrect Answer 2"]),
-            str(item["Incorrect Answer 3"]),
-        ]
-
-        all_options = [correct_ans] + distractors
-        rng.shuffle(all_options)
-        correct_idx = all_options.index(correct_ans)
-
-        formatted_choices = [f"{choice_labels[j]}) {all_options[j]}" for j in range(4)]
-
-        gpqa_qs.append(
-            MCQuestion(
-                id=f"gpqa_hard_{item['Record ID']}_{i:04d}",
-                question=str(item["Question"]),
-                choices=formatted_choices,
-                correct_answer=choice_labels[correct_idx],
-                category="science",
-                source="gpqa_diamond",
-                external_difficulty="high_blind_spot",
-            )
-        )
-
-    # 3. Load MATH Level 5
-    math_qs = load_math_level5(num_samples=target["math_l5"])
-
-    # 4. Load Hard MMLU
-    mmlu_qs = load_mmlu(subjects=HARD_MMLU_SUBJECTS, num_samples=target["mmlu_hard"])
+    legacy: dict[str, Callable[[], list[MCQuestion]]] = {
+        # 1. MMLU-Pro
+        "mmlu_pro": functools.partial(load_mmlu_pro, num_samples=target["mmlu_pro"]),
+        # 2. GPQA Diamond (Filtered for 0% NEV Accuracy only)
+        "gpqa": functools.partial(_load_gpqa_zero_accuracy, target["gpqa"]),
+        # 3. MATH Level 5
+        "math_l5": functools.partial(load_math_level5, num_samples=target["math_l5"]),
+        # 4. Hard MMLU
+        "mmlu_hard": functools.partial(
+            load_mmlu, subjects=HARD_MMLU_SUBJECTS, num_samples=target["mmlu_hard"]
+        ),
+    }
+    loaded = _load_sources(legacy, max_workers)
+    pro_qs, gpqa_qs, math_qs, mmlu_qs = (loaded[name] for name in legacy)
 
     combined = pro_qs + gpqa_qs + math_qs + mmlu_qs
     random.Random(_SEED).shuffle(combined)
@@ -0,0 +1,164 @@
+"""Materialized snapshots of normalized static task lists.
+
+Loaders decorated with ``@snapshotted`` save their ``StaticTask`` list to an
+Arrow IPC file under ``cache_root()/dataset_snapshots`` and later calls with the
+same loader name, parameters, seed and source fingerprint memory-map it back
+instead of running ``load_dataset`` + shuffle + the row loop again. The source
+fingerprint is the cached Hugging Face revision of the dataset repo, or for
+direct downloads the sha256 of the artifact after ``fetch_artifact`` has
+revalidated it, so a new upstream revision gets a new snapshot.
+``CONFIDENCE_TOM_DATASET_SNAPSHOTS=0`` disables the layer.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from confidence_tom.data.artifact_cache import artifact_digest
+from confidence_tom.data.dataset_models import StaticTask
+from confidence_tom.infra.paths import cache_root
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., list[StaticTask]])
+
+_SCHEMA = hashlib.sha256(
+    json.dumps(StaticTask.model_json_schema(), sort_keys=True).encode()
+).hexdigest()[:12]
+_JSON_FIELDS = ("environment_context", "metadata")
+
+
+def snapshots_enabled() -> bool:
+    value = os.getenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", "1").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def snapshot_dir() -> Path:
+    return cache_root() / "dataset_snapshots"
+
+
+def hf_dataset_revision(repo_id: str) -> str:
+    """Commit hash of the locally cached ``main`` revision of a hub dataset, or ``""``."""
+    try:
+        from huggingface_hub.constants import HF_HUB_CACHE
+    except ImportError:
+        return ""
+    ref = Path(HF_HUB_CACHE) / f"datasets--{repo_id.replace('/', '--')}" / "refs" / "main"
+    try:
+        return ref.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def snapshot_path(loader: str, params: dict[str, Any], seed: int, fingerprint: str) -> Path:
+    key = json.dumps(
+        {
+            "loader": loader,
+            "params": params,
+            "seed": seed,
+            "fingerprint": fingerprint,
+            "schema": _SCHEMA,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return snapshot_dir() / f"{loader}-{hashlib.sha256(key.encode()).hexdigest()[:20]}.arrow"
+
+
+def write_snapshot(path: Path, tasks: list[StaticTask], meta: dict[str, Any]) -> None:
+    import pyarrow as pa
+
+    rows = []
+    for task in tasks:
+        row = task.model_dump(mode="json")
+        for name in _JSON_FIELDS:
+            row[name] = json.dumps(row[name], ensure_ascii=False)
+        rows.append(row)
+    schema = pa.schema(
+        [
+            (name, pa.list_(pa.string()) if name == "choices" else pa.string())
+            for name in StaticTask.model_fields
+        ],
+        metadata={"confidence_tom": json.dumps(meta, default=str)},
+    )
+    table = pa.Table.from_pylist(rows, schema=schema)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Path) -> list[StaticTask]:
+    """Memory-map an Arrow snapshot; column buffers are read without copying."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    tasks = []
+    for row in table.to_pylist():
+        for name in _JSON_FIELDS:
+            row[name] = json.loads(row[name])
+        tasks.append(StaticTask.model_validate(row))
+    return tasks
+
+
+def snapshotted(
+    source: str | None = None, seed: int = 42, url_param: str | None = None
+) -> Callable[[F], F]:
+    """Cache a static task loader's output.
+
+    ``source`` is the hub dataset repo id. ``url_param`` names the loader
+    parameter holding a downloaded artifact's URL (with an optional ``sha256``
+    pin); the artifact is revalidated before every lookup.
+    """
+
+    def decorate(fn: F) -> F:
+        signature = inspect.signature(fn)
+
+        def fingerprint(params: dict[str, Any]) -> str:
+            if url_param is not None:
+                return artifact_digest(str(params[url_param]), params.get("sha256"))
+            return hf_dataset_revision(source) if source else ""
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> list[StaticTask]:
+            if not snapshots_enabled():
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            path = snapshot_path(fn.__name__, params, seed, fingerprint(params))
+            if path.exists():
+                try:
+                    tasks = read_snapshot(path)
+                except Exception as e:
+                    logger.warning("Ignoring unreadable dataset snapshot %s: %s", path, e)
+                else:
+                    logger.info("  Loaded %d tasks from snapshot %s", len(tasks), path.name)
+                    return tasks
+            tasks = fn(*args, **kwargs)
+            # The first download populates the hub cache, so re-read the revision.
+            current = fingerprint(params)
+            path = snapshot_path(fn.__name__, params, seed, current)
+            try:
+                write_snapshot(
+                    path,
+                    tasks,
+                    {"loader": fn.__name__, "params": params, "fingerprint": current},
+                )
+            except Exception as e:
+                logger.warning("Could not write dataset snapshot %s: %s", path, e)
+            return tasks
+
+        return cast(F, wrapper)
+
+    return decorate
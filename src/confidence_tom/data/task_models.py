@@ -30,6 +30,33 @@ class ApiTrace(BaseModel):
     total_tokens: int = Field(default=0)
     cache_read_tokens: int = Field(default=0, description="Cache-hit tokens (cost savings)")
     cache_write_tokens: int = Field(default=0, description="Tokens written to cache this request")
+    local_kv_reused_tokens: int = Field(
+        default=0,
+        description="Prompt tokens whose KV came from the local prefix cache (no provider cost)",
+    )
+    cache_hit: bool = Field(
+        default=False, description="Served from the local response cache, not the provider"
+    )
+    stopped_early: bool = Field(
+        default=False,
+        description="Stream closed by a stop predicate before the provider finished",
+    )
+    tokens_estimated: bool = Field(
+        default=False,
+        description="No provider usage was received; token counts are local estimates",
+    )
+    hedge_path: str = Field(
+        default="",
+        description="'primary' or 'hedge' when a hedged duplicate was sent; empty otherwise",
+    )
+    answer_prob: Optional[float] = Field(
+        default=None,
+        description="Joint token probability of the final answer (logprob confidence mode)",
+    )
+    expected_confidence: Optional[float] = Field(
+        default=None,
+        description="Expected stated confidence in [0, 1] under the top-k logprobs",
+    )
 
 
 class StaticTrace(BaseModel):
@@ -1,6 +1,59 @@
-"""Evaluation layer: benchmark evaluation helpers and metrics."""
+"""Evaluation layer: benchmark evaluation helpers and metrics.
 
-from .evaluators import *  # noqa: F401,F403
-from .metrics import *  # noqa: F401,F403
-from .parsing import *  # noqa: F401,F403
-from .static_evaluators import *  # noqa: F401,F403
+Re-exports are resolved on first access, so importing one evaluator does not
+load ``numpy`` or the dataset loaders.
+"""
+
+from confidence_tom._lazy import lazy_exports
+
+_EXPORTS = {
+    "evaluators": (
+        "BenchmarkEvaluator",
+        "build_evaluator",
+        "evaluate_bird_sql",
+        "evaluate_intercode",
+        "evaluate_plancraft",
+        "evaluate_tau_bench",
+        "extract_sql",
+    ),
+    "metrics": (
+        "DIFFICULTY_LABELS",
+        "CalibrationReport",
+        "absolute_gap",
+        "brier_score_accuracy",
+        "brier_score_question",
+        "compute_calibration_report",
+        "compute_empirical_difficulty",
+        "expected_calibration_error",
+        "mean_absolute_gap",
+        "mean_brier_score",
+        "mean_gap",
+        "miscalibration_gap",
+        "overconfidence_rate",
+        "stratify_by_difficulty",
+    ),
+    "parsing": (
+        "ExtractResponse",
+        "MCResponse",
+        "StaticResponse",
+        "extract_answer_candidate",
+        "get_parse_stats",
+        "normalize_confidence",
+        "parse_extract_response",
+        "parse_mc_response",
+        "parse_static_response",
+        "reset_parse_stats",
+    ),
+    "static_evaluators": (
+        "EvaluationResult",
+        "StaticEvaluator",
+        "build_static_evaluator",
+        "evaluate_exact_match",
+        "evaluate_livebench_reasoning",
+        "evaluate_multiple_choice",
+        "evaluate_olympiadbench",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = sorted(name for names in _EXPORTS.values() for name in names)
@@ -67,7 +67,8 @@ def evaluate_bird_sql(final_answer: str, task: DynamicTask, evidence_text: str =
     if not candidate_sql:
         return False
 
-    return evaluate_sql(candidate_sql, str(task.ground_truth), db_path)
+    db_id = task.metadata.get("db_id")
+    return evaluate_sql(candidate_sql, str(task.ground_truth), db_path, db_id and str(db_id))
 
 
 def evaluate_tau_bench(final_answer: str, task: DynamicTask, evidence_text: str = "") -> bool:
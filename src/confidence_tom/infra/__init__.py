@@ -1,5 +1,28 @@
-"""Infrastructure layer: API clients, paths, and model config."""
+"""Infrastructure layer: API clients, paths, and model config.
 
-from .client import *  # noqa: F401,F403
-from .model_config import *  # noqa: F401,F403
-from .paths import *  # noqa: F401,F403
+Re-exports are resolved on first access, so path helpers do not load
+``openai``.
+"""
+
+from confidence_tom._lazy import lazy_exports
+
+_EXPORTS = {
+    "client": ("FINAL_ANSWER_STOPS", "LLMClient", "StopPredicate"),
+    "model_config": (
+        "CONTEXT_WINDOWS",
+        "HEDGE_ALTERNATES",
+        "OBSERVER_KEYS",
+        "OBSERVER_MODELS",
+        "SUBJECT_KEYS",
+        "SUBJECT_MODELS",
+        "ModelSpec",
+        "context_window",
+        "get_observer",
+        "get_subject",
+        "hedge_alternate",
+    ),
+    "paths": ("cache_root", "logs_root", "output_root", "project_root", "results_root"),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = sorted(name for names in _EXPORTS.values() for name in names)
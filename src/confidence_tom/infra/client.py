@@ -1,39 +1,141 @@
+import asyncio
+import functools
+import hashlib
 import json as _json
+import logging
 import os
 import re as _re
+import time
 import uuid
+from collections.abc import Callable, Sequence
+from contextvars import ContextVar
 from typing import Any, Optional, Type, cast
 
-from dotenv import load_dotenv
-from openai import AsyncOpenAI, OpenAI, RateLimitError
+from openai import AsyncOpenAI, BadRequestError, OpenAI, RateLimitError
 from tenacity import (
+    RetryCallState,
     RetryError,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
 )
 
-from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.data.task_models import ApiTrace, RunSummary
 from confidence_tom.infra.client_local import local_generate_text
 from confidence_tom.infra.client_types import T, _RateLimitOrQuota
+from confidence_tom.infra.client_utils import (
+    FINAL_ANSWER_STOPS,
+    STOP_BOUNDARY_CHARS,
+    StopPredicate,
+    first_stop,
+    stop_predicate_key,
+)
 from confidence_tom.infra.client_utils import (
     api_messages as _api_messages,
 )
 from confidence_tom.infra.client_utils import (
     coerce_json_response as _coerce_json_response,
 )
+from confidence_tom.infra.client_utils import (
+    elicitation_messages as _elicitation_messages,
+)
+from confidence_tom.infra.client_utils import (
+    extract_stream_trace as _extract_stream_trace,
+)
 from confidence_tom.infra.client_utils import (
     extract_trace as _extract_trace,
 )
+from confidence_tom.infra.client_utils import (
+    flatten_text_parts as _flatten_text_parts,
+)
 from confidence_tom.infra.client_utils import (
     normalize_chat_message as _normalize_chat_message,
 )
 from confidence_tom.infra.client_utils import (
     resolve_local_model_name as _resolve_local_model_name,
 )
+from confidence_tom.infra.embedding_cache import EmbeddingCache, embedding_cache_for
+from confidence_tom.infra.env import load_env
+from confidence_tom.infra.hedging import HedgePolicy, hedge_delay, record_latency
+from confidence_tom.infra.http_pool import shared_async_openai_client, shared_openai_client
+from confidence_tom.infra.local_batching import local_batcher_for
+from confidence_tom.infra.logprob_confidence import TokenLogprob, tokens_from_openai
+from confidence_tom.infra.model_config import context_window
+from confidence_tom.infra.rate_limit import AdaptiveRateLimiter, rate_limiter_for
+from confidence_tom.infra.rate_limit import estimate_prompt_tokens as _estimate_prompt_tokens
+from confidence_tom.infra.replay import replay_clients, replay_recorder
+from confidence_tom.infra.response_cache import ResponseCache
+from confidence_tom.infra.response_cache import request_key as _request_key
+from confidence_tom.infra.telemetry import CallEvent, record_call
+from confidence_tom.infra.token_budget import (
+    Preflight,
+    PromptTooLongError,
+    TokenBudget,
+    calibrate,
+    local_tokenizer,
+    preflight,
+)
+
+logger = logging.getLogger(__name__)
+
+_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Full jitter keeps coroutines that hit a 429 together from retrying in lockstep;
+# the shared rate limiter already holds them until the provider's reset time.
+_RETRY_WAIT = wait_random_exponential(multiplier=2, min=1, max=60)
+# Tenacity attempt number of the retrying call in progress, for telemetry.
+_RETRY_ATTEMPT: ContextVar[int] = ContextVar("confidence_tom_retry_attempt", default=1)
+
+
+def _note_attempt(retry_state: RetryCallState) -> None:
+    _RETRY_ATTEMPT.set(retry_state.attempt_number)
+
+
+def _retry_rate_limits(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Retry ``fn`` on ``_RateLimitOrQuota``, exposing the attempt to ``CallEvent``."""
+    retrying = retry(
+        stop=stop_after_attempt(8),
+        wait=_RETRY_WAIT,
+        retry=retry_if_exception_type(_RateLimitOrQuota),
+        before=_note_attempt,
+    )(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _RETRY_ATTEMPT.set(1)
+        try:
+            return await retrying(*args, **kwargs)
+        finally:
+            _RETRY_ATTEMPT.reset(token)
+
+    # Keep tenacity's controls reachable, as on a plain ``@retry`` function.
+    wrapper.retry = retrying.retry  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+    return isinstance(exc, RateLimitError) or "429" in str(exc)
+
+
+class _PrefetchedStream:
+    """An async chat stream whose leading chunks were already read by a hedge race."""
+
+    def __init__(self, stream: Any, buffered: list[Any]) -> None:
+        self._stream = stream
+        self._buffered = buffered
+        self.hedge_path = ""
 
-load_dotenv()
+    def __aiter__(self) -> "_PrefetchedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._buffered:
+            return self._buffered.pop(0)
+        return await self._stream.__anext__()
+
+    async def close(self) -> None:
+        await self._stream.close()
 
 
 class LLMClient:
@@ -55,12 +157,20 @@ class LLMClient:
         num_ctx: int | None = None,
         num_predict: int | None = None,
         enable_thinking: bool | None = None,
+        response_cache: ResponseCache | None = None,
+        hedge: HedgePolicy | None = None,
+        replay_cassette: str | None = None,
+        replay_latency_scale: float | None = None,
+        logprob_confidence: bool = False,
+        top_logprobs: int = 5,
+        token_budget: TokenBudget | None = None,
     ) -> None:
+        load_env()
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.reasoning_effort = reasoning_effort
-        self.backend = (backend or "openrouter").lower()
+        self.backend = (backend or os.getenv("CONFIDENCE_TOM_BACKEND") or "openrouter").lower()
         self.local_model_name = _resolve_local_model_name(model, local_model_name)
         self.trust_remote_code = trust_remote_code
         self.top_p = top_p
@@ -70,13 +180,21 @@ class LLMClient:
         self.num_ctx = num_ctx
         self.num_predict = num_predict
         self.enable_thinking = enable_thinking
+        self.response_cache = response_cache
+        self.hedge = hedge if self.backend == "openrouter" else None
+        self.logprob_confidence = logprob_confidence
+        self.top_logprobs = top_logprobs
+        self._logprobs_rejected = False
+        self.token_budget = token_budget
 
         self.client: OpenAI | None = None
-        self.aclient: AsyncOpenAI | None = None
+        self._endpoint: tuple[str, str] | None = None
+        self.rate_limiter: AdaptiveRateLimiter | None = None
+        self._replay_aclient: AsyncOpenAI | None = None
 
         if self.backend in {"openrouter", "ollama"}:
             if self.backend == "openrouter":
-                base_url = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+                base_url = os.environ.get("OPENROUTER_BASE_URL", _OPENROUTER_BASE_URL)
                 api_key = os.environ.get("OPENROUTER_API_KEY", "")
                 if not api_key:
                     print("WARNING: OPENROUTER_API_KEY not found in environment!")
@@ -84,8 +202,33 @@ class LLMClient:
                 base_url = os.environ.get("OLLAMA_BASE_URL", "http://127.0.0.1:11435/v1")
                 api_key = os.environ.get("OLLAMA_API_KEY", "ollama")
 
-            self.client = OpenAI(base_url=base_url, api_key=api_key)
-            self.aclient = AsyncOpenAI(base_url=base_url, api_key=api_key)
+            self._endpoint = (base_url, api_key)
+            self.client = shared_openai_client(self.backend, base_url, api_key)
+            request_model = self.local_model_name if self.backend == "ollama" else self.model
+            self.rate_limiter = rate_limiter_for(self.backend, request_model)
+        elif self.backend == "replay":
+            sync_client, async_client = replay_clients(
+                replay_cassette, latency_scale=replay_latency_scale
+            )
+            self.client = cast(OpenAI, sync_client)
+            self._replay_aclient = cast(AsyncOpenAI, async_client)
+
+    @property
+    def _request_model(self) -> str:
+        return self.local_model_name if self.backend in {"ollama", "local"} else self.model
+
+    @property
+    def _local_top_logprobs(self) -> int:
+        return self.top_logprobs if self.logprob_confidence else 0
+
+    @property
+    def aclient(self) -> AsyncOpenAI | None:
+        """Async client on the process-wide pool for this endpoint and event loop."""
+        if self._replay_aclient is not None:
+            return self._replay_aclient
+        if self._endpoint is None:
+            return None
+        return shared_async_openai_client(self.backend, *self._endpoint)
 
     def _completion_kwargs(
         self,
@@ -141,6 +284,9 @@ class LLMClient:
 
         if self.top_p is not None:
             kwargs["top_p"] = self.top_p
+        if self.logprob_confidence and not self._logprobs_rejected:
+            kwargs["logprobs"] = True
+            kwargs["top_logprobs"] = self.top_logprobs
 
         if extra_body:
             if self.backend == "openrouter" and self.provider:
@@ -150,11 +296,393 @@ class LLMClient:
             kwargs["extra_body"] = {"provider": self.provider}
         return kwargs
 
+    def _context_window(self) -> int | None:
+        if self.num_ctx is not None:
+            return self.num_ctx
+        if self.token_budget is not None and self.token_budget.context_window:
+            return self.token_budget.context_window
+        return context_window(self._request_model)
+
+    def _preflight(self, messages: list[dict[str, Any]], max_tokens: int | None) -> Preflight:
+        """Fit ``max_tokens`` to the context window left after the prompt.
+
+        Raises ``PromptTooLongError`` (or trims, per the budget) when the prompt
+        leaves no room for a useful completion. ``window`` is 0 when unchecked.
+        """
+        requested = max_tokens if max_tokens is not None else self.max_tokens
+        window = self._context_window() if self.token_budget is not None else None
+        if self.token_budget is None or window is None:
+            return Preflight(messages=messages, prompt_tokens=0, max_tokens=requested, window=0)
+        tokenizer = (
+            local_tokenizer(self.local_model_name, self.trust_remote_code)
+            if self.backend == "local"
+            else None
+        )
+        fitted = preflight(
+            messages,
+            model=self._request_model,
+            max_tokens=requested,
+            window=window,
+            budget=self.token_budget,
+            tokenizer=tokenizer,
+        )
+        if fitted.trimmed_chars:
+            logger.warning(
+                "%s: trimmed %d prompt characters to fit a %d-token context window",
+                self.model,
+                fitted.trimmed_chars,
+                window,
+            )
+        return fitted
+
+    def _fit_request(
+        self, messages: list[dict[str, Any]], kwargs: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        fitted = self._preflight(messages, kwargs.get("max_tokens"))
+        if self.token_budget is None or not fitted.window:
+            return messages, kwargs
+        kwargs = {**kwargs, "max_tokens": fitted.max_tokens}
+        if self.backend == "ollama":
+            # Ollama truncates silently at its default num_ctx. Pin it to the
+            # client's window: a num_ctx that changes between requests reloads
+            # the model, so only num_predict is fitted per request.
+            extra_body = dict(kwargs.get("extra_body") or {})
+            options = dict(extra_body.get("options") or {})
+            num_predict = options.get("num_predict")
+            if num_predict is None or num_predict < 0 or num_predict > fitted.max_tokens:
+                options["num_predict"] = fitted.max_tokens
+            options.setdefault("num_ctx", fitted.window)
+            kwargs["extra_body"] = {**extra_body, "options": options}
+        return fitted.messages, kwargs
+
+    def _cache_key(
+        self,
+        kind: str,
+        messages: list[dict[str, Any]],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **extra: Any,
+    ) -> str | None:
+        """Content hash of the resolved request, or None when caching does not apply."""
+        cache = self.response_cache
+        resolved_temperature = temperature if temperature is not None else self.temperature
+        if cache is None or not cache.accepts(resolved_temperature):
+            return None
+        payload: dict[str, Any] = {
+            "backend": self.backend,
+            "request": self._completion_kwargs(temperature=temperature, max_tokens=max_tokens),
+            "messages": [_normalize_chat_message(m) for m in messages],
+            **extra,
+        }
+        if self.backend == "local":
+            payload["local_model_name"] = self.local_model_name
+        elif endpoint := self._endpoint_namespace():
+            payload["endpoint"] = endpoint
+        return _request_key(kind, payload)
+
+    def _cache_get(self, key: str | None) -> dict[str, Any] | None:
+        if key is None or self.response_cache is None:
+            return None
+        return self.response_cache.get(key)
+
+    def _cache_put(self, key: str | None, value: dict[str, Any]) -> None:
+        if key is None or self.response_cache is None:
+            return
+        try:
+            self.response_cache.put(key, value)
+        except OSError as e:
+            logger.warning("Response cache write failed for %s: %s", self.model, e)
+
+    @staticmethod
+    def _cached_trace(cached: dict[str, Any]) -> ApiTrace:
+        trace = ApiTrace.model_validate(cached.get("trace") or {})
+        trace.cache_hit = True
+        return trace
+
     def _require_api(self) -> tuple[OpenAI, AsyncOpenAI]:
         if self.client is None or self.aclient is None:
             raise RuntimeError(f"{self.backend} backend does not support OpenAI API calls")
         return self.client, self.aclient
 
+    def _record_call(
+        self,
+        kind: str,
+        *,
+        started: float,
+        outcome: str,
+        queue_wait: float = 0.0,
+        ttft: float | None = None,
+        usage: Any = None,
+        trace: ApiTrace | None = None,
+        error: BaseException | None = None,
+        model: str | None = None,
+    ) -> None:
+        if trace is None and usage is not None:
+            details = getattr(usage, "completion_tokens_details", None)
+            trace = ApiTrace(
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                reasoning_tokens=getattr(details, "reasoning_tokens", 0) or 0,
+            )
+        record_call(
+            CallEvent(
+                model=model or self._request_model,
+                backend=self.backend,
+                kind=kind,
+                outcome=outcome,
+                latency_sec=round(time.monotonic() - started, 4),
+                queue_wait_sec=round(queue_wait, 4),
+                ttft_sec=round(ttft, 4) if ttft is not None else None,
+                prompt_tokens=trace.prompt_tokens if trace else 0,
+                completion_tokens=trace.completion_tokens if trace else 0,
+                reasoning_tokens=trace.reasoning_tokens if trace else 0,
+                attempt=_RETRY_ATTEMPT.get(),
+                error=f"{type(error).__name__}: {error}"[:500] if error else "",
+            )
+        )
+
+    async def _acreate(
+        self,
+        kind: str,
+        messages: list[dict[str, Any]],
+        *,
+        timing: dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send one async chat request after acquiring from the shared rate limiter.
+
+        Each attempt is recorded in telemetry. Streams are recorded by the caller
+        once consumed; ``timing`` receives their start time and queue wait.
+        Calls are hedged when the client has a ``HedgePolicy``; streams race
+        until their first token and the loser is closed.
+        """
+        _, aclient = self._require_api()
+        messages, kwargs = self._fit_request(messages, kwargs)
+        if self.backend != "openrouter":
+            # Only OpenRouter understands cache breakpoints on text parts.
+            messages = [_flatten_text_parts(m) for m in messages]
+        try:
+            if self.hedge is not None:
+                return await self._ahedged(
+                    aclient, kind, messages, self.hedge, timing=timing, **kwargs
+                )
+            return await self._asend(aclient, kind, messages, timing=timing, **kwargs)
+        except BadRequestError as e:
+            if "logprobs" not in kwargs:
+                raise
+            # Providers without logprob support reject the whole request; fall back
+            # to plain generation (and elicited confidence) for this client.
+            logger.warning("%s rejected logprobs, disabling logprob confidence: %s", self.model, e)
+            self._logprobs_rejected = True
+            kwargs.pop("logprobs")
+            kwargs.pop("top_logprobs", None)
+            return await self._asend(aclient, kind, messages, timing=timing, **kwargs)
+
+    async def _ahedged(
+        self,
+        aclient: AsyncOpenAI,
+        kind: str,
+        messages: list[dict[str, Any]],
+        policy: HedgePolicy,
+        *,
+        timing: dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        key = (self.backend, str(kwargs.get("model", self.model)), kind)
+        started = time.monotonic()
+        timings: dict[str, dict[str, float]] = {"primary": timing or {}, "hedge": {}}
+
+        def send(path: str, label: str | None, send_kwargs: dict[str, Any]) -> Any:
+            if kind == "stream":
+                # A stream "answers" once its first token arrives.
+                return self._afirst_token(
+                    aclient, messages, timing=timings[path], label=label, **send_kwargs
+                )
+            return self._asend(aclient, kind, messages, label=label, **send_kwargs)
+
+        hedge_kwargs = policy.hedge_kwargs(kwargs)
+        primary = asyncio.ensure_future(send("primary", None, kwargs))
+        paths: dict[asyncio.Future[Any], str] = {primary: "primary"}
+        winner: asyncio.Future[Any] | None = None
+        try:
+            if hedge_kwargs is not None:
+                await asyncio.wait({primary}, timeout=hedge_delay(key, policy))
+            if hedge_kwargs is not None and not primary.done():
+                hedge = asyncio.ensure_future(send("hedge", f"{kind}.hedge", hedge_kwargs))
+                paths[hedge] = "hedge"
+            pending = set(paths)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+        finally:
+            for task in paths:
+                if not task.done():
+                    task.cancel()
+                elif task is not winner and kind == "stream" and not task.cancelled():
+                    if task.exception() is None:
+                        await task.result().close()
+        if winner is None:
+            raise primary.exception() or RuntimeError("hedged request failed")
+        record_latency(key, time.monotonic() - started)
+        response = winner.result()
+        if timing is not None and paths[winner] == "hedge":
+            timing.update(timings["hedge"])
+        if len(paths) > 1:
+            try:
+                setattr(response, "hedge_path", paths[winner])
+            except (AttributeError, TypeError, ValueError):
+                pass
+        return response
+
+    async def _afirst_token(
+        self,
+        aclient: AsyncOpenAI,
+        messages: list[dict[str, Any]],
+        *,
+        timing: dict[str, float],
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> "_PrefetchedStream":
+        stream = await self._asend(
+            aclient, "stream", messages, timing=timing, label=label, **kwargs
+        )
+        buffered: list[Any] = []
+        try:
+            while True:
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                buffered.append(chunk)
+                delta = chunk.choices[0].delta if chunk.choices else None
+                if chunk.usage is not None or (
+                    delta is not None and (delta.content or getattr(delta, "reasoning", None))
+                ):
+                    break
+        except BaseException:
+            await stream.close()
+            raise
+        return _PrefetchedStream(stream, buffered)
+
+    async def _asend(
+        self,
+        aclient: AsyncOpenAI,
+        kind: str,
+        messages: list[dict[str, Any]],
+        *,
+        timing: dict[str, float] | None = None,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        request_model = str(kwargs.get("model", self._request_model))
+        limiter = (
+            self.rate_limiter
+            if request_model == self._request_model
+            else rate_limiter_for(self.backend, request_model)
+        )
+        est_tokens = _estimate_prompt_tokens(messages)
+        queue_wait = await limiter.acquire(est_tokens) if limiter is not None else 0.0
+        started = time.monotonic()
+        if timing is not None:
+            timing.update(started=started, queue_wait=queue_wait)
+        try:
+            if kind == "parse":
+                response = await aclient.beta.chat.completions.parse(
+                    messages=_api_messages(messages), **kwargs
+                )
+            elif kind == "stream":
+                response = await aclient.chat.completions.create(
+                    messages=_api_messages(messages),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **kwargs,
+                )
+            else:
+                response = await aclient.chat.completions.create(
+                    messages=_api_messages(messages), **kwargs
+                )
+        except asyncio.CancelledError:
+            self._record_call(
+                label or kind,
+                started=started,
+                queue_wait=queue_wait,
+                outcome="cancelled",
+                model=request_model,
+            )
+            raise
+        except Exception as e:
+            rate_limited = _is_rate_limit_error(e)
+            if limiter is not None and rate_limited:
+                limiter.record_rate_limited(getattr(getattr(e, "response", None), "headers", None))
+            self._record_call(
+                label or kind,
+                started=started,
+                queue_wait=queue_wait,
+                outcome="rate_limited" if rate_limited else "error",
+                error=e,
+                model=request_model,
+            )
+            raise
+        usage = getattr(response, "usage", None)
+        if prompt_tokens := getattr(usage, "prompt_tokens", 0):
+            calibrate(request_model, messages, int(prompt_tokens))
+        if limiter is not None:
+            limiter.record_success(est_tokens, getattr(usage, "total_tokens", 0) or 0)
+        if kind != "stream":
+            self._record_call(
+                label or kind,
+                started=started,
+                queue_wait=queue_wait,
+                outcome="ok",
+                usage=usage,
+                model=request_model,
+            )
+            if (recorder := replay_recorder()) is not None and self.backend != "replay":
+                tool_calls = getattr(response.choices[0].message, "tool_calls", None)
+                recorder.record(
+                    kind,
+                    request_model,
+                    messages,
+                    _extract_trace(response),
+                    latency_sec=time.monotonic() - started,
+                    tool_calls=[call.model_dump() for call in tool_calls] if tool_calls else None,
+                )
+        return response
+
+    def _send(self, kind: str, messages: list[dict[str, Any]], **kwargs: Any) -> Any:
+        """Blocking counterpart of ``_asend`` for the sync ``generate_*`` methods.
+
+        Not rate limited or hedged, but pre-flighted against the token budget and
+        recorded in telemetry like async calls.
+        """
+        client, _ = self._require_api()
+        messages, kwargs = self._fit_request(messages, kwargs)
+        if self.backend != "openrouter":
+            messages = [_flatten_text_parts(m) for m in messages]
+        started = time.monotonic()
+        try:
+            if kind == "parse":
+                response = client.beta.chat.completions.parse(
+                    messages=_api_messages(messages), **kwargs
+                )
+            else:
+                response = client.chat.completions.create(
+                    messages=_api_messages(messages), **kwargs
+                )
+        except Exception as e:
+            self._record_call(
+                kind,
+                started=started,
+                outcome="rate_limited" if _is_rate_limit_error(e) else "error",
+                error=e,
+            )
+            raise
+        self._record_call(
+            kind, started=started, outcome="ok", usage=getattr(response, "usage", None)
+        )
+        return response
+
     def _local_generate_text(
         self,
         messages: list[dict[str, Any]],
@@ -162,13 +690,47 @@ class LLMClient:
         max_tokens: int | None = None,
         temperature: float | None = None,
     ) -> tuple[str, ApiTrace]:
-        return local_generate_text(
-            model_name=self.local_model_name,
-            trust_remote_code=self.trust_remote_code,
-            messages=messages,
-            max_tokens=max_tokens if max_tokens is not None else self.max_tokens,
-            temperature=temperature if temperature is not None else self.temperature,
+        fitted = self._preflight(messages, max_tokens)
+        started = time.monotonic()
+        try:
+            text, trace = local_generate_text(
+                model_name=self.local_model_name,
+                trust_remote_code=self.trust_remote_code,
+                messages=fitted.messages,
+                max_tokens=fitted.max_tokens,
+                temperature=temperature if temperature is not None else self.temperature,
+                top_logprobs=self._local_top_logprobs,
+            )
+        except Exception as e:
+            self._record_call("local", started=started, outcome="error", error=e)
+            raise
+        self._record_call("local", started=started, outcome="ok", trace=trace)
+        return text, trace
+
+    async def _alocal_generate_text(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> tuple[str, ApiTrace]:
+        """Local generation through the shared micro-batcher for this model."""
+        batcher = local_batcher_for(
+            self.local_model_name, self.trust_remote_code, self._local_top_logprobs
         )
+        fitted = self._preflight(messages, max_tokens)
+        started = time.monotonic()
+        try:
+            text, trace = await batcher.submit(
+                fitted.messages,
+                max_tokens=fitted.max_tokens,
+                temperature=temperature if temperature is not None else self.temperature,
+            )
+        except Exception as e:
+            self._record_call("local", started=started, outcome="error", error=e)
+            raise
+        self._record_call("local", started=started, outcome="ok", trace=trace)
+        return text, trace
 
     def generate_parsed(
         self, messages: list[dict[str, str]], response_model: Type[T]
@@ -178,32 +740,41 @@ class LLMClient:
             raw = self.generate_text(messages)
             return _coerce_json_response(raw, response_model)
         try:
-            client, _ = self._require_api()
-            response = client.beta.chat.completions.parse(
-                messages=_api_messages(cast(list[dict[str, Any]], messages)),
+            response = self._send(
+                "parse",
+                cast(list[dict[str, Any]], messages),
                 response_format=response_model,
                 **self._completion_kwargs(),
             )
             return cast(Optional[T], response.choices[0].message.parsed)
+        except PromptTooLongError:
+            raise
         except Exception as e:
-            print(f"Error generating parsed LLM response: {e}")
+            logger.warning("Error generating parsed LLM response: %s", e)
             return None
 
     async def agenerate_parsed(
         self, messages: list[dict[str, str]], response_model: Type[T]
     ) -> Optional[T]:
         """Asynchronously generates a structured response matching the Pydantic schema."""
+        cache_key = self._cache_key(
+            "parsed",
+            cast(list[dict[str, Any]], messages),
+            response_model=response_model.model_json_schema(),
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return response_model.model_validate(cached["parsed"])
         try:
-            return cast(Optional[T], await self._agenerate_parsed_inner(messages, response_model))
+            parsed = cast(Optional[T], await self._agenerate_parsed_inner(messages, response_model))
         except RetryError:
-            print(f"Rate limit retries exhausted for {self.model}, skipping sample.")
+            logger.warning("Rate limit retries exhausted for %s, skipping sample.", self.model)
             return None
+        if parsed is not None:
+            self._cache_put(cache_key, {"parsed": parsed.model_dump(mode="json")})
+        return parsed
 
-    @retry(  # type: ignore[misc]
-        stop=stop_after_attempt(8),
-        wait=wait_exponential(multiplier=2, min=5, max=120),
-        retry=retry_if_exception_type(_RateLimitOrQuota),
-    )
+    @_retry_rate_limits
     async def _agenerate_parsed_inner(
         self, messages: list[dict[str, str]], response_model: Type[T]
     ) -> Optional[T]:
@@ -213,41 +784,53 @@ class LLMClient:
             )
             return _coerce_json_response(raw, response_model)
         try:
-            _, aclient = self._require_api()
-            response = await aclient.beta.chat.completions.parse(
-                messages=_api_messages(cast(list[dict[str, Any]], messages)),
+            response = await self._acreate(
+                "parse",
+                cast(list[dict[str, Any]], messages),
                 response_format=response_model,
                 **self._completion_kwargs(),
             )
             return cast(Optional[T], response.choices[0].message.parsed)
         except RateLimitError as e:
-            print(f"Rate limit hit for {self.model}, retrying... ({e})")
+            logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
             raise _RateLimitOrQuota(str(e)) from e
+        except PromptTooLongError:
+            raise
         except Exception as e:
             if "429" in str(e):
-                print(f"Rate limit hit for {self.model}, retrying... ({e})")
+                logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
                 raise _RateLimitOrQuota(str(e)) from e
-            print(f"Error agenerating parsed LLM response: {e}")
+            logger.warning("Error agenerating parsed LLM response: %s", e)
             return None
 
     async def agenerate_with_trace(
         self, messages: list[dict[str, str]], response_model: Type[T]
     ) -> tuple[Optional[T], ApiTrace]:
         """Like agenerate_parsed but also returns the full ApiTrace metadata."""
+        cache_key = self._cache_key(
+            "parsed_trace",
+            cast(list[dict[str, Any]], messages),
+            response_model=response_model.model_json_schema(),
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return response_model.model_validate(cached["parsed"]), self._cached_trace(cached)
         try:
-            return cast(
+            parsed, trace = cast(
                 tuple[Optional[T], ApiTrace],
                 await self._agenerate_with_trace_inner(messages, response_model),
             )
         except RetryError:
-            print(f"Rate limit retries exhausted for {self.model}, skipping sample.")
+            logger.warning("Rate limit retries exhausted for %s, skipping sample.", self.model)
             return None, ApiTrace()
+        if parsed is not None:
+            self._cache_put(
+                cache_key,
+                {"parsed": parsed.model_dump(mode="json"), "trace": trace.model_dump()},
+            )
+        return parsed, trace
 
-    @retry(  # type: ignore[misc]
-        stop=stop_after_attempt(8),
-        wait=wait_exponential(multiplier=2, min=5, max=120),
-        retry=retry_if_exception_type(_RateLimitOrQuota),
-    )
+    @_retry_rate_limits
     async def _agenerate_with_trace_inner(
         self, messages: list[dict[str, str]], response_model: Type[T]
     ) -> tuple[Optional[T], ApiTrace]:
@@ -259,20 +842,22 @@ class LLMClient:
             )
             return _coerce_json_response(raw, response_model), trace
         try:
-            _, aclient = self._require_api()
-            response = await aclient.beta.chat.completions.parse(
-                messages=_api_messages(cast(list[dict[str, Any]], messages)),
+            response = await self._acreate(
+                "parse",
+                cast(list[dict[str, Any]], messages),
                 response_format=response_model,
                 **self._completion_kwargs(),
             )
             parsed = cast(Optional[T], response.choices[0].message.parsed)
             return parsed, _extract_trace(response)
         except RateLimitError as e:
-            print(f"Rate limit hit for {self.model}, retrying... ({e})")
+            logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
             raise _RateLimitOrQuota(str(e)) from e
+        except PromptTooLongError:
+            raise
         except Exception as e:
             if "429" in str(e):
-                print(f"Rate limit hit for {self.model}, retrying... ({e})")
+                logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
                 raise _RateLimitOrQuota(str(e)) from e
             try:
                 raw = await self.agenerate_text(
@@ -284,7 +869,7 @@ class LLMClient:
                     return parsed, trace
             except Exception:
                 pass
-            print(f"Error in agenerate_with_trace for {self.model}: {e}")
+            logger.warning("Error in agenerate_with_trace for %s: %s", self.model, e)
             return None, ApiTrace()
 
     async def agenerate_tool_message(
@@ -299,14 +884,10 @@ class LLMClient:
                 await self._agenerate_tool_message_inner(messages, tools),
             )
         except RetryError:
-            print(f"Rate limit retries exhausted for {self.model}, skipping tool step.")
+            logger.warning("Rate limit retries exhausted for %s, skipping tool step.", self.model)
             return None, ApiTrace()
 
-    @retry(  # type: ignore[misc]
-        stop=stop_after_attempt(8),
-        wait=wait_exponential(multiplier=2, min=5, max=120),
-        retry=retry_if_exception_type(_RateLimitOrQuota),
-    )
+    @_retry_rate_limits
     async def _agenerate_tool_message_inner(
         self,
         messages: list[dict[str, Any]],
@@ -316,9 +897,9 @@ class LLMClient:
             raise RuntimeError("Tool-calling is not implemented for local backend")
         try:
             normalized_messages = [_normalize_chat_message(message) for message in messages]
-            _, aclient = self._require_api()
-            response = await aclient.chat.completions.create(
-                messages=_api_messages(normalized_messages),
+            response = await self._acreate(
+                "chat",
+                normalized_messages,
                 tools=cast(Any, tools),
                 tool_choice="auto",
                 **self._completion_kwargs(),
@@ -327,13 +908,15 @@ class LLMClient:
             normalized = _normalize_chat_message(message.model_dump())
             return normalized, _extract_trace(response)
         except RateLimitError as e:
-            print(f"Rate limit hit for {self.model}, retrying... ({e})")
+            logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
             raise _RateLimitOrQuota(str(e)) from e
+        except PromptTooLongError:
+            raise
         except Exception as e:
             if "429" in str(e):
-                print(f"Rate limit hit for {self.model}, retrying... ({e})")
+                logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
                 raise _RateLimitOrQuota(str(e)) from e
-            print(f"Error in agenerate_tool_message for {self.model}: {e}")
+            logger.warning("Error in agenerate_tool_message for %s: %s", self.model, e)
             return None, ApiTrace()
 
     async def agenerate_react_message(
@@ -353,14 +936,10 @@ class LLMClient:
                 await self._agenerate_react_message_inner(messages, tools),
             )
         except RetryError:
-            print(f"Rate limit retries exhausted for {self.model}, skipping tool step.")
+            logger.warning("Rate limit retries exhausted for %s, skipping tool step.", self.model)
             return None, ApiTrace()
 
-    @retry(  # type: ignore[misc]
-        stop=stop_after_attempt(8),
-        wait=wait_exponential(multiplier=2, min=5, max=120),
-        retry=retry_if_exception_type(_RateLimitOrQuota),
-    )
+    @_retry_rate_limits
     async def _agenerate_react_message_inner(
         self,
         messages: list[dict[str, Any]],
@@ -431,9 +1010,9 @@ class LLMClient:
             injected.insert(0, {"role": "system", "content": react_instruction})
 
         try:
-            _, aclient = self._require_api()
-            response = await aclient.chat.completions.create(
-                messages=_api_messages(injected),
+            response = await self._acreate(
+                "chat",
+                injected,
                 **self._completion_kwargs(),
             )
             raw = (response.choices[0].message.content or "").strip()
@@ -477,58 +1056,42 @@ class LLMClient:
             }, trace
 
         except RateLimitError as e:
-            print(f"Rate limit hit for {self.model}, retrying... ({e})")
+            logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
             raise _RateLimitOrQuota(str(e)) from e
+        except PromptTooLongError:
+            raise
         except Exception as e:
             if "429" in str(e):
-                print(f"Rate limit hit for {self.model}, retrying... ({e})")
+                logger.warning("Rate limit hit for %s, retrying... (%s)", self.model, e)
                 raise _RateLimitOrQuota(str(e)) from e
-            print(f"Error in agenerate_react_message for {self.model}: {e}")
+            logger.warning("Error in agenerate_react_message for %s: %s", self.model, e)
             return None, ApiTrace()
 
     async def aelicit_confidence(
         self,
         messages: list[dict[str, Any]],
+        trace: ApiTrace | None = None,
     ) -> Optional[float]:
         """Ask the model to self-report its confidence on the just-completed task.
 
         Appends a single confidence question to the conversation and parses the
         integer reply (0-100) into a [0, 1] float. Returns None on failure.
-        """
-        # Keep only system + last 8 messages to avoid blowing the context window
-        # on long multi-step benchmarks (plancraft, tau_bench with many turns).
-        elicit_raw = list(messages)
-        system_msgs = [m for m in elicit_raw if m.get("role") == "system"]
-        non_system = [m for m in elicit_raw if m.get("role") != "system"]
-        elicit_raw = system_msgs + non_system[-8:]
-
-        elicit_messages = [_normalize_chat_message(m) for m in elicit_raw]
-        # Strip tool artifacts so the elicitation call works on any model
-        sanitized: list[dict[str, Any]] = []
-        for msg in elicit_messages:
-            role = msg.get("role", "")
-            if role == "tool":
-                sanitized.append(
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Tool result ({msg.get('name', 'tool')}): {msg.get('content', '')}"
-                        ),
-                    }
-                )
-            elif role == "assistant" and msg.get("tool_calls"):
-                fn = (msg["tool_calls"][0] or {}).get("function", {})
-                sanitized.append(
-                    {
-                        "role": "assistant",
-                        "content": f"[called {fn.get('name', 'tool')}({fn.get('arguments', '')})]",
-                    }
-                )
-            else:
-                # Only keep standard fields — vendor extras like `reasoning`,
-                # `annotations`, `reasoning_details` cause API rejection.
-                sanitized.append({"role": role, "content": msg.get("content", "")})
 
+        When ``trace`` comes from a generation made with ``logprob_confidence``,
+        its expected stated confidence (else the answer-token probability) is
+        returned directly and no follow-up call is made.
+        """
+        if trace is not None:
+            signal = (
+                trace.expected_confidence
+                if trace.expected_confidence is not None
+                else trace.answer_prob
+            )
+            if signal is not None:
+                return round(max(0.0, min(1.0, signal)), 4)
+        # System + last 8 turns keeps long multi-step runs (plancraft, tau_bench)
+        # inside the context window.
+        sanitized = _elicitation_messages(messages)
         sanitized.append(
             {
                 "role": "user",
@@ -541,9 +1104,9 @@ class LLMClient:
             }
         )
         try:
-            _, aclient = self._require_api()
-            response = await aclient.chat.completions.create(
-                messages=_api_messages(sanitized),
+            response = await self._acreate(
+                "chat",
+                sanitized,
                 **self._completion_kwargs(
                     temperature=0.0,
                     max_tokens=16384,  # reasoning models may use thousands of tokens for <think>
@@ -585,8 +1148,10 @@ class LLMClient:
                 finish_reason,
                 raw[:200],
             )
+        except PromptTooLongError:
+            raise
         except Exception as e:
-            print(f"Confidence elicitation failed for {self.model}: {e}")
+            logger.warning("Confidence elicitation failed for %s: %s", self.model, e)
         return None
 
     async def aelicit_run_summary(
@@ -598,41 +1163,25 @@ class LLMClient:
 
         Returns a RunSummary instance, or None on failure.
         """
-        from confidence_tom.data.task_models import RunSummary
+        summary, _ = await self.aelicit_summary_with_confidence(messages, trace_text)
+        return summary
 
-        # Keep system + last 8 messages to avoid blowing context
-        system_msgs = [m for m in messages if m.get("role") == "system"]
-        non_system = [m for m in messages if m.get("role") != "system"]
-        trimmed = system_msgs + non_system[-8:]
+    async def aelicit_summary_with_confidence(
+        self,
+        messages: list[dict[str, Any]],
+        trace_text: str = "",
+    ) -> tuple[Optional[RunSummary], Optional[float]]:
+        """RunSummary and the 0-1 success estimate from one structured call.
 
-        sanitized: list[dict[str, Any]] = []
-        for msg in trimmed:
-            msg = _normalize_chat_message(msg)
-            role = msg.get("role", "")
-            if role == "tool":
-                sanitized.append(
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Tool result ({msg.get('name', 'tool')}): {msg.get('content', '')}"
-                        ),
-                    }
-                )
-            elif role == "assistant" and msg.get("tool_calls"):
-                fn = (msg["tool_calls"][0] or {}).get("function", {})
-                sanitized.append(
-                    {
-                        "role": "assistant",
-                        "content": f"[called {fn.get('name', 'tool')}({fn.get('arguments', '')})]",
-                    }
-                )
-            else:
-                # Only keep standard fields — vendor extras like `reasoning`,
-                # `annotations`, `reasoning_details` cause API rejection.
-                sanitized.append({"role": role, "content": msg.get("content", "")})
+        Replaces calling ``aelicit_run_summary`` and ``aelicit_confidence`` back to
+        back: the confidence is the summary's ``final_confidence``. Only when the
+        model cannot produce structured output is a short integer question sent.
+        """
+        # Keep system + last 8 messages to avoid blowing context
+        sanitized = _elicitation_messages(messages)
 
         trace_section = f"\n\nYour execution trace:\n{trace_text}\n" if trace_text else ""
-        sanitized.append(
+        summary_prompt = sanitized + [
             {
                 "role": "user",
                 "content": (
@@ -648,15 +1197,15 @@ class LLMClient:
                     "independently from scratch, what percentage would succeed? (0-100)"
                 ),
             }
-        )
-        result = await self.agenerate_parsed(sanitized, RunSummary)
+        ]
+        result = await self.agenerate_parsed(summary_prompt, RunSummary)
         if result is not None:
-            return result
+            return result, round(result.final_confidence / 100.0, 4)
 
         # Fallback for models that don't support structured output (e.g. Qwen via OpenRouter):
         # ask a single plain-text question and extract the confidence integer.
         # Do NOT include trace_section here — it can be 10k+ tokens and cause context overflow.
-        confidence_prompt = sanitized[:-1] + [
+        confidence_prompt = sanitized + [
             {
                 "role": "user",
                 "content": (
@@ -673,15 +1222,16 @@ class LLMClient:
         if match:
             n = max(0, min(10, int(match.group(1))))
             print(f"[confidence_fallback] parsed n={n} -> final_confidence={n * 10}", flush=True)
-            return RunSummary(
+            fallback = RunSummary(
                 plan="",
                 trajectory=[],
                 summary="",
                 final_answer="",
                 final_confidence=n * 10,
             )
+            return fallback, n / 10.0
         print(f"[confidence_fallback] no integer found in {raw!r}, returning None", flush=True)
-        return None
+        return None, None
 
     def generate_text(self, messages: list[dict[str, str]]) -> str:
         """Generates a plain text response."""
@@ -689,15 +1239,15 @@ class LLMClient:
             text, _ = self._local_generate_text(messages)
             return text
         try:
-            client, _ = self._require_api()
-            response = client.chat.completions.create(
-                messages=_api_messages(cast(list[dict[str, Any]], messages)),
-                **self._completion_kwargs(),
+            response = self._send(
+                "chat", cast(list[dict[str, Any]], messages), **self._completion_kwargs()
             )
             content = response.choices[0].message.content
             return content if content else ""
+        except PromptTooLongError:
+            raise
         except Exception as e:
-            print(f"Error generating text LLM response: {e}")
+            logger.warning("Error generating text LLM response: %s", e)
             return ""
 
     async def agenerate_text(
@@ -708,19 +1258,14 @@ class LLMClient:
     ) -> str:
         """Async plain-text generation, no structured output required."""
         if self.backend == "local":
-            import asyncio
-
-            text, _ = await asyncio.to_thread(
-                self._local_generate_text,
-                messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
+            text, _ = await self._alocal_generate_text(
+                messages, max_tokens=max_tokens, temperature=temperature
             )
             return text
         try:
-            _, aclient = self._require_api()
-            response = await aclient.chat.completions.create(
-                messages=_api_messages(messages),
+            response = await self._acreate(
+                "chat",
+                messages,
                 **self._completion_kwargs(
                     temperature=temperature,
                     max_tokens=max_tokens,
@@ -732,8 +1277,10 @@ class LLMClient:
                 return str(content)
             reasoning = getattr(message, "reasoning", None)
             return str(reasoning) if reasoning else ""
+        except PromptTooLongError:
+            raise
         except Exception as e:
-            print(f"Error in agenerate_text for {self.model}: {e}")
+            logger.warning("Error in agenerate_text for %s: %s", self.model, e)
             return ""
 
     async def agenerate_text_with_trace(
@@ -741,21 +1288,42 @@ class LLMClient:
         messages: list[dict[str, Any]],
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        use_cache: bool = True,
     ) -> tuple[str, ApiTrace]:
-        """Async plain-text generation that also returns raw API metadata."""
-        if self.backend == "local":
-            import asyncio
+        """Async plain-text generation that also returns raw API metadata.
 
-            return await asyncio.to_thread(
-                self._local_generate_text,
-                messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
+        Pass ``use_cache=False`` to force a provider call even when a response
+        cache is attached (e.g. when measuring run-to-run determinism).
+        """
+        cache_key = (
+            self._cache_key("text", messages, temperature=temperature, max_tokens=max_tokens)
+            if use_cache
+            else None
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return str(cached.get("text", "")), self._cached_trace(cached)
+        text, trace = await self._agenerate_text_with_trace_uncached(
+            messages, max_tokens=max_tokens, temperature=temperature
+        )
+        if text:
+            self._cache_put(cache_key, {"text": text, "trace": trace.model_dump()})
+        return text, trace
+
+    async def _agenerate_text_with_trace_uncached(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> tuple[str, ApiTrace]:
+        if self.backend == "local":
+            return await self._alocal_generate_text(
+                messages, max_tokens=max_tokens, temperature=temperature
             )
         try:
-            _, aclient = self._require_api()
-            response = await aclient.chat.completions.create(
-                messages=_api_messages(messages),
+            response = await self._acreate(
+                "chat",
+                messages,
                 **self._completion_kwargs(
                     temperature=temperature,
                     max_tokens=max_tokens,
@@ -766,18 +1334,304 @@ class LLMClient:
             if not content:
                 content = getattr(message, "reasoning", None) or ""
             return content, _extract_trace(response)
+        except PromptTooLongError:
+            raise
+        except Exception as e:
+            logger.warning("Error in agenerate_text_with_trace for %s: %s", self.model, e)
+            return "", ApiTrace()
+
+    async def agenerate_text_stream_with_trace(
+        self,
+        messages: list[dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stop_when: Sequence[StopPredicate] = FINAL_ANSWER_STOPS,
+        use_cache: bool = True,
+    ) -> tuple[str, ApiTrace]:
+        """Streaming ``agenerate_text_with_trace`` that stops once a predicate matches.
+
+        The default predicates close the stream after a completed ``Final Answer:``
+        line or a balanced ``\\boxed{}`` following it, and the text is cut at that
+        point. Token counts come from the provider's usage chunk when it arrived;
+        otherwise they are estimated and ``trace.tokens_estimated`` is set, which
+        is always the case for a stream closed early.
+
+        Predicates are checked only after a piece containing a newline or ``}``
+        (see ``StopPredicate``). Responses are cached only when every predicate
+        has a stable name: lambdas and closures turn caching off for the call.
+        """
+        stop_keys = [stop_predicate_key(p) for p in stop_when]
+        cache_key = (
+            self._cache_key(
+                "text_stream",
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop_when=stop_keys,
+            )
+            if use_cache and None not in stop_keys
+            else None
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return str(cached.get("text", "")), self._cached_trace(cached)
+        text, trace = await self._astream_text_with_trace(
+            messages, max_tokens=max_tokens, temperature=temperature, stop_when=stop_when
+        )
+        if text:
+            self._cache_put(cache_key, {"text": text, "trace": trace.model_dump()})
+        return text, trace
+
+    async def _astream_text_with_trace(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        stop_when: Sequence[StopPredicate],
+    ) -> tuple[str, ApiTrace]:
+        if self.backend == "local":
+            # Local generation is batched and not streamed; only the text is cut.
+            text, trace = await self._alocal_generate_text(
+                messages, max_tokens=max_tokens, temperature=temperature
+            )
+            cut = first_stop(text, stop_when)
+            if cut is not None:
+                text = text[:cut]
+                trace.response_content = text
+            return text, trace
+        timing = {"started": time.monotonic(), "queue_wait": 0.0}
+        try:
+            stream = await self._acreate(
+                "stream",
+                messages,
+                timing=timing,
+                **self._completion_kwargs(temperature=temperature, max_tokens=max_tokens),
+            )
+            content_parts: list[str] = []
+            reasoning_parts: list[str] = []
+            response_id = model_id = ""
+            usage = None
+            content_chunks = 0
+            token_logprobs: list[TokenLogprob] = []
+            stopped = False
+            first_token_at: float | None = None
+            try:
+                async for chunk in stream:
+                    response_id = response_id or (chunk.id or "")
+                    model_id = model_id or (chunk.model or "")
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    token_logprobs.extend(
+                        tokens_from_openai(getattr(chunk.choices[0], "logprobs", None))
+                    )
+                    if first_token_at is None and (
+                        delta.content or getattr(delta, "reasoning", None)
+                    ):
+                        first_token_at = time.monotonic()
+                    reasoning = getattr(delta, "reasoning", None)
+                    if reasoning:
+                        reasoning_parts.append(str(reasoning))
+                    piece = delta.content
+                    if not piece:
+                        continue
+                    content_parts.append(piece)
+                    content_chunks += 1
+                    # Per the StopPredicate contract, only boundary pieces can complete one.
+                    if any(ch in piece for ch in STOP_BOUNDARY_CHARS):
+                        joined = "".join(content_parts)
+                        cut = first_stop(joined, stop_when)
+                        if cut is not None:
+                            content_parts = [joined[:cut]]
+                            stopped = True
+                            break
+            finally:
+                await stream.close()
+            content = "".join(content_parts)
+            trace = _extract_stream_trace(
+                response_id=response_id,
+                model_id=model_id,
+                content=content,
+                reasoning="".join(reasoning_parts),
+                usage=usage,
+                content_chunks=content_chunks,
+                reasoning_chunks=len(reasoning_parts),
+                prompt_tokens_estimate=_estimate_prompt_tokens(messages),
+                stopped_early=stopped,
+                logprobs=token_logprobs,
+            )
+            trace.hedge_path = getattr(stream, "hedge_path", "")
+            started = timing["started"]
+            self._record_call(
+                "stream",
+                started=started,
+                queue_wait=timing["queue_wait"],
+                ttft=first_token_at - started if first_token_at is not None else None,
+                outcome="stopped_early" if stopped else "ok",
+                trace=trace,
+            )
+            if (recorder := replay_recorder()) is not None and self.backend != "replay":
+                recorder.record(
+                    "stream",
+                    self._request_model,
+                    [_flatten_text_parts(m) for m in messages],
+                    trace,
+                    latency_sec=time.monotonic() - started,
+                    ttft_sec=first_token_at - started if first_token_at is not None else None,
+                )
+            return content or trace.reasoning_content, trace
+        except PromptTooLongError:
+            raise
         except Exception as e:
-            print(f"Error in agenerate_text_with_trace for {self.model}: {e}")
+            logger.warning("Error in agenerate_text_stream_with_trace for %s: %s", self.model, e)
             return "", ApiTrace()
 
     def embed_text(self, text: str, model: str = "google/gemini-embedding-001") -> list[float]:
         client, _ = self._require_api()
-        response = client.embeddings.create(model=model, input=text)
+        started = time.monotonic()
+        try:
+            response = client.embeddings.create(model=model, input=text)
+        except Exception as e:
+            self._record_call("embed", started=started, outcome="error", error=e, model=model)
+            raise
+        self._record_call("embed", started=started, outcome="ok", usage=response.usage, model=model)
         return list(response.data[0].embedding)
 
     async def aembed_text(
         self, text: str, model: str = "google/gemini-embedding-001"
     ) -> list[float]:
+        payload = {"backend": self.backend, "model": model, "input": text}
+        if endpoint := self._endpoint_namespace():
+            payload["endpoint"] = endpoint
+        cache_key = _request_key("embed", payload) if self.response_cache is not None else None
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return [float(x) for x in cached["embedding"]]
         _, aclient = self._require_api()
-        response = await aclient.embeddings.create(model=model, input=text)
-        return list(response.data[0].embedding)
+        limiter = rate_limiter_for(self.backend, model)
+        queue_wait = await limiter.acquire(max(1, len(text) // 4))
+        started = time.monotonic()
+        try:
+            response = await aclient.embeddings.create(model=model, input=text)
+        except Exception as e:
+            rate_limited = _is_rate_limit_error(e)
+            if rate_limited:
+                limiter.record_rate_limited(getattr(getattr(e, "response", None), "headers", None))
+            self._record_call(
+                "embed",
+                started=started,
+                queue_wait=queue_wait,
+                outcome="rate_limited" if rate_limited else "error",
+                error=e,
+                model=model,
+            )
+            raise
+        limiter.record_success()
+        self._record_call(
+            "embed",
+            started=started,
+            queue_wait=queue_wait,
+            outcome="ok",
+            usage=getattr(response, "usage", None),
+            model=model,
+        )
+        embedding = list(response.data[0].embedding)
+        self._cache_put(cache_key, {"embedding": embedding})
+        return embedding
+
+    async def aembed_batch(
+        self,
+        texts: Sequence[str],
+        model: str = "google/gemini-embedding-001",
+        batch_size: int = 64,
+        *,
+        max_concurrency: int = 4,
+        cache: EmbeddingCache | None = None,
+        use_cache: bool = True,
+    ) -> list[list[float]]:
+        """Embed many texts with chunked multi-input requests sent concurrently.
+
+        Vectors come back aligned with ``texts``. Duplicate texts are embedded
+        once, and texts already in the persistent embedding cache for ``model``
+        are not sent at all. The replay backend never touches the persistent
+        cache, and non-default endpoints use their own namespace in it.
+        """
+        namespace = self._embedding_cache_namespace()
+        store = None
+        if use_cache and namespace is not None:
+            store = cache or embedding_cache_for(model, namespace)
+        unique = list(dict.fromkeys(texts))
+        cached = store.get_many(unique) if store is not None else [None] * len(unique)
+        vectors = {text: vec for text, vec in zip(unique, cached) if vec is not None}
+        missing = [text for text in unique if text not in vectors]
+        step = max(1, batch_size)
+        chunks = [missing[i : i + step] for i in range(0, len(missing), step)]
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _embed(chunk: list[str]) -> None:
+            async with sem:
+                embedded = await self._aembed_chunk(chunk, model)
+            if store is not None:
+                store.put_many(chunk, embedded)
+            vectors.update(zip(chunk, embedded))
+
+        await asyncio.gather(*(_embed(chunk) for chunk in chunks))
+        return [vectors[text] for text in texts]
+
+    def _endpoint_namespace(self) -> str:
+        """``""`` for the real OpenRouter API, else the backend and a base-URL hash.
+
+        A stub server or proxy at a custom base URL may return anything, so its
+        responses and embeddings must not be served to real-provider runs.
+        """
+        if self._endpoint is None:
+            return self.backend
+        base_url = self._endpoint[0].rstrip("/")
+        if self.backend == "openrouter" and base_url == _OPENROUTER_BASE_URL:
+            return ""
+        return f"{self.backend}-{hashlib.sha256(base_url.encode()).hexdigest()[:12]}"
+
+    def _embedding_cache_namespace(self) -> str | None:
+        """Embedding cache namespace for this endpoint; ``None`` disables the cache.
+
+        Replayed vectors are hash-seeded fakes and never enter the store.
+        """
+        if self.backend == "replay":
+            return None
+        return self._endpoint_namespace()
+
+    async def _aembed_chunk(self, chunk: list[str], model: str) -> list[list[float]]:
+        _, aclient = self._require_api()
+        limiter = rate_limiter_for(self.backend, model)
+        est_tokens = sum(max(1, len(text) // 4) for text in chunk)
+        queue_wait = await limiter.acquire(est_tokens)
+        started = time.monotonic()
+        try:
+            response = await aclient.embeddings.create(model=model, input=chunk)
+        except Exception as e:
+            rate_limited = _is_rate_limit_error(e)
+            if rate_limited:
+                limiter.record_rate_limited(getattr(getattr(e, "response", None), "headers", None))
+            self._record_call(
+                "embed",
+                started=started,
+                queue_wait=queue_wait,
+                outcome="rate_limited" if rate_limited else "error",
+                error=e,
+                model=model,
+            )
+            raise
+        limiter.record_success()
+        self._record_call(
+            "embed",
+            started=started,
+            queue_wait=queue_wait,
+            outcome="ok",
+            usage=getattr(response, "usage", None),
+            model=model,
+        )
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [list(item.embedding) for item in ordered]
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-from functools import lru_cache
+import copy
+import gc
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
 from typing import Any
 
 from confidence_tom.data.task_models import ApiTrace
-from confidence_tom.infra.client_utils import local_prompt_text
+from confidence_tom.infra.client_utils import local_prompt_text, logprob_fields
+from confidence_tom.infra.logprob_confidence import TokenLogprob
 
 
-@lru_cache(maxsize=8)
-def load_local_stack(
-    model_name: str,
-    trust_remote_code: bool,
-) -> tuple[Any, Any, Any]:
+def _load_stack(model_name: str, trust_remote_code: bool) -> tuple[Any, Any, Any]:
     import torch
     from transformers import AutoModelForCausalLM, AutoTokenizer
 
@@ -29,6 +33,341 @@ def load_local_stack(
     return torch, tokenizer, model
 
 
+def _model_nbytes(model: Any) -> int:
+    footprint = getattr(model, "get_memory_footprint", None)
+    if callable(footprint):
+        return int(footprint())
+    tensors = [*getattr(model, "parameters", list)(), *getattr(model, "buffers", list)()]
+    return sum(int(t.numel() * t.element_size()) for t in tensors)
+
+
+def _checkpoint_nbytes(model_name: str) -> int:
+    """Size of the weight files on disk, a pre-load estimate of the resident size."""
+    root = Path(model_name)
+    if not root.is_dir():
+        try:
+            from huggingface_hub import snapshot_download
+
+            root = Path(snapshot_download(model_name, local_files_only=True))
+        except Exception:
+            return 0
+    files = [*root.glob("*.safetensors")] or [*root.glob("*.bin")]
+    return sum(f.stat().st_size for f in files)
+
+
+def _default_ram_budget() -> int:
+    env = os.getenv("CONFIDENCE_TOM_LOCAL_MODEL_RAM_GB")
+    if env:
+        return int(float(env) * 1024**3)
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 0
+    return int(total * 0.75)
+
+
+class LocalModelCache:
+    """Loaded ``(torch, tokenizer, model)`` stacks, evicted LRU under a RAM budget.
+
+    Before a load, unpinned models are evicted until the checkpoint size fits;
+    after it, until the measured footprint does. Evicted weights are released
+    explicitly (with the model's prefix KV cache) instead of waiting on the GC.
+    ``max_bytes=0`` means unbounded.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        loader: Callable[[str, bool], tuple[Any, Any, Any]] = _load_stack,
+        estimate: Callable[[str], int] = _checkpoint_nbytes,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self._loader = loader
+        self._estimate = estimate
+        self._entries: OrderedDict[tuple[str, bool], tuple[tuple[Any, Any, Any], int]] = (
+            OrderedDict()
+        )
+        self._pinned: set[str] = set()
+        self._lock = threading.RLock()
+
+    def get(self, model_name: str, trust_remote_code: bool) -> tuple[Any, Any, Any]:
+        key = (model_name, trust_remote_code)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self._make_room(self._estimate(model_name))
+            stack = self._loader(model_name, trust_remote_code)
+            size = _model_nbytes(stack[2])
+            self._entries[key] = (stack, size)
+            self.bytes += size
+            self.loads += 1
+            self._make_room(0, keep=key)
+            return stack
+
+    def _make_room(self, incoming: int, keep: tuple[str, bool] | None = None) -> None:
+        if self.max_bytes <= 0:
+            return
+        for key in list(self._entries):
+            if self.bytes + incoming <= self.max_bytes:
+                return
+            if key != keep and key[0] not in self._pinned:
+                self._release(key)
+
+    def _release(self, key: tuple[str, bool]) -> None:
+        (torch, _, _), size = self._entries.pop(key)
+        self.bytes -= size
+        self.evictions += 1
+        if not any(name == key[0] for name, _ in self._entries):
+            with _kv_lock:
+                _kv_caches.pop(key[0], None)
+        gc.collect()
+        cuda = getattr(torch, "cuda", None)
+        if cuda is not None and cuda.is_available():
+            cuda.empty_cache()
+
+    def evict(self, model_name: str) -> bool:
+        """Drop every loaded stack for ``model_name`` (pinned or not)."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == model_name]
+            for key in keys:
+                self._release(key)
+            return bool(keys)
+
+    def pin(self, *model_names: str) -> None:
+        with self._lock:
+            self._pinned.update(model_names)
+
+    def unpin(self, *model_names: str) -> None:
+        with self._lock:
+            self._pinned.difference_update(model_names)
+
+    @contextmanager
+    def pinned(self, *model_names: str) -> Iterator[None]:
+        """Keep ``model_names`` resident for the duration of a sweep."""
+        with self._lock:
+            added = set(model_names) - self._pinned
+            self._pinned.update(added)
+        try:
+            yield
+        finally:
+            self.unpin(*added)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "models": [name for name, _ in self._entries],
+                "pinned": sorted(self._pinned),
+                "resident_bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+
+_model_cache_lock = threading.Lock()
+_model_cache: LocalModelCache | None = None
+
+
+def local_model_cache() -> LocalModelCache:
+    """Process-wide model cache; budget from ``CONFIDENCE_TOM_LOCAL_MODEL_RAM_GB``
+    (default 75% of physical RAM, ``0`` for unbounded)."""
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            _model_cache = LocalModelCache(_default_ram_budget())
+        return _model_cache
+
+
+def configure_local_model_cache(max_gb: float) -> LocalModelCache:
+    """Change the RAM budget of the shared cache, evicting down to it."""
+    cache = local_model_cache()
+    with cache._lock:
+        cache.max_bytes = int(max_gb * 1024**3)
+        cache._make_room(0)
+    return cache
+
+
+def load_local_stack(
+    model_name: str,
+    trust_remote_code: bool,
+) -> tuple[Any, Any, Any]:
+    return local_model_cache().get(model_name, trust_remote_code)
+
+
+def _kv_nbytes(cache: Any) -> int:
+    layers = getattr(cache, "layers", None)
+    if layers is not None:
+        tensors = [t for layer in layers for t in (layer.keys, layer.values) if t is not None]
+    else:
+        tensors = [*getattr(cache, "key_cache", []), *getattr(cache, "value_cache", [])]
+    return sum(int(t.numel() * t.element_size()) for t in tensors)
+
+
+def _cropped_clone(cache: Any, length: int) -> Any:
+    """New cache object over views of the first ``length`` positions of ``cache``.
+
+    Dynamic caches grow by concatenation and crop by slicing, both of which
+    rebind tensors instead of writing to them, so the stored tensors can be
+    shared and only the cache and layer objects are copied.
+    """
+    clone = copy.copy(cache)
+    layers = getattr(cache, "layers", None)
+    if layers is not None:
+        clone.layers = [copy.copy(layer) for layer in layers]
+    else:
+        clone.key_cache = list(getattr(cache, "key_cache", []))
+        clone.value_cache = list(getattr(cache, "value_cache", []))
+    clone.crop(length)
+    return clone
+
+
+def _row_clone(cache: Any, row: int, start: int) -> Any:
+    """Single-row cache for ``row`` of a left-padded batch, without its padding.
+
+    The row is copied out so the stored entry does not pin the whole batch.
+    """
+    clone = copy.copy(cache)
+    layers = getattr(cache, "layers", None)
+    if layers is not None:
+        clone.layers = []
+        for layer in layers:
+            part = copy.copy(layer)
+            part.keys = layer.keys[row : row + 1, :, start:].clone()
+            part.values = layer.values[row : row + 1, :, start:].clone()
+            clone.layers.append(part)
+    else:
+        clone.key_cache = [t[row : row + 1, :, start:].clone() for t in cache.key_cache]
+        clone.value_cache = [t[row : row + 1, :, start:].clone() for t in cache.value_cache]
+    return clone
+
+
+def _common_prefix_len(a: tuple[int, ...], b: tuple[int, ...]) -> int:
+    n = min(len(a), len(b))
+    for idx in range(n):
+        if a[idx] != b[idx]:
+            return idx
+    return n
+
+
+class PrefixKVCache:
+    """Prompt ``past_key_values`` keyed by token ids, evicted LRU under a byte budget.
+
+    Prefix sweeps resend the same system prompt, problem and a growing reasoning
+    prefix for every step, so the longest common token prefix with an earlier
+    prompt can be cropped out of its cache and only the new segment is prefilled.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reused_tokens = 0
+        self._entries: OrderedDict[tuple[int, ...], tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, ids: tuple[int, ...]) -> tuple[Any, int]:
+        """Cropped clone covering the longest reusable prefix of ``ids`` and its length.
+
+        At least one prompt token is always left uncached for ``generate`` to prefill.
+        """
+        with self._lock:
+            best_key: tuple[int, ...] | None = None
+            best_len = 0
+            for key in self._entries:
+                n = min(_common_prefix_len(key, ids), len(ids) - 1)
+                if n > best_len:
+                    best_key, best_len = key, n
+            if best_key is None:
+                self.misses += 1
+                return None, 0
+            self._entries.move_to_end(best_key)
+            source = self._entries[best_key][0]
+            self.hits += 1
+            self.reused_tokens += best_len
+        return _cropped_clone(source, best_len), best_len
+
+    def reusable(self, ids: tuple[int, ...]) -> int:
+        """Length ``lookup`` would reuse for ``ids``, without counting or copying."""
+        with self._lock:
+            return max(
+                (min(_common_prefix_len(key, ids), len(ids) - 1) for key in self._entries),
+                default=0,
+            )
+
+    def store(self, ids: tuple[int, ...], cache: Any) -> None:
+        cache.crop(len(ids))
+        size = _kv_nbytes(cache)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if ids in self._entries:
+                self.bytes -= self._entries.pop(ids)[1]
+            # A prompt that extends a cached one supersedes it.
+            for key in [k for k in self._entries if ids[: len(k)] == k]:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[ids] = (cache, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reused_tokens": self.reused_tokens,
+            }
+
+
+_kv_lock = threading.Lock()
+_kv_caches: dict[str, PrefixKVCache] = {}
+
+
+def prefix_kv_cache(model_name: str) -> PrefixKVCache | None:
+    """Per-model prefix cache; ``CONFIDENCE_TOM_LOCAL_KV_CACHE_MB=0`` disables it."""
+    budget_mb = float(os.getenv("CONFIDENCE_TOM_LOCAL_KV_CACHE_MB", "1024") or 0)
+    if budget_mb <= 0:
+        return None
+    with _kv_lock:
+        cache = _kv_caches.get(model_name)
+        if cache is None:
+            cache = PrefixKVCache(int(budget_mb * 1024 * 1024))
+            _kv_caches[model_name] = cache
+        return cache
+
+
+def _token_logprobs(
+    torch: Any, tokenizer: Any, scores: Any, row: int, token_ids: list[int], top_k: int
+) -> list[TokenLogprob]:
+    """Per-token logprobs and top-k alternatives from ``generate`` scores for one row."""
+    tokens = []
+    for step, token_id in enumerate(token_ids[: len(scores)]):
+        logp = torch.log_softmax(scores[step][row].float(), dim=-1)
+        top = torch.topk(logp, top_k)
+        tokens.append(
+            TokenLogprob(
+                token=tokenizer.decode([token_id]),
+                logprob=float(logp[token_id]),
+                top=tuple(
+                    (tokenizer.decode([int(idx)]), float(value))
+                    for value, idx in zip(top.values.tolist(), top.indices.tolist())
+                ),
+            )
+        )
+    return tokens
+
+
 def local_generate_text(
     *,
     model_name: str,
@@ -36,6 +375,7 @@ def local_generate_text(
     messages: list[dict[str, Any]],
     max_tokens: int,
     temperature: float,
+    top_logprobs: int = 0,
 ) -> tuple[str, ApiTrace]:
     torch, tokenizer, model = load_local_stack(model_name, trust_remote_code)
     prompt_text = local_prompt_text(messages, tokenizer)
@@ -48,12 +388,23 @@ def local_generate_text(
         "do_sample": do_sample,
         "pad_token_id": tokenizer.pad_token_id,
         "eos_token_id": tokenizer.eos_token_id,
+        "return_dict_in_generate": True,
+        "output_scores": top_logprobs > 0,
     }
     if do_sample:
         gen_kwargs["temperature"] = temperature
+    kv_cache = prefix_kv_cache(model_name)
+    prompt_ids = tuple(int(t) for t in encoded["input_ids"][0].tolist())
+    reused = 0
+    if kv_cache is not None:
+        past, reused = kv_cache.lookup(prompt_ids)
+        if past is not None:
+            gen_kwargs["past_key_values"] = past
     with torch.no_grad():
         out = model.generate(**encoded, **gen_kwargs)
-    gen_tokens = out[0][prompt_len:]
+    if kv_cache is not None and out.past_key_values is not None:
+        kv_cache.store(prompt_ids, out.past_key_values)
+    gen_tokens = out.sequences[0][prompt_len:]
     text = tokenizer.decode(gen_tokens, skip_special_tokens=True).strip()
     trace = ApiTrace(
         model_id=model_name,
@@ -61,5 +412,139 @@ def local_generate_text(
         prompt_tokens=prompt_len,
         completion_tokens=int(gen_tokens.shape[-1]),
         total_tokens=prompt_len + int(gen_tokens.shape[-1]),
+        local_kv_reused_tokens=reused,
     )
+    if top_logprobs > 0 and out.scores:
+        ids = [int(t) for t in gen_tokens.tolist()]
+        tokens = _token_logprobs(torch, tokenizer, out.scores, 0, ids, top_logprobs)
+        trace = trace.model_copy(update=logprob_fields(tokens))
     return text, trace
+
+
+def _completion_length(tokens: list[int], stop_ids: set[int]) -> int:
+    for idx, token in enumerate(tokens):
+        if token in stop_ids:
+            return idx + 1
+    return len(tokens)
+
+
+def local_generate_batch(
+    *,
+    model_name: str,
+    trust_remote_code: bool,
+    batch: list[list[dict[str, Any]]],
+    max_tokens: list[int],
+    temperature: float,
+    top_logprobs: int = 0,
+) -> list[tuple[str, ApiTrace]]:
+    """Generate for several conversations with one left-padded `generate` call.
+
+    Each row stops at its own ``max_tokens``; rows that finish early are padded by
+    ``generate`` and trimmed here, so greedy outputs match ``local_generate_text``.
+    With the prefix KV cache on, rows whose prompt extends a cached prefix run
+    one by one on the unpadded path and prefill only their new segment; the
+    rest share the padded call, whose per-row prompt KV then seeds the cache.
+    """
+    torch, tokenizer, model = load_local_stack(model_name, trust_remote_code)
+    prompts = [local_prompt_text(messages, tokenizer) for messages in batch]
+    kv_cache = prefix_kv_cache(model_name)
+    if len(batch) == 1:
+        unpadded = [0]
+    elif kv_cache is not None:
+        unpadded = [
+            idx
+            for idx, prompt in enumerate(prompts)
+            if kv_cache.reusable(tuple(int(t) for t in tokenizer(prompt)["input_ids"]))
+        ]
+    else:
+        unpadded = []
+    padded = [idx for idx in range(len(batch)) if idx not in unpadded]
+    if len(padded) == 1:
+        unpadded, padded = sorted([*unpadded, *padded]), []
+
+    results: dict[int, tuple[str, ApiTrace]] = {}
+    for idx in unpadded:
+        results[idx] = local_generate_text(
+            model_name=model_name,
+            trust_remote_code=trust_remote_code,
+            messages=batch[idx],
+            max_tokens=max_tokens[idx],
+            temperature=temperature,
+            top_logprobs=top_logprobs,
+        )
+    if padded:
+        rows = _generate_padded(
+            torch,
+            tokenizer,
+            model,
+            model_name=model_name,
+            prompts=[prompts[idx] for idx in padded],
+            max_tokens=[max_tokens[idx] for idx in padded],
+            temperature=temperature,
+            top_logprobs=top_logprobs,
+            kv_cache=kv_cache,
+        )
+        results.update(zip(padded, rows))
+    return [results[idx] for idx in range(len(batch))]
+
+
+def _generate_padded(
+    torch: Any,
+    tokenizer: Any,
+    model: Any,
+    *,
+    model_name: str,
+    prompts: list[str],
+    max_tokens: list[int],
+    temperature: float,
+    top_logprobs: int,
+    kv_cache: PrefixKVCache | None,
+) -> list[tuple[str, ApiTrace]]:
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"  # decoder-only models continue from the last column
+    try:
+        encoded = tokenizer(prompts, return_tensors="pt", padding=True)
+    finally:
+        tokenizer.padding_side = padding_side
+    encoded = {k: v.to(model.device) for k, v in encoded.items()}
+    padded_len = int(encoded["input_ids"].shape[-1])
+    prompt_lens = [int(n) for n in encoded["attention_mask"].sum(dim=-1).tolist()]
+    do_sample = bool(temperature > 0)
+    gen_kwargs: dict[str, Any] = {
+        "max_new_tokens": max(max_tokens),
+        "do_sample": do_sample,
+        "pad_token_id": tokenizer.pad_token_id,
+        "eos_token_id": tokenizer.eos_token_id,
+        "return_dict_in_generate": True,
+        "output_scores": top_logprobs > 0,
+    }
+    if do_sample:
+        gen_kwargs["temperature"] = temperature
+    with torch.no_grad():
+        out = model.generate(**encoded, **gen_kwargs)
+    if kv_cache is not None and out.past_key_values is not None:
+        for idx, prompt_len in enumerate(prompt_lens):
+            start = padded_len - prompt_len
+            ids = tuple(int(t) for t in encoded["input_ids"][idx][start:].tolist())
+            kv_cache.store(ids, _row_clone(out.past_key_values, idx, start))
+
+    stop_ids = {tokenizer.eos_token_id, tokenizer.pad_token_id} - {None}
+    results: list[tuple[str, ApiTrace]] = []
+    for idx, (row, prompt_len, row_max) in enumerate(zip(out.sequences, prompt_lens, max_tokens)):
+        generated = [int(t) for t in row[padded_len:].tolist()][:row_max]
+        n_completion = _completion_length(generated, stop_ids)
+        text = tokenizer.decode(generated[:n_completion], skip_special_tokens=True).strip()
+        trace = ApiTrace(
+            model_id=model_name,
+            response_content=text,
+            prompt_tokens=prompt_len,
+            completion_tokens=n_completion,
+            total_tokens=prompt_len + n_completion,
+        )
+        if top_logprobs > 0 and out.scores:
+            tokens = _token_logprobs(
+                torch, tokenizer, out.scores, idx, generated[:n_completion], top_logprobs
+            )
+            trace = trace.model_copy(update=logprob_fields(tokens))
+        results.append((text, trace))
+    return results
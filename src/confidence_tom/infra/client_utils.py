@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import functools as _functools
 import json as _json
+import re as _re
+from collections.abc import Callable, Sequence
 from typing import Any, Optional, Type, cast
 
 from confidence_tom.data.task_models import ApiTrace
 from confidence_tom.infra.client_types import T
+from confidence_tom.infra.logprob_confidence import (
+    TokenLogprob,
+    logprob_confidence,
+    tokens_from_openai,
+)
 
 _LOCAL_MODEL_MAP = {
     "qwen/qwen3-14b:nitro": "Qwen/Qwen3-14B",
@@ -12,6 +20,73 @@ _LOCAL_MODEL_MAP = {
     "meta-llama/llama-4-scout": "llama3.1:8b",
 }
 
+# A stop predicate returns the offset to cut the streamed text at, or None to keep going.
+# Streams only consult predicates after a piece containing one of STOP_BOUNDARY_CHARS,
+# so a predicate must match only once such a character has arrived.
+StopPredicate = Callable[[str], Optional[int]]
+STOP_BOUNDARY_CHARS = "\n}"
+
+_FINAL_ANSWER_LINE_RE = _re.compile(
+    r"^[ \t#*]*final answer[ \t*]*:[ \t*]*[^\s][^\n]*\n", _re.IGNORECASE | _re.MULTILINE
+)
+_FINAL_ANSWER_RE = _re.compile(r"final answer[ \t*]*:", _re.IGNORECASE)
+
+
+def stop_after_final_answer_line(text: str) -> Optional[int]:
+    """Cut after a completed `Final Answer: <answer>` line (one followed by a newline)."""
+    match = _FINAL_ANSWER_LINE_RE.search(text)
+    return match.end() - 1 if match else None
+
+
+def stop_after_final_boxed(text: str) -> Optional[int]:
+    """Cut after a balanced `\\boxed{...}` that follows a `Final Answer:` marker."""
+    marker = _FINAL_ANSWER_RE.search(text)
+    if marker is None:
+        return None
+    start = text.find("\\boxed{", marker.end())
+    if start == -1:
+        return None
+    depth = 0
+    for idx in range(start + len("\\boxed"), len(text)):
+        if text[idx] == "{":
+            depth += 1
+        elif text[idx] == "}":
+            depth -= 1
+            if depth == 0:
+                return idx + 1
+    return None
+
+
+FINAL_ANSWER_STOPS: tuple[StopPredicate, ...] = (
+    stop_after_final_answer_line,
+    stop_after_final_boxed,
+)
+
+
+def first_stop(text: str, predicates: Sequence[StopPredicate]) -> Optional[int]:
+    """Earliest cut offset reported by any predicate."""
+    cuts = [cut for predicate in predicates if (cut := predicate(text)) is not None]
+    return min(cuts) if cuts else None
+
+
+def stop_predicate_key(predicate: StopPredicate) -> Optional[str]:
+    """Stable cache-key name for a predicate, or None when it has no stable identity.
+
+    Module-level functions are keyed by module and qualified name, and a
+    ``functools.partial`` adds its bound arguments. Lambdas, closures and other
+    callables return None, which disables response caching for the stream.
+    """
+    if isinstance(predicate, _functools.partial):
+        inner = stop_predicate_key(predicate.func)
+        if inner is None:
+            return None
+        return f"{inner}{predicate.args!r}{sorted(predicate.keywords.items())!r}"
+    qualname = getattr(predicate, "__qualname__", None)
+    module = getattr(predicate, "__module__", None)
+    if not qualname or not module or "<" in qualname:
+        return None
+    return f"{module}.{qualname}"
+
 
 def extract_first_json_object(raw: str) -> str:
     """Return the first balanced JSON object substring from a raw model reply."""
@@ -57,9 +132,19 @@ def coerce_json_response(raw: str, response_model: Type[T]) -> Optional[T]:
         return None
 
 
+def flatten_text_parts(message: dict[str, Any]) -> dict[str, Any]:
+    """Join a content list made only of text parts (e.g. cache-layered prompts) into a string."""
+    content = message.get("content")
+    if not isinstance(content, list) or not content:
+        return message
+    if not all(isinstance(part, dict) and part.get("type") == "text" for part in content):
+        return message
+    return {**message, "content": "".join(str(part.get("text", "")) for part in content)}
+
+
 def normalize_chat_message(message: dict[str, Any]) -> dict[str, Any]:
     """Ensure provider-facing chat messages always have a string content field."""
-    normalized = dict(message)
+    normalized = flatten_text_parts(dict(message))
     if normalized.get("role") == "assistant" and normalized.get("tool_calls"):
         normalized["content"] = normalized.get("content") or ""
     elif "content" in normalized and normalized["content"] is None:
@@ -67,6 +152,41 @@ def normalize_chat_message(message: dict[str, Any]) -> dict[str, Any]:
     return normalized
 
 
+def elicitation_messages(
+    messages: list[dict[str, Any]], keep_last: int = 8
+) -> list[dict[str, Any]]:
+    """System messages plus the last ``keep_last`` turns, rewritten as plain text.
+
+    Post-run elicitation must work on any model and stay inside the context
+    window, so tool results become user turns, tool calls become a short
+    assistant note, and vendor extras (``reasoning``, ``annotations``) are dropped.
+    """
+    system_msgs = [m for m in messages if m.get("role") == "system"]
+    non_system = [m for m in messages if m.get("role") != "system"]
+    sanitized: list[dict[str, Any]] = []
+    for msg in system_msgs + non_system[-keep_last:]:
+        msg = normalize_chat_message(msg)
+        role = msg.get("role", "")
+        if role == "tool":
+            sanitized.append(
+                {
+                    "role": "user",
+                    "content": f"Tool result ({msg.get('name', 'tool')}): {msg.get('content', '')}",
+                }
+            )
+        elif role == "assistant" and msg.get("tool_calls"):
+            fn = (msg["tool_calls"][0] or {}).get("function", {})
+            sanitized.append(
+                {
+                    "role": "assistant",
+                    "content": f"[called {fn.get('name', 'tool')}({fn.get('arguments', '')})]",
+                }
+            )
+        else:
+            sanitized.append({"role": role, "content": msg.get("content", "")})
+    return sanitized
+
+
 def api_messages(messages: list[dict[str, Any]]) -> Any:
     """Cast normalized message lists to the OpenAI SDK's chat message union."""
     return cast(Any, messages)
@@ -74,9 +194,6 @@ def api_messages(messages: list[dict[str, Any]]) -> Any:
 
 def extract_trace(response: object) -> ApiTrace:
     """Pull all metadata fields out of a raw OpenAI/OpenRouter response object."""
-    usage = getattr(response, "usage", None)
-    completion_details = getattr(usage, "completion_tokens_details", None)
-    prompt_details = getattr(usage, "prompt_tokens_details", None)
     choices = getattr(response, "choices", [])
     msg = choices[0].message if choices else None
 
@@ -87,6 +204,35 @@ def extract_trace(response: object) -> ApiTrace:
     else:
         raw_content = str(raw_content)
 
+    return ApiTrace.model_validate(
+        {
+            "model_id": getattr(response, "model", ""),
+            "request_id": getattr(response, "id", ""),
+            "reasoning_content": reasoning_content,
+            "response_content": raw_content,
+            "hedge_path": str(getattr(response, "hedge_path", "") or ""),
+            **_usage_fields(getattr(response, "usage", None)),
+            **logprob_fields(
+                tokens_from_openai(getattr(choices[0], "logprobs", None)) if choices else []
+            ),
+        }
+    )
+
+
+def logprob_fields(tokens: Sequence[TokenLogprob]) -> dict[str, float | None]:
+    """``ApiTrace`` confidence fields from token logprobs (empty without logprobs)."""
+    if not tokens:
+        return {}
+    signal = logprob_confidence(tokens)
+    return {
+        "answer_prob": signal.answer_prob,
+        "expected_confidence": signal.expected_confidence,
+    }
+
+
+def _usage_fields(usage: object) -> dict[str, int]:
+    completion_details = getattr(usage, "completion_tokens_details", None)
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
     cache_read = (
         getattr(prompt_details, "cached_tokens", 0) or getattr(usage, "cache_read_tokens", 0) or 0
     )
@@ -95,18 +241,58 @@ def extract_trace(response: object) -> ApiTrace:
         or getattr(usage, "cache_write_tokens", 0)
         or 0
     )
+    return {
+        "reasoning_tokens": getattr(completion_details, "reasoning_tokens", 0) or 0,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+        "cache_read_tokens": cache_read,
+        "cache_write_tokens": cache_write,
+    }
+
 
-    return ApiTrace(
-        model_id=getattr(response, "model", ""),
-        request_id=getattr(response, "id", ""),
-        reasoning_tokens=getattr(completion_details, "reasoning_tokens", 0) or 0,
-        reasoning_content=reasoning_content,
-        response_content=raw_content,
-        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
-        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
-        total_tokens=getattr(usage, "total_tokens", 0) or 0,
-        cache_read_tokens=cache_read,
-        cache_write_tokens=cache_write,
+def extract_stream_trace(
+    *,
+    response_id: str,
+    model_id: str,
+    content: str,
+    reasoning: str,
+    usage: object,
+    content_chunks: int,
+    reasoning_chunks: int,
+    prompt_tokens_estimate: int,
+    stopped_early: bool,
+    logprobs: Sequence[TokenLogprob] = (),
+) -> ApiTrace:
+    """Trace for a streamed completion.
+
+    The provider's final usage chunk is used when the stream ran to the end. When
+    it was closed early (or the provider sent no usage) token counts fall back to
+    one token per streamed delta and the chars/4 prompt estimate, and the trace
+    is marked ``tokens_estimated``; ``request_id`` still allows an exact lookup
+    of the billed generation.
+    """
+    if usage is not None:
+        fields = _usage_fields(usage)
+    else:
+        completion = content_chunks + reasoning_chunks
+        fields = {
+            "reasoning_tokens": reasoning_chunks,
+            "prompt_tokens": prompt_tokens_estimate,
+            "completion_tokens": completion,
+            "total_tokens": prompt_tokens_estimate + completion,
+        }
+    return ApiTrace.model_validate(
+        {
+            "model_id": model_id,
+            "request_id": response_id,
+            "reasoning_content": reasoning,
+            "response_content": content,
+            "stopped_early": stopped_early,
+            "tokens_estimated": usage is None,
+            **fields,
+            **logprob_fields(logprobs),
+        }
     )
 
 
@@ -0,0 +1,200 @@
+"""AIMD concurrency control for experiment runners.
+
+``AdaptiveConcurrency`` is a drop-in replacement for the ``asyncio.Semaphore``
+the runners use to bound in-flight work. It raises its limit by one slot per
+window of healthy completions and cuts it multiplicatively on overload:
+exceptions escaping a slot, timeouts reported with ``record_timeout``, or any 429
+seen by the shared rate limiters (``note_overload``). "Healthy" means a low error
+rate and a windowed p95 latency within ``latency_tolerance`` of the best p95
+observed so far.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from types import TracebackType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_overload_lock = threading.Lock()
+_overload_events = 0
+
+
+def note_overload() -> None:
+    """Record a process-wide overload signal (429, provider timeout)."""
+    global _overload_events
+    with _overload_lock:
+        _overload_events += 1
+
+
+def overload_events() -> int:
+    with _overload_lock:
+        return _overload_events
+
+
+def _is_overload(exc: BaseException) -> bool:
+    return isinstance(exc, (asyncio.TimeoutError, TimeoutError)) or "429" in str(exc)
+
+
+class AdaptiveConcurrency:
+    """Semaphore whose limit follows additive-increase / multiplicative-decrease."""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        window: int = 20,
+        decrease_factor: float = 0.5,
+        max_error_rate: float = 0.1,
+        latency_tolerance: float = 2.0,
+        name: str = "runner",
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(self.max_limit, max(self.min_limit, initial))
+        self.window = max(1, window)
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.in_flight = 0
+        self.best_p95: float | None = None
+        self.history: list[tuple[float, int]] = [(time.monotonic(), self.limit)]
+        self._latencies: deque[float] = deque(maxlen=self.window)
+        self._outcomes: deque[bool] = deque(maxlen=self.window)
+        self._since_change = 0
+        self._seen_overload = overload_events()
+        self._cooldown = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._starts: dict[asyncio.Task[Any] | None, list[float]] = {}
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.limit:
+            fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # Woken but cancelled before taking the slot: hand it on.
+                    self._wake()
+                raise
+            finally:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> "AdaptiveConcurrency":
+        await self.acquire()
+        task = asyncio.current_task()
+        self._starts.setdefault(task, []).append(time.monotonic())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        task = asyncio.current_task()
+        starts = self._starts.get(task) or []
+        started = starts.pop() if starts else None
+        if not starts:
+            self._starts.pop(task, None)
+        self.release()
+        latency = time.monotonic() - started if started is not None else None
+        if exc is None:
+            self.record(latency, ok=True)
+        elif isinstance(exc, Exception):
+            self.record(latency, ok=False, overload=_is_overload(exc))
+
+    def record_timeout(self) -> None:
+        self.record(None, ok=False, overload=True)
+
+    def record(self, latency: float | None, *, ok: bool, overload: bool = False) -> None:
+        if latency is not None and ok:
+            self._latencies.append(latency)
+        self._outcomes.append(ok)
+        self._since_change += 1
+        self._cooldown = max(0, self._cooldown - 1)
+        current_overload = overload_events()
+        overload = overload or current_overload > self._seen_overload
+        self._seen_overload = current_overload
+        if overload:
+            self._decrease()
+        elif self._since_change >= max(self.limit, self.window // 2) and self._healthy():
+            self._set_limit(self.limit + 1)
+
+    def _p95(self) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def _healthy(self) -> bool:
+        if self._outcomes:
+            error_rate = self._outcomes.count(False) / len(self._outcomes)
+            if error_rate > self.max_error_rate:
+                return False
+        p95 = self._p95()
+        if p95 is None:
+            return True
+        if self.best_p95 is None or p95 < self.best_p95:
+            self.best_p95 = p95
+        return p95 <= self.best_p95 * self.latency_tolerance
+
+    def _decrease(self) -> None:
+        # After a cut, ignore further overload signals until the in-flight work
+        # started under the old limit has drained: a burst of 429s is one event.
+        if self._cooldown > 0:
+            return
+        previous = self.limit
+        self._set_limit(math.floor(previous * self.decrease_factor))
+        self._cooldown = previous
+
+    def _set_limit(self, value: int) -> None:
+        value = min(self.max_limit, max(self.min_limit, value))
+        self._since_change = 0
+        if value == self.limit:
+            return
+        logger.info(
+            "concurrency.%s limit %d -> %d (p95=%s in_flight=%d)",
+            self.name,
+            self.limit,
+            value,
+            f"{self._p95():.2f}s" if self._p95() is not None else "n/a",
+            self.in_flight,
+        )
+        self.limit = value
+        self.history.append((time.monotonic(), value))
+        self._wake()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "p95_sec": self._p95(),
+            "changes": len(self.history) - 1,
+        }
@@ -0,0 +1,156 @@
+"""Persistent float32 embedding cache keyed by ``(model, sha256(text))``.
+
+Each embedding model gets a directory under ``<cache_root>/embeddings/`` holding
+an append-only ``vectors.f32`` matrix (row-major float32, memory-mapped for
+reads), an ``index.tsv`` mapping text digests to row numbers and a ``meta.json``
+with the vector dimension. Appends take an exclusive ``flock`` so several runners
+can share one cache; readers pick up rows written by other processes on the next
+lookup. Endpoints other than the default OpenRouter API (local stub servers,
+proxies) get their own ``namespace`` subdirectory so their vectors are never
+served to a run against the real API.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import re
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from confidence_tom.infra.paths import cache_root
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Memory-mapped store of embeddings for one model."""
+
+    def __init__(self, model: str, *, root: Path | None = None, namespace: str = "") -> None:
+        self.model = model
+        self.namespace = namespace
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "__", model)
+        base = root or cache_root() / "embeddings"
+        if namespace:
+            base = base / re.sub(r"[^A-Za-z0-9._-]+", "__", namespace)
+        self.dir = base / safe_name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.dir / "vectors.f32"
+        self.index_path = self.dir / "index.tsv"
+        self.meta_path = self.dir / "meta.json"
+        self.dim: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self._index: dict[str, int] = {}
+        self._index_offset = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with (self.dir / ".lock").open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        if self.dim is None and self.meta_path.exists():
+            self.dim = int(json.loads(self.meta_path.read_text(encoding="utf-8"))["dim"])
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._index_offset:
+            return
+        with self.index_path.open("rb") as f:
+            f.seek(self._index_offset)
+            chunk = f.read(size - self._index_offset)
+        # Only consume complete lines; a concurrent writer may be mid-append.
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            key, _, row = line.partition("\t")
+            if row:
+                self._index[key] = int(row)
+        self._index_offset += len(complete)
+
+    def _matrix(self, rows: int) -> np.ndarray[Any, np.dtype[np.float32]]:
+        assert self.dim is not None
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def get_many(self, texts: Sequence[str]) -> list[list[float] | None]:
+        """Cached vectors aligned with ``texts``; ``None`` where the text is not cached."""
+        with self._lock:
+            self._refresh()
+            rows = [self._index.get(text_key(text)) for text in texts]
+            found = [row for row in rows if row is not None]
+            self.hits += len(found)
+            self.misses += len(rows) - len(found)
+            if not found:
+                return [None] * len(texts)
+            matrix = self._matrix(max(found) + 1)
+            return [None if row is None else matrix[row].tolist() for row in rows]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        if not texts:
+            return
+        with self._lock, self._file_lock():
+            self._refresh()
+            fresh: dict[str, Sequence[float]] = {}
+            for text, vector in zip(texts, vectors):
+                key = text_key(text)
+                if key not in self._index:
+                    fresh[key] = vector
+            if not fresh:
+                return
+            block = np.asarray(list(fresh.values()), dtype=np.float32)
+            if self.dim is None:
+                self.dim = int(block.shape[1])
+                self.meta_path.write_text(
+                    json.dumps({"model": self.model, "dim": self.dim}), encoding="utf-8"
+                )
+            if block.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dim {block.shape[1]} does not match cache dim {self.dim}"
+                )
+            start = (
+                self.vectors_path.stat().st_size // (4 * self.dim)
+                if self.vectors_path.exists()
+                else 0
+            )
+            with self.vectors_path.open("ab") as f:
+                f.write(block.tobytes())
+            lines = "".join(f"{key}\t{start + i}\n" for i, key in enumerate(fresh))
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+            self._refresh()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.model,
+                "rows": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_registry_lock = threading.Lock()
+_caches: dict[tuple[str, str], EmbeddingCache] = {}
+
+
+def embedding_cache_for(model: str, namespace: str = "") -> EmbeddingCache:
+    with _registry_lock:
+        cache = _caches.get((namespace, model))
+        if cache is None:
+            cache = EmbeddingCache(model, namespace=namespace)
+            _caches[(namespace, model)] = cache
+        return cache
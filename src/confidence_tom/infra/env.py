@@ -0,0 +1,16 @@
+"""Deferred ``.env`` loading.
+
+Runs once, from whatever first reads configuration (``LLMClient``, the project
+or output root), instead of as a side effect of importing the client module.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
@@ -0,0 +1,79 @@
+"""Hedged requests for tail latency.
+
+When a call has been outstanding longer than the configured latency percentile
+of recent calls to the same ``(backend, model, kind)``, ``LLMClient`` sends a
+duplicate with different routing (an alternate OpenRouter ``provider`` block or
+an alternate model), keeps whichever answer arrives first and cancels the other.
+Streamed calls race until their first token; the losing stream is closed.
+``ApiTrace.hedge_path`` records which request won.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from confidence_tom.infra.model_config import hedge_alternate
+
+_WINDOW = 200
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 0.95
+    min_samples: int = 20
+    initial_delay_sec: float = 60.0
+    min_delay_sec: float = 2.0
+    max_delay_sec: float = 300.0
+    provider: dict[str, Any] | None = None
+    model: str | None = None
+
+    def hedge_kwargs(self, kwargs: dict[str, Any]) -> dict[str, Any] | None:
+        """Completion kwargs for the duplicate request with alternate routing.
+
+        ``None`` when there is no alternate model or provider: an identical
+        duplicate would only double the load on the route that is already slow.
+        """
+        alternate_model = self.model or hedge_alternate(str(kwargs.get("model", "")))
+        if not alternate_model and not self.provider:
+            return None
+        hedged = dict(kwargs)
+        if alternate_model:
+            hedged["model"] = alternate_model
+        if self.provider:
+            extra_body = dict(hedged.get("extra_body") or {})
+            extra_body["provider"] = self.provider
+            hedged["extra_body"] = extra_body
+        return hedged
+
+
+_lock = threading.Lock()
+_latencies: dict[tuple[str, str, str], deque[float]] = {}
+
+
+def record_latency(key: tuple[str, str, str], seconds: float) -> None:
+    with _lock:
+        window = _latencies.get(key)
+        if window is None:
+            window = _latencies[key] = deque(maxlen=_WINDOW)
+        window.append(seconds)
+
+
+def reset_latencies() -> None:
+    with _lock:
+        _latencies.clear()
+
+
+def hedge_delay(key: tuple[str, str, str], policy: HedgePolicy) -> float:
+    """Seconds to wait on the primary before sending the hedge."""
+    with _lock:
+        observed = sorted(_latencies.get(key, ()))
+    if len(observed) < policy.min_samples:
+        delay = policy.initial_delay_sec
+    else:
+        idx = min(len(observed) - 1, max(0, math.ceil(policy.percentile * len(observed)) - 1))
+        delay = observed[idx]
+    return min(policy.max_delay_sec, max(policy.min_delay_sec, delay))
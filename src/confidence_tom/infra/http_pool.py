@@ -0,0 +1,198 @@
+"""Process-wide pooled HTTP transport for OpenAI-compatible endpoints.
+
+Every ``LLMClient`` pointing at the same ``(backend, base_url, api_key)`` shares
+one keep-alive connection pool instead of building its own, so runners that
+create several clients per task do not pay a TLS handshake per client. Async
+clients are additionally scoped to the running event loop because pooled
+connections cannot be reused across loops; ``asyncio.run`` does not close them,
+so runners wrap their entry coroutine in ``closing_shared_clients`` (or await
+``aclose_shared_clients``) before the loop ends.
+
+Responses are also fed to the per-model rate limiters so that
+``x-ratelimit-*`` headers are learned without unwrapping SDK responses.
+
+Pool limits can be set with ``configure_http_pool`` or the
+``CONFIDENCE_TOM_HTTP_MAX_CONNECTIONS``, ``CONFIDENCE_TOM_HTTP_MAX_KEEPALIVE``
+and ``CONFIDENCE_TOM_HTTP2`` environment variables.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from collections.abc import Awaitable
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from confidence_tom.infra.rate_limit import observe_response_headers
+
+_PoolKey = tuple[str, str, str]
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class HttpPoolLimits:
+    max_connections: int = 256
+    max_keepalive_connections: int = 64
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    http2: bool = True
+
+
+def _env_limits() -> HttpPoolLimits:
+    limits = HttpPoolLimits()
+    overrides: dict[str, Any] = {}
+    if value := os.getenv("CONFIDENCE_TOM_HTTP_MAX_CONNECTIONS", "").strip():
+        overrides["max_connections"] = int(value)
+    if value := os.getenv("CONFIDENCE_TOM_HTTP_MAX_KEEPALIVE", "").strip():
+        overrides["max_keepalive_connections"] = int(value)
+    if value := os.getenv("CONFIDENCE_TOM_HTTP2", "").strip():
+        overrides["http2"] = value.lower() not in {"0", "false", "no"}
+    return replace(limits, **overrides)
+
+
+_lock = threading.Lock()
+_limits: HttpPoolLimits | None = None
+_sync_clients: dict[_PoolKey, OpenAI] = {}
+_unbound_async_clients: dict[_PoolKey, AsyncOpenAI] = {}
+_loop_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[_PoolKey, AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+
+
+def configure_http_pool(**overrides: Any) -> HttpPoolLimits:
+    """Update pool limits; only affects transports created after the call."""
+    global _limits
+    with _lock:
+        _limits = replace(_limits or _env_limits(), **overrides)
+        return _limits
+
+
+def http_pool_limits() -> HttpPoolLimits:
+    # Resolved lazily so values loaded from `.env` after import are honored.
+    global _limits
+    if _limits is None:
+        _limits = _env_limits()
+    return _limits
+
+
+def _http2_enabled(limits: HttpPoolLimits) -> bool:
+    # httpx needs the optional `h2` package for HTTP/2; fall back to HTTP/1.1.
+    return limits.http2 and importlib.util.find_spec("h2") is not None
+
+
+def _observe(backend: str, response: httpx.Response) -> None:
+    try:
+        body = response.request.content
+    except httpx.RequestNotRead:
+        return
+    observe_response_headers(backend, body, response.headers)
+
+
+def _sync_hooks(backend: str) -> dict[str, list[Any]]:
+    def _hook(response: httpx.Response) -> None:
+        _observe(backend, response)
+
+    return {"response": [_hook]}
+
+
+def _async_hooks(backend: str) -> dict[str, list[Any]]:
+    async def _hook(response: httpx.Response) -> None:
+        _observe(backend, response)
+
+    return {"response": [_hook]}
+
+
+def _httpx_kwargs(limits: HttpPoolLimits) -> dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(limits.read_timeout, connect=limits.connect_timeout),
+        "http2": _http2_enabled(limits),
+    }
+
+
+def shared_openai_client(backend: str, base_url: str, api_key: str) -> OpenAI:
+    key = (backend, base_url, api_key)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = OpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                http_client=httpx.Client(
+                    **_httpx_kwargs(http_pool_limits()), event_hooks=_sync_hooks(backend)
+                ),
+            )
+            _sync_clients[key] = client
+        return client
+
+
+def shared_async_openai_client(backend: str, base_url: str, api_key: str) -> AsyncOpenAI:
+    key = (backend, base_url, api_key)
+    try:
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    with _lock:
+        if loop is None:
+            registry = _unbound_async_clients
+        else:
+            registry = _loop_async_clients.setdefault(loop, {})
+        client = registry.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                http_client=httpx.AsyncClient(
+                    **_httpx_kwargs(http_pool_limits()), event_hooks=_async_hooks(backend)
+                ),
+            )
+            registry[key] = client
+        return client
+
+
+def pooled_client_count() -> int:
+    with _lock:
+        return (
+            len(_sync_clients)
+            + len(_unbound_async_clients)
+            + sum(len(registry) for registry in _loop_async_clients.values())
+        )
+
+
+async def aclose_shared_clients() -> None:
+    """Close the async clients bound to the running loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        async_clients = list(_loop_async_clients.pop(loop, {}).values())
+    for aclient in async_clients:
+        await aclient.close()
+
+
+async def closing_shared_clients(main: Awaitable[_T]) -> _T:
+    """Await ``main``, then close the async clients it left on the running loop."""
+    try:
+        return await main
+    finally:
+        await aclose_shared_clients()
+
+
+async def aclose_http_pools() -> None:
+    """Close the async transports bound to the current loop and all sync transports."""
+    await aclose_shared_clients()
+    with _lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in sync_clients:
+        client.close()
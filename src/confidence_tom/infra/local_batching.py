@@ -0,0 +1,191 @@
+"""In-process micro-batching for the local transformers backend.
+
+Concurrent ``LLMClient`` coroutines on ``backend="local"`` submit prompts to a
+per-model ``LocalBatcher`` instead of each running ``model.generate`` in its own
+thread. A single worker collects requests until ``max_batch_size`` is reached or
+``max_wait_ms`` has passed since the first one arrived, runs one left-padded
+``generate`` per sampling temperature, and resolves every caller's future.
+Requests whose prompt extends a prefix held in the local KV cache are split out
+of the padded call so they keep their reuse (see ``local_generate_batch``).
+
+Limits can be set with ``configure_local_batching`` or the
+``CONFIDENCE_TOM_LOCAL_MAX_BATCH`` and ``CONFIDENCE_TOM_LOCAL_MAX_WAIT_MS``
+environment variables. A batch size of 1 disables batching.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.client_local import local_generate_batch
+
+BatchRunner = Callable[..., list[tuple[str, ApiTrace]]]
+
+
+@dataclass(frozen=True)
+class LocalBatchSettings:
+    max_batch_size: int = 8
+    max_wait_ms: float = 10.0
+
+
+def _env_settings() -> LocalBatchSettings:
+    overrides: dict[str, Any] = {}
+    if value := os.getenv("CONFIDENCE_TOM_LOCAL_MAX_BATCH", "").strip():
+        overrides["max_batch_size"] = int(value)
+    if value := os.getenv("CONFIDENCE_TOM_LOCAL_MAX_WAIT_MS", "").strip():
+        overrides["max_wait_ms"] = float(value)
+    return replace(LocalBatchSettings(), **overrides)
+
+
+@dataclass
+class _Pending:
+    messages: list[dict[str, Any]]
+    max_tokens: int
+    temperature: float
+    future: asyncio.Future[tuple[str, ApiTrace]]
+
+
+class LocalBatcher:
+    """Collects concurrent local generation requests into padded batches."""
+
+    def __init__(
+        self,
+        run_batch: BatchRunner,
+        *,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def submit(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        max_tokens: int,
+        temperature: float,
+    ) -> tuple[str, ApiTrace]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[tuple[str, ApiTrace]] = loop.create_future()
+        self._queue.put_nowait(_Pending(messages, max_tokens, temperature, future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return await future
+
+    async def _collect(self) -> list[_Pending]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            groups: dict[float, list[_Pending]] = {}
+            for pending in batch:
+                if not pending.future.done():  # caller was cancelled while queued
+                    groups.setdefault(pending.temperature, []).append(pending)
+            for temperature, group in groups.items():
+                await self._generate(group, temperature)
+
+    async def _generate(self, group: list[_Pending], temperature: float) -> None:
+        self.requests += len(group)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(group))
+        try:
+            results = await asyncio.to_thread(
+                self.run_batch,
+                batch=[p.messages for p in group],
+                max_tokens=[p.max_tokens for p in group],
+                temperature=temperature,
+            )
+        except Exception as exc:
+            for pending in group:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+        for pending, result in zip(group, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+
+
+_lock = threading.Lock()
+_settings: LocalBatchSettings | None = None
+_batchers: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, bool, int], LocalBatcher]
+] = weakref.WeakKeyDictionary()
+
+
+def configure_local_batching(**overrides: Any) -> LocalBatchSettings:
+    """Update batching limits; only affects batchers created after the call."""
+    global _settings
+    with _lock:
+        _settings = replace(_settings or _env_settings(), **overrides)
+        return _settings
+
+
+def local_batch_settings() -> LocalBatchSettings:
+    global _settings
+    if _settings is None:
+        _settings = _env_settings()
+    return _settings
+
+
+def local_batcher_for(
+    model_name: str, trust_remote_code: bool, top_logprobs: int = 0
+) -> LocalBatcher:
+    """Batcher for this model on the running event loop (futures are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    key = (model_name, trust_remote_code, top_logprobs)
+    settings = local_batch_settings()
+    with _lock:
+        registry = _batchers.setdefault(loop, {})
+        batcher = registry.get(key)
+        if batcher is None:
+            batcher = LocalBatcher(
+                functools.partial(
+                    local_generate_batch,
+                    model_name=model_name,
+                    trust_remote_code=trust_remote_code,
+                    top_logprobs=top_logprobs,
+                ),
+                max_batch_size=settings.max_batch_size,
+                max_wait_ms=settings.max_wait_ms,
+            )
+            registry[key] = batcher
+        return batcher
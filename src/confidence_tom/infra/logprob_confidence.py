@@ -0,0 +1,160 @@
+"""Confidence signals read from token log-probabilities of the main generation.
+
+With ``LLMClient(logprob_confidence=True)`` the answer-producing call requests
+``logprobs``/``top_logprobs`` (the local backend computes them from its scores),
+and two signals are derived without a follow-up elicitation call:
+
+* ``answer_prob``: joint probability of the tokens spelling the final answer
+  (the last ``\\boxed{}`` group, else the ``Final Answer:`` line, else the last
+  non-empty line).
+* ``expected_confidence``: when the reply states ``Confidence: NN``, the mean of
+  the number under the top-k alternatives for its leading token, in [0, 1].
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+_FINAL_ANSWER_RE = re.compile(r"final answer\s*[:：]\s*(.+)", re.IGNORECASE)
+_CONFIDENCE_RE = re.compile(r"confidence[^0-9\n]{0,24}?(\d{1,3})\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class TokenLogprob:
+    token: str
+    logprob: float
+    top: tuple[tuple[str, float], ...] = ()
+
+
+@dataclass
+class LogprobConfidence:
+    answer_prob: float | None = None
+    answer_tokens: int = 0
+    expected_confidence: float | None = None
+    confidence_distribution: dict[int, float] = field(default_factory=dict)
+
+
+def _get(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def tokens_from_openai(logprobs: Any) -> list[TokenLogprob]:
+    """Normalize ``choice.logprobs`` (object or dict, ``content`` list) to ``TokenLogprob``s."""
+    content = _get(logprobs, "content") if logprobs is not None else None
+    tokens: list[TokenLogprob] = []
+    for item in content or []:
+        top = tuple(
+            (str(_get(alt, "token") or ""), float(_get(alt, "logprob") or 0.0))
+            for alt in _get(item, "top_logprobs") or []
+        )
+        tokens.append(
+            TokenLogprob(
+                token=str(_get(item, "token") or ""),
+                logprob=float(_get(item, "logprob") or 0.0),
+                top=top,
+            )
+        )
+    return tokens
+
+
+def _balanced_group(text: str, start: int) -> int | None:
+    depth = 0
+    for idx in range(start, len(text)):
+        if text[idx] == "{":
+            depth += 1
+        elif text[idx] == "}":
+            depth -= 1
+            if depth == 0:
+                return idx
+    return None
+
+
+def answer_span(text: str) -> tuple[int, int] | None:
+    """Character span of the final answer in ``text``."""
+    boxed = text.rfind("\\boxed{")
+    if boxed >= 0:
+        open_brace = boxed + len("\\boxed")
+        close = _balanced_group(text, open_brace)
+        if close is not None and close > open_brace + 1:
+            return open_brace + 1, close
+    matches = list(_FINAL_ANSWER_RE.finditer(text))
+    if matches:
+        start, end = matches[-1].span(1)
+        stripped = matches[-1].group(1).rstrip()
+        return start, start + len(stripped)
+    lines = [m for m in re.finditer(r"[^\n]*\S[^\n]*", text)]
+    if lines:
+        line = lines[-1]
+        leading = len(line.group(0)) - len(line.group(0).lstrip())
+        return line.start() + leading, line.start() + len(line.group(0).rstrip())
+    return None
+
+
+def _token_offsets(tokens: Sequence[TokenLogprob]) -> list[int]:
+    offsets = []
+    pos = 0
+    for token in tokens:
+        offsets.append(pos)
+        pos += len(token.token)
+    return offsets
+
+
+def _covering(offsets: list[int], tokens: Sequence[TokenLogprob], start: int, end: int) -> range:
+    first = last = None
+    for idx, (offset, token) in enumerate(zip(offsets, tokens)):
+        if offset < end and offset + len(token.token) > start:
+            first = idx if first is None else first
+            last = idx
+    return range(0) if first is None or last is None else range(first, last + 1)
+
+
+def _confidence_distribution(
+    tokens: Sequence[TokenLogprob], offsets: list[int], text: str
+) -> dict[int, float]:
+    matches = list(_CONFIDENCE_RE.finditer(text))
+    if not matches:
+        return {}
+    start, end = matches[-1].span(1)
+    covering = _covering(offsets, tokens, start, end)
+    if not covering:
+        return {}
+    lead = tokens[covering[0]]
+    # Digits spelled by later tokens stay fixed; only the leading token varies.
+    rest = text[offsets[covering[0]] + len(lead.token) : end]
+    before = text[offsets[covering[0]] : start]
+    candidates = lead.top or ((lead.token, lead.logprob),)
+    weights: dict[int, float] = {}
+    for alt, logprob in candidates:
+        alt = alt.strip()
+        if before.strip() and alt.startswith(before.strip()):
+            alt = alt[len(before.strip()) :]
+        digits = alt + rest
+        if not digits.isdigit() or not 0 <= int(digits) <= 100:
+            continue
+        weights[int(digits)] = weights.get(int(digits), 0.0) + math.exp(logprob)
+    total = sum(weights.values())
+    return {value: weight / total for value, weight in sorted(weights.items())} if total else {}
+
+
+def logprob_confidence(tokens: Sequence[TokenLogprob]) -> LogprobConfidence:
+    if not tokens:
+        return LogprobConfidence()
+    text = "".join(token.token for token in tokens)
+    offsets = _token_offsets(tokens)
+    result = LogprobConfidence()
+    span = answer_span(text)
+    if span is not None:
+        covering = _covering(offsets, tokens, *span)
+        if covering:
+            result.answer_tokens = len(covering)
+            result.answer_prob = round(math.exp(sum(tokens[i].logprob for i in covering)), 6)
+    distribution = _confidence_distribution(tokens, offsets, text)
+    if distribution:
+        result.confidence_distribution = distribution
+        expected = sum(value * prob for value, prob in distribution.items()) / 100.0
+        result.expected_confidence = round(expected, 6)
+    return result
@@ -88,3 +88,48 @@ def get_observer(key: str) -> ModelSpec:
         if m.key == key:
             return m
     raise KeyError(f"Unknown observer model '{key}'. Known: {sorted(OBSERVER_KEYS)}")
+
+
+# ---------------------------------------------------------------------------
+# Hedging alternates — same weights behind different OpenRouter routing
+# ---------------------------------------------------------------------------
+
+HEDGE_ALTERNATES: dict[str, str] = {
+    "qwen/qwen3-14b:nitro": "qwen/qwen3-14b",
+    "qwen/qwen3-14b": "qwen/qwen3-14b:nitro",
+    "qwen/qwen3-8b": "qwen/qwen3-8b:nitro",
+    "qwen/qwen3-32b": "qwen/qwen3-32b:nitro",
+}
+
+
+def hedge_alternate(api_id: str) -> str | None:
+    return HEDGE_ALTERNATES.get(api_id)
+
+
+# ---------------------------------------------------------------------------
+# Context windows (tokens) — longest matching id prefix wins; unlisted models
+# are not fitted unless the client sets `num_ctx` or a budget window
+# ---------------------------------------------------------------------------
+
+CONTEXT_WINDOWS: dict[str, int] = {
+    "qwen/qwen3-": 40960,
+    "qwen/qwen-2.5-": 32768,
+    "google/gemma-3-": 131072,
+    "google/gemma-2-": 8192,
+    "google/gemini-": 1048576,
+    "openai/gpt-5": 400000,
+    "anthropic/claude-": 200000,
+    "mistralai/mistral-7b-instruct": 32768,
+    "meta-llama/llama-3.1-": 131072,
+    "Qwen/Qwen3-": 40960,
+    "Qwen/Qwen2.5-": 32768,
+    "mistralai/Mistral-7B-Instruct": 32768,
+    "qwen3:": 40960,
+    "gemma3:": 131072,
+    "llama3.1:": 131072,
+}
+
+
+def context_window(model_id: str) -> int | None:
+    matches = [prefix for prefix in CONTEXT_WINDOWS if model_id.startswith(prefix)]
+    return CONTEXT_WINDOWS[max(matches, key=len)] if matches else None
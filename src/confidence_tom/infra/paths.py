@@ -13,17 +13,22 @@ from pathlib import Path
 
 import tomllib
 
+from confidence_tom.infra.env import load_env
+
 _PROJECT_ROOT = Path(__file__).resolve().parents[3]
 _PYPROJECT_PATH = _PROJECT_ROOT / "pyproject.toml"
 
 
 @lru_cache(maxsize=1)
 def project_root() -> Path:
+    # Scripts read their settings from the environment right after this call.
+    load_env()
     return _PROJECT_ROOT
 
 
 @lru_cache(maxsize=1)
 def output_root() -> Path:
+    load_env()
     env_root = os.getenv("CONFIDENCE_TOM_OUTPUT_ROOT", "").strip()
     if env_root:
         return _resolve_root(env_root)
@@ -53,6 +58,11 @@ def logs_root() -> Path:
     return output_root() / "logs"
 
 
+@lru_cache(maxsize=1)
+def cache_root() -> Path:
+    return output_root() / "cache"
+
+
 def _resolve_root(value: str) -> Path:
     path = Path(value)
     if not path.is_absolute():
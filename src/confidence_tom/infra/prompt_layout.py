@@ -0,0 +1,51 @@
+"""Prompt assembly that keeps provider prompt caches warm across prefix steps.
+
+Continuation prompts are sent as a list of text parts: a stable head (problem
+statement), one part per block of the growing reasoning prefix, then the
+instruction tail. Every part carries its own trailing separator, so the parts of
+step ``k`` are a byte-identical prefix of the parts of step ``k + 1`` and their
+concatenation equals the flat prompt the runners used before. Cache breakpoints
+(``cache_control``) mark the end of the head and of the prefix; OpenRouter
+forwards them to providers with explicit caching and providers with automatic
+prefix caching simply see a stable prefix. Other backends receive the flattened
+string (see ``flatten_text_parts``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def text_part(text: str, *, breakpoint: bool = False) -> dict[str, Any]:
+    part: dict[str, Any] = {"type": "text", "text": text}
+    if breakpoint:
+        part["cache_control"] = dict(_CACHE_CONTROL)
+    return part
+
+
+def prefix_blocks(prefix_text: str, separator: str = "\n\n") -> list[str]:
+    """Split a growing prefix into blocks that each keep their trailing separator."""
+    if not prefix_text:
+        return []
+    return [block + separator for block in prefix_text.split(separator)]
+
+
+def layered_messages(
+    system_prompt: str,
+    head: str,
+    growing: Sequence[str],
+    tail: str,
+) -> list[dict[str, Any]]:
+    """System + user messages laid out as ``head | growing... | tail`` text parts."""
+    parts = [text_part(head, breakpoint=True)]
+    parts.extend(
+        text_part(block, breakpoint=idx == len(growing) - 1) for idx, block in enumerate(growing)
+    )
+    parts.append(text_part(tail))
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": parts},
+    ]
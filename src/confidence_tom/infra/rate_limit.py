@@ -0,0 +1,278 @@
+"""Adaptive token-bucket rate limiting shared per (backend, model).
+
+Every async ``LLMClient`` call acquires from the limiter for its backend/model
+before sending. Limits start open (or at ``configure_rate_limit`` values) and are
+learned from traffic: a 429 halves the request rate and pauses all waiters until
+the provider's reset time, each success adds back a little headroom, and
+``x-ratelimit-*`` response headers pin the ceiling and remaining budget. After a
+pause, waiters are released at the bucket rate instead of all at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+from confidence_tom.infra.concurrency import note_overload
+
+_BURST_SEC = 10.0
+_MIN_RPM = 6.0
+_DEFAULT_PAUSE_SEC = 5.0
+_MAX_PAUSE_SEC = 120.0
+_DECREASE_FACTOR = 0.5
+_INCREASE_STEP_RPM = 1.0
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_seconds(value: str | None) -> float | None:
+    """Seconds until reset from `1s`/`6m0s`/`250ms` durations or epoch timestamps."""
+    text = (value or "").strip()
+    if not text:
+        return None
+    try:
+        number = float(text)
+    except ValueError:
+        parts = _DURATION_RE.findall(text)
+        if not parts:
+            return None
+        return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+    if number > 1e12:  # epoch milliseconds (OpenRouter X-RateLimit-Reset)
+        return max(0.0, number / 1000.0 - time.time())
+    if number > 1e9:  # epoch seconds
+        return max(0.0, number - time.time())
+    return max(0.0, number)
+
+
+def estimate_prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    """Cheap chars/4 estimate used to pre-charge the tokens/min bucket."""
+    chars = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            chars += sum(
+                len(str(part.get("text", ""))) for part in content if isinstance(part, dict)
+            )
+        else:
+            chars += len(str(content))
+    return max(1, chars // 4)
+
+
+class _Bucket:
+    def __init__(self, per_minute: float | None) -> None:
+        self.per_minute = per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        if self.per_minute is None:
+            return float("inf")
+        return max(1.0, self.per_minute * _BURST_SEC / 60.0)
+
+    def refill(self, now: float) -> None:
+        if self.per_minute is not None:
+            elapsed = max(0.0, now - self.updated)
+            self.level = min(self.capacity, self.level + elapsed * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_for(self, cost: float) -> float:
+        if self.per_minute is None:
+            return 0.0
+        need = min(cost, self.capacity)
+        if self.level >= need:
+            return 0.0
+        return (need - self.level) * 60.0 / self.per_minute
+
+
+class AdaptiveRateLimiter:
+    """Requests/min and tokens/min buckets that adapt to provider feedback."""
+
+    def __init__(
+        self,
+        key: tuple[str, str],
+        *,
+        rpm: float | None = None,
+        tpm: float | None = None,
+    ) -> None:
+        self.key = key
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.rpm_ceiling: float | None = None
+        self.blocked_until = 0.0
+        self.rate_limited = 0
+        self.waited_sec = 0.0
+        self._sent: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _observed_rpm(self, now: float) -> float:
+        while self._sent and now - self._sent[0] > 60.0:
+            self._sent.popleft()
+        if not self._sent:
+            return _MIN_RPM
+        span = max(_BURST_SEC, now - self._sent[0])
+        return len(self._sent) * 60.0 / span
+
+    def _try_acquire(self, est_tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(self.requests.wait_for(1.0), self.tokens.wait_for(float(est_tokens)))
+            if wait > 0:
+                return wait
+            self.requests.level -= 1.0
+            self.tokens.level -= min(float(est_tokens), self.tokens.capacity)
+            self._sent.append(now)
+            return 0.0
+
+    async def acquire(self, est_tokens: int = 0) -> float:
+        """Wait until a request fits both buckets; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(est_tokens)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        if waited:
+            with self._lock:
+                self.waited_sec += waited
+        return waited
+
+    def record_success(self, est_tokens: int = 0, total_tokens: int = 0) -> None:
+        with self._lock:
+            if self.tokens.per_minute is not None and total_tokens:
+                # Settle the pre-charged estimate against the actual usage.
+                self.tokens.level -= total_tokens - min(float(est_tokens), self.tokens.capacity)
+            rpm = self.requests.per_minute
+            if rpm is not None:
+                ceiling = self.rpm_ceiling or float("inf")
+                self.requests.per_minute = min(ceiling, rpm + _INCREASE_STEP_RPM)
+
+    def record_rate_limited(self, headers: Mapping[str, str] | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.rate_limited += 1
+            current = self.requests.per_minute or self._observed_rpm(now)
+            self.requests.per_minute = max(_MIN_RPM, current * _DECREASE_FACTOR)
+            self.requests.level = 0.0
+            self.requests.updated = now
+            pause = _retry_after(headers) or _DEFAULT_PAUSE_SEC
+            self.blocked_until = max(self.blocked_until, now + min(pause, _MAX_PAUSE_SEC))
+        note_overload()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Apply `x-ratelimit-*` limits and remaining budget from a provider response."""
+        lowered = {k.lower(): v for k, v in headers.items()}
+        with self._lock:
+            now = time.monotonic()
+            limit_requests = _as_float(lowered.get("x-ratelimit-limit-requests"))
+            if limit_requests:
+                self.rpm_ceiling = limit_requests
+                if self.requests.per_minute is None or self.requests.per_minute > limit_requests:
+                    self.requests.per_minute = limit_requests
+            limit_tokens = _as_float(lowered.get("x-ratelimit-limit-tokens"))
+            if limit_tokens:
+                self.tokens.per_minute = limit_tokens
+            for remaining_key, reset_key in (
+                ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+                ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+                ("x-ratelimit-remaining", "x-ratelimit-reset"),
+            ):
+                remaining = _as_float(lowered.get(remaining_key))
+                if remaining is not None and remaining <= 0:
+                    reset = parse_reset_seconds(lowered.get(reset_key))
+                    if reset:
+                        pause = min(reset, _MAX_PAUSE_SEC)
+                        self.blocked_until = max(self.blocked_until, now + pause)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.key[0],
+                "model": self.key[1],
+                "rpm": self.requests.per_minute,
+                "tpm": self.tokens.per_minute,
+                "rate_limited": self.rate_limited,
+                "waited_sec": round(self.waited_sec, 3),
+            }
+
+
+def _as_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value not in {None, ""} else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(headers: Mapping[str, str] | None) -> float | None:
+    if not headers:
+        return None
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if ms := _as_float(lowered.get("retry-after-ms")):
+        return ms / 1000.0
+    for key in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset"):
+        seconds = parse_reset_seconds(lowered.get(key))
+        if seconds:
+            return seconds
+    return None
+
+
+_registry_lock = threading.Lock()
+_limiters: dict[tuple[str, str], AdaptiveRateLimiter] = {}
+
+
+def rate_limiter_for(backend: str, model: str) -> AdaptiveRateLimiter:
+    key = (backend, model)
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(key)
+            _limiters[key] = limiter
+        return limiter
+
+
+def configure_rate_limit(
+    backend: str, model: str, *, rpm: float | None = None, tpm: float | None = None
+) -> AdaptiveRateLimiter:
+    """Seed a limiter with known limits instead of learning them from 429s."""
+    limiter = rate_limiter_for(backend, model)
+    with limiter._lock:
+        if rpm is not None:
+            limiter.requests = _Bucket(rpm)
+        if tpm is not None:
+            limiter.tokens = _Bucket(tpm)
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget every learned limiter, e.g. between independent load-test levels."""
+    with _registry_lock:
+        _limiters.clear()
+
+
+def rate_limit_stats() -> list[dict[str, Any]]:
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def observe_response_headers(backend: str, request_body: bytes, headers: Mapping[str, str]) -> None:
+    """Feed `x-ratelimit-*` headers from a raw HTTP response to the matching limiter."""
+    if not any(k.lower().startswith("x-ratelimit") for k in headers):
+        return
+    try:
+        model = str(json.loads(request_body or b"{}").get("model") or "")
+    except (ValueError, AttributeError):
+        return
+    if model:
+        rate_limiter_for(backend, model).update_from_headers(headers)
@@ -0,0 +1,614 @@
+"""Offline replay backend for ``LLMClient``.
+
+``backend="replay"`` answers chat, structured-output, streaming and embedding
+calls from a cassette instead of a provider, so runners can be profiled and
+load-tested without network access or spend. A cassette is a JSONL file of
+``CassetteEntry`` rows and comes from one of two places:
+
+* ``build_cassette`` harvests ``ApiTrace`` dumps (``response_content`` and
+  friends) from result files and partial stores. These rows carry no request or
+  call kind, so they are served in recorded order per model.
+* ``configure_replay_recording`` (or ``CONFIDENCE_TOM_REPLAY_RECORD``) makes every
+  live call append a row keyed by its model and messages, which replays exactly.
+
+Lookups try the request key first, then rotate through the rows recorded for the
+same model family and a compatible call kind (structured ``parse`` rows are
+never served as free text or the other way round); anything else raises
+``ReplayMiss``. Fallback answers are logged, and counted again at exit, since
+a run served by them only looks successful. With ``latency_scale > 0``
+responses are delayed by the recorded latency (and streams by the recorded time
+to first token) times that factor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from openai.types import CreateEmbeddingResponse
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.client_utils import coerce_json_response, normalize_chat_message
+from confidence_tom.infra.rate_limit import estimate_prompt_tokens
+from confidence_tom.infra.response_cache import request_key
+
+logger = logging.getLogger(__name__)
+
+_EMBED_DIM = 256
+
+
+class ReplayMiss(LookupError):
+    """The cassette has nothing to serve for a request."""
+
+
+@dataclass
+class CassetteEntry:
+    model: str
+    response_content: str
+    reasoning_content: str = ""
+    kind: str = "chat"
+    key: str = ""
+    tool_calls: list[dict[str, Any]] | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    latency_sec: float | None = None
+    ttft_sec: float | None = None
+
+    @classmethod
+    def from_dict(cls, row: dict[str, Any]) -> CassetteEntry:
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in row.items() if k in names})
+
+
+def replay_key(model: str, messages: Sequence[dict[str, Any]]) -> str:
+    return request_key(
+        "replay", {"model": model, "messages": [normalize_chat_message(m) for m in messages]}
+    )
+
+
+def _family(model: str) -> str:
+    return model.split(":", 1)[0].lower()
+
+
+def _kind_group(kind: str) -> str:
+    # Plain and streamed completions are interchangeable; structured output is not.
+    return "parse" if kind == "parse" else "text"
+
+
+_KIND_GROUPS = ("text", "parse")
+
+
+class Cassette:
+    """Recorded responses indexed by request key and by model."""
+
+    def __init__(self, entries: Iterable[CassetteEntry] = ()) -> None:
+        self._lock = threading.Lock()
+        self._all: list[CassetteEntry] = []
+        self._by_key: dict[str, list[CassetteEntry]] = {}
+        # family -> kind group -> entries; kind-less harvested rows join every group.
+        self._by_model: dict[str, dict[str, list[CassetteEntry]]] = {}
+        self._cursors: dict[str, int] = {}
+        self._warned: set[tuple[str, str]] = set()
+        self.exact = 0
+        self.fallback = 0
+        self.misses = 0
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path: Path | str) -> Cassette:
+        entries = []
+        with Path(path).open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(CassetteEntry.from_dict(json.loads(line)))
+        return cls(entries)
+
+    def add(self, entry: CassetteEntry) -> None:
+        with self._lock:
+            self._all.append(entry)
+            if entry.key:
+                self._by_key.setdefault(entry.key, []).append(entry)
+            groups = self._by_model.setdefault(_family(entry.model), {})
+            for group in (_kind_group(entry.kind),) if entry.kind else _KIND_GROUPS:
+                groups.setdefault(group, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def _rotate(self, bucket: str, entries: list[CassetteEntry]) -> CassetteEntry:
+        cursor = self._cursors.get(bucket, 0)
+        self._cursors[bucket] = cursor + 1
+        return entries[cursor % len(entries)]
+
+    def _model_bucket(self, model: str, group: str) -> str | None:
+        family = _family(model)
+        if group in self._by_model.get(family, {}):
+            return family
+        # Providers report dated ids ("qwen/qwen3-14b-04-28") for aliased requests.
+        for name, groups in self._by_model.items():
+            if group in groups and (name.startswith(family) or family.startswith(name)):
+                return name
+        return None
+
+    def match(
+        self, model: str, messages: Sequence[dict[str, Any]], kind: str = "chat"
+    ) -> CassetteEntry:
+        key = replay_key(model, messages)
+        group = _kind_group(kind)
+        with self._lock:
+            if key in self._by_key:
+                self.exact += 1
+                return self._rotate(f"key:{key}", self._by_key[key])
+            bucket = self._model_bucket(model, group)
+            if bucket is not None:
+                self.fallback += 1
+                if (bucket, group) not in self._warned:
+                    self._warned.add((bucket, group))
+                    logger.warning(
+                        "Replay has no exact match for a %s %s call; serving recorded "
+                        "%s rows in rotation",
+                        model,
+                        kind,
+                        bucket,
+                    )
+                return self._rotate(f"model:{bucket}:{group}", self._by_model[bucket][group])
+            self.misses += 1
+        raise ReplayMiss(f"Replay cassette has no {group} entries for {model}")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._all),
+                "exact": self.exact,
+                "fallback": self.fallback,
+                "misses": self.misses,
+            }
+
+
+def _iter_trace_dicts(node: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(node, dict):
+        if "response_content" in node and "model_id" in node:
+            yield node
+            return
+        for value in node.values():
+            yield from _iter_trace_dicts(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_trace_dicts(value)
+
+
+def _iter_documents(path: Path) -> Iterator[Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        for line in text.splitlines():
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        return
+    try:
+        yield json.loads(text)
+    except ValueError:
+        return
+
+
+def _recorded_latencies(telemetry_path: Path) -> dict[str, list[tuple[float, float | None]]]:
+    latencies: dict[str, list[tuple[float, float | None]]] = {}
+    for event in _iter_documents(telemetry_path):
+        if not isinstance(event, dict) or event.get("outcome") not in {"ok", "stopped_early"}:
+            continue
+        if event.get("kind") == "embed":
+            continue
+        latencies.setdefault(_family(str(event.get("model", ""))), []).append(
+            (float(event.get("latency_sec", 0.0)), event.get("ttft_sec"))
+        )
+    return latencies
+
+
+def build_cassette(
+    sources: Iterable[Path | str], *, telemetry_path: Path | str | None = None
+) -> list[CassetteEntry]:
+    """Harvest ``ApiTrace`` dumps from JSON/JSONL files or directories of them.
+
+    When a telemetry JSONL from the same run is given, entries borrow its recorded
+    latencies model by model, in order, for latency emulation.
+    """
+    files: list[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in {".json", ".jsonl"}))
+        elif path.exists():
+            files.append(path)
+    entries: list[CassetteEntry] = []
+    for path in files:
+        for document in _iter_documents(path):
+            for trace in _iter_trace_dicts(document):
+                content = str(trace.get("response_content") or "")
+                if not content or trace.get("cache_hit"):
+                    continue
+                entries.append(
+                    CassetteEntry(
+                        model=str(trace.get("model_id") or ""),
+                        response_content=content,
+                        kind="",
+                        reasoning_content=str(trace.get("reasoning_content") or ""),
+                        prompt_tokens=int(trace.get("prompt_tokens") or 0),
+                        completion_tokens=int(trace.get("completion_tokens") or 0),
+                        reasoning_tokens=int(trace.get("reasoning_tokens") or 0),
+                    )
+                )
+    if telemetry_path is not None:
+        latencies = _recorded_latencies(Path(telemetry_path))
+        cursors: dict[str, int] = {}
+        for entry in entries:
+            family = _family(entry.model)
+            recorded = latencies.get(family) or next(
+                (v for k, v in latencies.items() if family.startswith(k)), None
+            )
+            if not recorded:
+                continue
+            idx = cursors.get(family, 0)
+            cursors[family] = idx + 1
+            entry.latency_sec, entry.ttft_sec = recorded[idx % len(recorded)]
+    return entries
+
+
+def write_cassette(entries: Iterable[CassetteEntry], path: Path | str) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+class CassetteRecorder:
+    """Appends live calls to a cassette so they can be replayed exactly."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        kind: str,
+        model: str,
+        messages: Sequence[dict[str, Any]],
+        trace: ApiTrace,
+        *,
+        latency_sec: float,
+        ttft_sec: float | None = None,
+        tool_calls: list[dict[str, Any]] | None = None,
+    ) -> None:
+        entry = CassetteEntry(
+            model=model,
+            response_content=trace.response_content,
+            reasoning_content=trace.reasoning_content,
+            kind=kind,
+            key=replay_key(model, messages),
+            tool_calls=tool_calls,
+            prompt_tokens=trace.prompt_tokens,
+            completion_tokens=trace.completion_tokens,
+            reasoning_tokens=trace.reasoning_tokens,
+            latency_sec=round(latency_sec, 4),
+            ttft_sec=round(ttft_sec, 4) if ttft_sec is not None else None,
+        )
+        line = json.dumps(asdict(entry), ensure_ascii=False) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _usage(entry: CassetteEntry, messages: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    prompt = entry.prompt_tokens or estimate_prompt_tokens(list(messages))
+    completion = entry.completion_tokens or max(1, len(entry.response_content) // 4)
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+        "completion_tokens_details": {"reasoning_tokens": entry.reasoning_tokens},
+    }
+
+
+def _completion(
+    entry: CassetteEntry,
+    messages: Sequence[dict[str, Any]],
+    *,
+    response_format: Any = None,
+    with_tools: bool = False,
+) -> ChatCompletion:
+    message: dict[str, Any] = {
+        "role": "assistant",
+        "content": entry.response_content,
+        "reasoning": entry.reasoning_content or None,
+    }
+    if with_tools and entry.tool_calls:
+        message["tool_calls"] = entry.tool_calls
+    response = ChatCompletion.model_validate(
+        {
+            "id": f"replay-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": entry.model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+            "usage": _usage(entry, messages),
+        }
+    )
+    if response_format is not None:
+        parsed = coerce_json_response(entry.response_content, response_format)
+        setattr(response.choices[0].message, "parsed", parsed)
+    return response
+
+
+def _chunk(response_id: str, model: str, **fields_: Any) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            **fields_,
+        }
+    )
+
+
+def _chunks(entry: CassetteEntry, messages: Sequence[dict[str, Any]]) -> list[ChatCompletionChunk]:
+    response_id = f"replay-{uuid.uuid4().hex[:12]}"
+    chunks = []
+    if entry.reasoning_content:
+        delta = {"role": "assistant", "reasoning": entry.reasoning_content}
+        chunks.append(_chunk(response_id, entry.model, choices=[{"index": 0, "delta": delta}]))
+    for piece in re.findall(r"\S+\s*|\s+", entry.response_content):
+        chunks.append(
+            _chunk(response_id, entry.model, choices=[{"index": 0, "delta": {"content": piece}}])
+        )
+    chunks.append(_chunk(response_id, entry.model, choices=[], usage=_usage(entry, messages)))
+    return chunks
+
+
+def _embedding(text: str) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(_EMBED_DIM)
+    return [float(x) for x in vector / np.linalg.norm(vector)]
+
+
+def _embeddings(model: str, texts: str | Sequence[str]) -> CreateEmbeddingResponse:
+    inputs = [texts] if isinstance(texts, str) else list(texts)
+    tokens = sum(max(1, len(text) // 4) for text in inputs)
+    return CreateEmbeddingResponse.model_validate(
+        {
+            "object": "list",
+            "model": model,
+            "data": [
+                {"object": "embedding", "index": i, "embedding": _embedding(text)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+    )
+
+
+class _ReplayStream:
+    def __init__(self, chunks: list[ChatCompletionChunk], delays: list[float]) -> None:
+        self._chunks = chunks
+        self._delays = delays
+        self._next = 0
+
+    def __aiter__(self) -> AsyncIterator[ChatCompletionChunk]:
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if self._next >= len(self._chunks):
+            raise StopAsyncIteration
+        idx = self._next
+        self._next += 1
+        if self._delays[idx] > 0:
+            await asyncio.sleep(self._delays[idx])
+        return self._chunks[idx]
+
+    async def close(self) -> None:
+        self._next = len(self._chunks)
+
+
+class ReplayBackend:
+    """Builds OpenAI-shaped responses from a cassette, with optional delays."""
+
+    def __init__(self, cassette: Cassette, *, latency_scale: float = 0.0) -> None:
+        self.cassette = cassette
+        self.latency_scale = max(0.0, latency_scale)
+
+    def delay(self, entry: CassetteEntry) -> float:
+        return (entry.latency_sec or 0.0) * self.latency_scale
+
+    def stream_delays(self, entry: CassetteEntry, count: int) -> list[float]:
+        total = self.delay(entry)
+        if total <= 0 or count == 0:
+            return [0.0] * count
+        ttft = min(total, (entry.ttft_sec or 0.0) * self.latency_scale)
+        rest = (total - ttft) / max(1, count - 1)
+        return [ttft] + [rest] * (count - 1)
+
+    def complete(
+        self,
+        model: str,
+        messages: Sequence[dict[str, Any]],
+        *,
+        response_format: Any = None,
+        with_tools: bool = False,
+    ) -> tuple[ChatCompletion, float]:
+        kind = "parse" if response_format is not None else "chat"
+        entry = self.cassette.match(model, messages, kind)
+        response = _completion(
+            entry, messages, response_format=response_format, with_tools=with_tools
+        )
+        return response, self.delay(entry)
+
+    def stream(self, model: str, messages: Sequence[dict[str, Any]]) -> _ReplayStream:
+        entry = self.cassette.match(model, messages, "stream")
+        chunks = _chunks(entry, messages)
+        return _ReplayStream(chunks, self.stream_delays(entry, len(chunks)))
+
+
+class _AsyncCompletions:
+    def __init__(self, backend: ReplayBackend) -> None:
+        self._backend = backend
+
+    async def create(
+        self,
+        *,
+        messages: Sequence[dict[str, Any]],
+        model: str,
+        stream: bool = False,
+        tools: Any = None,
+        **_: Any,
+    ) -> Any:
+        if stream:
+            return self._backend.stream(model, messages)
+        response, delay = self._backend.complete(model, messages, with_tools=bool(tools))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+    async def parse(
+        self, *, messages: Sequence[dict[str, Any]], model: str, response_format: Any, **_: Any
+    ) -> ChatCompletion:
+        response, delay = self._backend.complete(model, messages, response_format=response_format)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+
+class _SyncCompletions:
+    def __init__(self, backend: ReplayBackend) -> None:
+        self._backend = backend
+
+    def create(
+        self, *, messages: Sequence[dict[str, Any]], model: str, tools: Any = None, **_: Any
+    ) -> ChatCompletion:
+        response, delay = self._backend.complete(model, messages, with_tools=bool(tools))
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    def parse(
+        self, *, messages: Sequence[dict[str, Any]], model: str, response_format: Any, **_: Any
+    ) -> ChatCompletion:
+        response, delay = self._backend.complete(model, messages, response_format=response_format)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+
+class _AsyncEmbeddings:
+    async def create(self, *, model: str, input: str | Sequence[str], **_: Any) -> Any:
+        return _embeddings(model, input)
+
+
+class _SyncEmbeddings:
+    def create(self, *, model: str, input: str | Sequence[str], **_: Any) -> Any:
+        return _embeddings(model, input)
+
+
+class _Namespace:
+    def __init__(self, **attrs: Any) -> None:
+        self.__dict__.update(attrs)
+
+
+class AsyncReplayClient:
+    """Stands in for ``AsyncOpenAI`` on ``backend="replay"``."""
+
+    def __init__(self, backend: ReplayBackend) -> None:
+        completions = _AsyncCompletions(backend)
+        self.chat = _Namespace(completions=completions)
+        self.beta = _Namespace(chat=_Namespace(completions=completions))
+        self.embeddings = _AsyncEmbeddings()
+
+
+class ReplayClient:
+    """Stands in for ``OpenAI`` on ``backend="replay"``."""
+
+    def __init__(self, backend: ReplayBackend) -> None:
+        completions = _SyncCompletions(backend)
+        self.chat = _Namespace(completions=completions)
+        self.beta = _Namespace(chat=_Namespace(completions=completions))
+        self.embeddings = _SyncEmbeddings()
+
+
+_lock = threading.Lock()
+_cassettes: dict[str, Cassette] = {}
+_recorder: CassetteRecorder | None = None
+_recorder_loaded = False
+
+
+def cassette_for(path: Path | str | None = None) -> Cassette:
+    """Shared cassette for ``path`` (default ``CONFIDENCE_TOM_REPLAY_CASSETTE``)."""
+    resolved = str(path or os.getenv("CONFIDENCE_TOM_REPLAY_CASSETTE", "")).strip()
+    if not resolved:
+        raise ValueError("backend='replay' needs a cassette path or CONFIDENCE_TOM_REPLAY_CASSETTE")
+    with _lock:
+        cassette = _cassettes.get(resolved)
+        if cassette is None:
+            cassette = _cassettes[resolved] = Cassette.load(resolved)
+            atexit.register(_report_fallbacks, resolved, cassette)
+        return cassette
+
+
+def _report_fallbacks(path: str, cassette: Cassette) -> None:
+    stats = cassette.stats()
+    if stats["fallback"] or stats["misses"]:
+        logger.warning(
+            "Replay from %s: %d exact, %d by model fallback (not the recorded answer "
+            "to that request), %d misses",
+            path,
+            stats["exact"],
+            stats["fallback"],
+            stats["misses"],
+        )
+
+
+def replay_clients(
+    path: Path | str | None = None, *, latency_scale: float | None = None
+) -> tuple[ReplayClient, AsyncReplayClient]:
+    if latency_scale is None:
+        latency_scale = float(os.getenv("CONFIDENCE_TOM_REPLAY_LATENCY_SCALE", "0") or 0)
+    backend = ReplayBackend(cassette_for(path), latency_scale=latency_scale)
+    return ReplayClient(backend), AsyncReplayClient(backend)
+
+
+def configure_replay_recording(path: Path | str | None) -> CassetteRecorder | None:
+    """Append every live call to the cassette at ``path`` (``None`` stops recording)."""
+    global _recorder, _recorder_loaded
+    with _lock:
+        _recorder = CassetteRecorder(path) if path else None
+        _recorder_loaded = True
+        return _recorder
+
+
+def replay_recorder() -> CassetteRecorder | None:
+    global _recorder, _recorder_loaded
+    with _lock:
+        if not _recorder_loaded:
+            env_path = os.getenv("CONFIDENCE_TOM_REPLAY_RECORD", "").strip()
+            _recorder = CassetteRecorder(env_path) if env_path else None
+            _recorder_loaded = True
+        return _recorder
@@ -0,0 +1,143 @@
+"""Content-addressed on-disk cache for LLM responses.
+
+Entries are keyed by a sha256 over the resolved request (completion kwargs plus
+normalized messages) and stored as one JSON file per key under
+``<cache_root>/llm/<namespace>/``. Reads bump the file mtime so that eviction can
+drop the least recently used entries once a namespace grows past ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, cast
+
+from confidence_tom.infra.paths import cache_root
+
+_DEFAULT_MAX_BYTES = 2 * 1024**3
+_EVICT_TARGET_RATIO = 0.9
+
+
+def request_key(kind: str, payload: dict[str, Any]) -> str:
+    """Stable sha256 over a call kind and its JSON-serializable request payload."""
+    blob = json.dumps(
+        {"kind": kind, "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU store for LLM responses, shared across LLMClient instances.
+
+    Only deterministic requests (temperature 0) are cached unless
+    ``cache_sampled`` is set, so repeated sampling at temperature > 0 still hits
+    the provider.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "default",
+        *,
+        root: Path | None = None,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        cache_sampled: bool = False,
+    ) -> None:
+        self.namespace = namespace
+        self.root = (root or cache_root() / "llm") / namespace
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.cache_sampled = cache_sampled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(path.stat().st_size for path in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*/*.json"))
+
+    def _path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def accepts(self, temperature: float | None) -> bool:
+        return self.cache_sampled or not temperature
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path_for(key)
+        try:
+            value = cast(dict[str, Any], json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        previous = path.stat().st_size if path.exists() else 0
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        with self._lock:
+            self._total_bytes += len(data) - previous
+            over_budget = self.max_bytes and self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the namespace is under budget."""
+        with self._lock:
+            stats: list[tuple[float, int, Path]] = []
+            for path in self._entries():
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                stats.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in stats)
+            target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+            removed = 0
+            for _, size, path in sorted(stats, key=lambda item: item[0]):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._total_bytes = total
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,240 @@
+"""Structured per-call telemetry for ``LLMClient``.
+
+Every provider attempt emits one ``CallEvent`` (model, backend, call kind, queue
+wait, time to first token, latency, token counts, outcome). Events are folded into
+in-memory histograms per ``(backend, model, kind)`` and, once a path is configured
+with ``configure_telemetry`` or ``CONFIDENCE_TOM_TELEMETRY_PATH``, appended to a
+size-rotated JSONL file. Runners print ``telemetry_summary()`` at exit to tell
+provider latency, retry storms and local queueing apart.
+
+Retries are visible as extra attempts: each rate-limited attempt is recorded with
+``outcome="rate_limited"`` and the retry that follows is a new event whose
+``attempt`` is the tenacity attempt number (1 for a first try). Sync
+``generate_*`` calls are recorded the same way.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Upper bucket edges in seconds; the last bucket is open-ended.
+_BUCKETS_SEC = (
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.0,
+    4.0,
+    8.0,
+    16.0,
+    32.0,
+    64.0,
+    128.0,
+    256.0,
+)
+_DEFAULT_MAX_BYTES = 64 * 1024**2
+_DEFAULT_BACKUPS = 5
+
+
+@dataclass
+class CallEvent:
+    model: str
+    backend: str
+    kind: str
+    outcome: str
+    latency_sec: float
+    queue_wait_sec: float = 0.0
+    ttft_sec: float | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    attempt: int = 1
+    error: str = ""
+    ts: float = field(default_factory=time.time)
+
+
+class Histogram:
+    """Fixed log-spaced latency buckets with approximate quantiles."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS_SEC) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS_SEC, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper edge of the bucket containing the q-quantile."""
+        if not self.total:
+            return None
+        target = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return _BUCKETS_SEC[idx] if idx < len(_BUCKETS_SEC) else float("inf")
+        return float("inf")
+
+    def summary(self) -> dict[str, float | None]:
+        return {
+            "mean": round(self.sum / self.total, 3) if self.total else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _Series:
+    def __init__(self) -> None:
+        self.outcomes: dict[str, int] = {}
+        self.latency = Histogram()
+        self.queue_wait = Histogram()
+        self.ttft = Histogram()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reasoning_tokens = 0
+        self.retries = 0
+
+    def add(self, event: CallEvent) -> None:
+        self.outcomes[event.outcome] = self.outcomes.get(event.outcome, 0) + 1
+        if event.attempt > 1:
+            self.retries += 1
+        self.latency.add(event.latency_sec)
+        self.queue_wait.add(event.queue_wait_sec)
+        if event.ttft_sec is not None:
+            self.ttft.add(event.ttft_sec)
+        self.prompt_tokens += event.prompt_tokens
+        self.completion_tokens += event.completion_tokens
+        self.reasoning_tokens += event.reasoning_tokens
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "calls": self.latency.total,
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "retries": self.retries,
+            "latency_sec": self.latency.summary(),
+            "queue_wait_sec": self.queue_wait.summary(),
+            "ttft_sec": self.ttft.summary() if self.ttft.total else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+        }
+
+
+class TelemetrySink:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str, str], _Series] = {}
+        self._file_logger: logging.Logger | None = None
+        self.path: Path | None = None
+
+    def configure(
+        self,
+        path: Path | str | None,
+        *,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        backups: int = _DEFAULT_BACKUPS,
+    ) -> None:
+        with self._lock:
+            if self._file_logger is not None:
+                for handler in list(self._file_logger.handlers):
+                    self._file_logger.removeHandler(handler)
+                    handler.close()
+                self._file_logger = None
+            self.path = Path(path) if path else None
+            if self.path is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger = logging.getLogger(f"{__name__}.sink.{id(self)}")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            file_logger.addHandler(handler)
+            self._file_logger = file_logger
+
+    def emit(self, event: CallEvent) -> None:
+        with self._lock:
+            key = (event.backend, event.model, event.kind)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.add(event)
+            file_logger = self._file_logger
+        if file_logger is not None:
+            file_logger.info(json.dumps(asdict(event), ensure_ascii=False))
+
+    def summary(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {"backend": backend, "model": model, "kind": kind, **series.summary()}
+                for (backend, model, kind), series in sorted(self._series.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+_sink: TelemetrySink | None = None
+_sink_lock = threading.Lock()
+
+
+def telemetry() -> TelemetrySink:
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = TelemetrySink()
+            if env_path := os.getenv("CONFIDENCE_TOM_TELEMETRY_PATH", "").strip():
+                _sink.configure(env_path)
+        return _sink
+
+
+def configure_telemetry(path: Path | str | None, **kwargs: Any) -> TelemetrySink:
+    """Write events to a rotating JSONL file at ``path`` (``None`` keeps memory only)."""
+    sink = telemetry()
+    sink.configure(path, **kwargs)
+    return sink
+
+
+def record_call(event: CallEvent) -> None:
+    telemetry().emit(event)
+
+
+def telemetry_summary() -> list[dict[str, Any]]:
+    return telemetry().summary()
+
+
+def format_telemetry_summary() -> str:
+    """One line per (backend, model, kind) for printing at runner exit."""
+    lines = []
+    for row in telemetry_summary():
+        latency = row["latency_sec"]
+        queue = row["queue_wait_sec"]
+        ttft = row["ttft_sec"]
+        outcomes = ", ".join(f"{k}={v}" for k, v in row["outcomes"].items())
+        lines.append(
+            f"{row['backend']}/{row['model']} [{row['kind']}] calls={row['calls']} "
+            f"({outcomes}) retries={row['retries']} "
+            f"latency p50={latency['p50']} p95={latency['p95']} queue p95={queue['p95']} "
+            f"ttft p50={ttft['p50'] if ttft else None} "
+            f"tokens in={row['prompt_tokens']} out={row['completion_tokens']}"
+        )
+    return "\n".join(lines) if lines else "no LLM calls recorded"
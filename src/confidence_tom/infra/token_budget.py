@@ -0,0 +1,169 @@
+"""Pre-flight prompt sizing against the model's context window.
+
+With a ``TokenBudget``, ``LLMClient`` counts prompt tokens before sending (with
+the checkpoint's tokenizer for ``backend="local"``, otherwise with a chars/token
+ratio calibrated from the ``usage.prompt_tokens`` of earlier responses) and
+fits ``max_tokens``/``num_predict`` to what is left of the window. A prompt that
+leaves fewer than ``min_completion_tokens`` either raises ``PromptTooLongError``
+up front (``overflow="refuse"``) or has the middle of its longest message cut
+(``overflow="trim"``), instead of failing or timing out at the provider. The
+``LLMClient`` generation methods, sync and async, let the error propagate
+rather than returning an empty answer.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from confidence_tom.infra.client_utils import local_prompt_text
+
+_DEFAULT_CHARS_PER_TOKEN = 4.0
+_CALIBRATION_WEIGHT = 0.2
+# Role markers and template tokens around each message.
+_PER_MESSAGE_TOKENS = 4
+_TRIM_MARKER = "\n[... {n} characters trimmed ...]\n"
+
+
+class PromptTooLongError(ValueError):
+    def __init__(self, model: str, prompt_tokens: int, window: int) -> None:
+        super().__init__(
+            f"{model}: prompt of ~{prompt_tokens} tokens leaves no room "
+            f"in its {window}-token context window"
+        )
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.window = window
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    overflow: str = "refuse"  # "refuse" | "trim"
+    min_completion_tokens: int = 256
+    margin_tokens: int = 64
+    context_window: int | None = None
+
+
+@dataclass
+class Preflight:
+    messages: list[dict[str, Any]]
+    prompt_tokens: int
+    max_tokens: int
+    window: int
+    trimmed_chars: int = 0
+
+
+def prompt_chars(messages: list[dict[str, Any]]) -> int:
+    chars = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            chars += sum(
+                len(str(part.get("text", ""))) for part in content if isinstance(part, dict)
+            )
+        else:
+            chars += len(str(content))
+    return chars
+
+
+_lock = threading.Lock()
+_chars_per_token: dict[str, float] = {}
+
+
+def calibrate(model: str, messages: list[dict[str, Any]], prompt_tokens: int) -> None:
+    """Fold one observed ``usage.prompt_tokens`` into the model's chars/token ratio."""
+    content_tokens = prompt_tokens - _PER_MESSAGE_TOKENS * len(messages)
+    chars = prompt_chars(messages)
+    if content_tokens <= 0 or chars <= 0:
+        return
+    ratio = chars / content_tokens
+    with _lock:
+        previous = _chars_per_token.get(model)
+        _chars_per_token[model] = (
+            ratio if previous is None else previous + _CALIBRATION_WEIGHT * (ratio - previous)
+        )
+
+
+def chars_per_token(model: str) -> float:
+    with _lock:
+        return _chars_per_token.get(model, _DEFAULT_CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=16)
+def local_tokenizer(model_name: str, trust_remote_code: bool = True) -> Any:
+    """Tokenizer from the local HF cache only; ``None`` when it is not on disk."""
+    try:
+        from transformers import AutoTokenizer
+
+        return AutoTokenizer.from_pretrained(
+            model_name, trust_remote_code=trust_remote_code, local_files_only=True
+        )
+    except Exception:
+        return None
+
+
+def count_prompt_tokens(
+    messages: list[dict[str, Any]], model: str, tokenizer: Any | None = None
+) -> int:
+    if tokenizer is not None:
+        text = local_prompt_text(messages, tokenizer)
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    content = math.ceil(prompt_chars(messages) / chars_per_token(model))
+    return content + _PER_MESSAGE_TOKENS * len(messages)
+
+
+def trim_messages(messages: list[dict[str, Any]], chars: int) -> tuple[list[dict[str, Any]], int]:
+    """Cut ``chars`` from the middle of the longest non-system text message."""
+    candidates = [
+        idx
+        for idx, message in enumerate(messages)
+        if message.get("role") != "system" and isinstance(message.get("content"), str)
+    ]
+    if not candidates or chars <= 0:
+        return messages, 0
+    idx = max(candidates, key=lambda i: len(messages[i]["content"]))
+    content = str(messages[idx]["content"])
+    marker = _TRIM_MARKER.format(n=chars)
+    keep = len(content) - chars - len(marker)
+    if keep <= 0:
+        return messages, 0
+    head = keep // 2
+    trimmed = content[:head] + marker + content[len(content) - (keep - head) :]
+    return [*messages[:idx], {**messages[idx], "content": trimmed}, *messages[idx + 1 :]], chars
+
+
+def preflight(
+    messages: list[dict[str, Any]],
+    *,
+    model: str,
+    max_tokens: int,
+    window: int,
+    budget: TokenBudget,
+    tokenizer: Any | None = None,
+) -> Preflight:
+    prompt_tokens = count_prompt_tokens(messages, model, tokenizer)
+    room = window - prompt_tokens - budget.margin_tokens
+    trimmed = 0
+    if room < budget.min_completion_tokens:
+        if budget.overflow != "trim":
+            raise PromptTooLongError(model, prompt_tokens, window)
+        ratio = prompt_chars(messages) / max(1, prompt_tokens)
+        excess = budget.min_completion_tokens - room
+        # Overshoot a little: the ratio is an average and the marker costs tokens.
+        messages, trimmed = trim_messages(messages, math.ceil(excess * ratio * 1.1) + 32)
+        if not trimmed:
+            raise PromptTooLongError(model, prompt_tokens, window)
+        prompt_tokens = count_prompt_tokens(messages, model, tokenizer)
+        room = window - prompt_tokens - budget.margin_tokens
+        if room < budget.min_completion_tokens:
+            raise PromptTooLongError(model, prompt_tokens, window)
+    return Preflight(
+        messages=messages,
+        prompt_tokens=prompt_tokens,
+        max_tokens=min(max_tokens, room),
+        window=window,
+        trimmed_chars=trimmed,
+    )
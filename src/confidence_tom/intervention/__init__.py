@@ -18,7 +18,13 @@ from .models import (
     StepwiseWorkerOutput,
 )
 from .router import BaseRouter, ThresholdRouter
-from .voi import ModelPricing, combine_costs, estimate_voi, trace_to_cost
+from .voi import (
+    ModelPricing,
+    combine_costs,
+    estimate_voi,
+    prompt_cache_summary,
+    trace_to_cost,
+)
 
 __all__ = [
     "BaseRouter",
@@ -42,6 +48,7 @@ __all__ = [
     "build_state",
     "combine_costs",
     "estimate_voi",
+    "prompt_cache_summary",
     "extract_features",
     "parse_with_llm_fallback",
     "trace_to_cost",
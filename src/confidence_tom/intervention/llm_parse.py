@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Optional, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
-from confidence_tom.infra.client import LLMClient
 from confidence_tom.intervention.models import (
     ExtractedFinalAnswerOutput,
     NextStepOutput,
@@ -13,6 +12,9 @@ from confidence_tom.intervention.models import (
     StepwiseWorkerOutput,
 )
 
+if TYPE_CHECKING:
+    from confidence_tom.infra.client import LLMClient
+
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -97,6 +97,7 @@ class InterventionDecision(BaseModel):
 
 class CostBreakdown(BaseModel):
     input_tokens: int = 0
+    cached_input_tokens: int = 0
     output_tokens: int = 0
     reasoning_tokens: int = 0
     total_tokens: int = 0
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Optional
 
@@ -12,6 +13,7 @@ class ModelPricing:
     input_per_1k: float = 0.0
     output_per_1k: float = 0.0
     reasoning_per_1k: float = 0.0
+    cached_input_per_1k: Optional[float] = None
 
 
 def trace_to_cost(
@@ -21,13 +23,21 @@ def trace_to_cost(
         return CostBreakdown()
     estimated = None
     if pricing is not None:
+        cached = min(trace.cache_read_tokens, trace.prompt_tokens)
+        cached_rate = (
+            pricing.cached_input_per_1k
+            if pricing.cached_input_per_1k is not None
+            else pricing.input_per_1k
+        )
         estimated = (
-            trace.prompt_tokens / 1000.0 * pricing.input_per_1k
+            (trace.prompt_tokens - cached) / 1000.0 * pricing.input_per_1k
+            + cached / 1000.0 * cached_rate
             + trace.completion_tokens / 1000.0 * pricing.output_per_1k
             + trace.reasoning_tokens / 1000.0 * pricing.reasoning_per_1k
         )
     return CostBreakdown(
         input_tokens=trace.prompt_tokens,
+        cached_input_tokens=trace.cache_read_tokens,
         output_tokens=trace.completion_tokens,
         reasoning_tokens=trace.reasoning_tokens,
         total_tokens=trace.total_tokens,
@@ -42,6 +52,7 @@ def combine_costs(*costs: CostBreakdown) -> CostBreakdown:
         estimated = sum(estimated_values)
     return CostBreakdown(
         input_tokens=sum(c.input_tokens for c in costs),
+        cached_input_tokens=sum(c.cached_input_tokens for c in costs),
         output_tokens=sum(c.output_tokens for c in costs),
         reasoning_tokens=sum(c.reasoning_tokens for c in costs),
         total_tokens=sum(c.total_tokens for c in costs),
@@ -49,6 +60,20 @@ def combine_costs(*costs: CostBreakdown) -> CostBreakdown:
     )
 
 
+def prompt_cache_summary(costs: Iterable[CostBreakdown]) -> dict[str, float | int]:
+    """Share of input tokens served from the provider prompt cache."""
+    totals = combine_costs(*costs)
+    return {
+        "input_tokens": totals.input_tokens,
+        "cached_input_tokens": totals.cached_input_tokens,
+        "cache_hit_ratio": (
+            round(totals.cached_input_tokens / totals.input_tokens, 4)
+            if totals.input_tokens
+            else 0.0
+        ),
+    }
+
+
 def estimate_voi(
     p_takeover: float,
     p_continue: float,
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from confidence_tom.data import artifact_cache, scale_dataset, snapshot
+
+URL = "https://example.test/bench/data.jsonl.zip"
+
+
+class _Response:
+    def __init__(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None):
+        self.status_code = status
+        self.body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def iter_content(self, chunk_size: int) -> Any:
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+    def __enter__(self) -> _Response:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[dict[str, str]]:
+    monkeypatch.setattr(artifact_cache, "artifact_dir", lambda: tmp_path)
+    for name in ("CONFIDENCE_TOM_OFFLINE", "HF_DATASETS_OFFLINE"):
+        monkeypatch.delenv(name, raising=False)
+    requests_seen: list[dict[str, str]] = []
+    rows = [
+        {"problem": f"P{i}", "choices": dict(zip("ABCD", "wxyz")), "answer_choice": "C"}
+        for i in range(5)
+    ]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("HARP_mcq.jsonl", "\n".join(json.dumps(row) for row in rows))
+    body = buffer.getvalue()
+
+    def fake_get(url: str, headers: dict[str, str], **_: Any) -> _Response:
+        requests_seen.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return _Response(304)
+        return _Response(200, body, {"ETag": '"v1"'})
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    return requests_seen
+
+
+def test_cached_artifact_is_reused_then_revalidated_with_etag(
+    server: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = artifact_cache.fetch_artifact(URL)
+    assert artifact_cache.fetch_artifact(URL) == path
+    assert server == [{}]
+
+    monkeypatch.setenv("CONFIDENCE_TOM_ARTIFACT_MAX_AGE_SEC", "0")
+    assert artifact_cache.fetch_artifact(URL) == path
+    assert server[-1] == {"If-None-Match": '"v1"'}
+
+    monkeypatch.setenv("CONFIDENCE_TOM_OFFLINE", "1")
+    assert artifact_cache.fetch_artifact(URL) == path
+    with pytest.raises(FileNotFoundError):
+        artifact_cache.fetch_artifact(URL + "?other")
+    assert len(server) == 2
+
+
+def test_checksum_pinning(server: list[dict[str, str]]) -> None:
+    path = artifact_cache.fetch_artifact(URL)
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    assert artifact_cache.fetch_artifact(URL, sha256=digest.upper()) == path
+    with pytest.raises(artifact_cache.ArtifactChecksumError):
+        artifact_cache.fetch_artifact(URL, sha256="0" * 64)
+
+
+def test_harp_reads_zip_member_from_cache(
+    server: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", "0")
+    questions = scale_dataset.load_harp_mcq(num_samples=3, url=URL)
+    assert len(questions) == 3 and {q.correct_answer for q in questions} == {"C"}
+    assert len(server) == 1
+
+
+def test_snapshot_revalidates_artifact_and_tracks_new_content(
+    server: list[dict[str, str]], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(snapshot, "snapshot_dir", lambda: tmp_path / "snapshots")
+    monkeypatch.setenv("CONFIDENCE_TOM_ARTIFACT_MAX_AGE_SEC", "0")
+    first = scale_dataset.load_harp_mcq(num_samples=3, url=URL)
+    assert scale_dataset.load_harp_mcq(num_samples=3, url=URL) == first
+    assert server[-1] == {"If-None-Match": '"v1"'}
+
+    # The upstream file changes: the snapshot must not keep serving the old rows.
+    rows = [
+        {"problem": f"New{i}", "choices": dict(zip("ABCD", "abcd")), "answer_choice": "B"}
+        for i in range(4)
+    ]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("HARP_mcq.jsonl", "\n".join(json.dumps(row) for row in rows))
+    monkeypatch.setattr(
+        requests, "get", lambda *a, **k: _Response(200, buffer.getvalue(), {"ETag": '"v2"'})
+    )
+    updated = scale_dataset.load_harp_mcq(num_samples=3, url=URL)
+    assert {q.correct_answer for q in updated} == {"B"}
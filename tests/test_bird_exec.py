@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from confidence_tom.benchmarks import bird_exec
+from confidence_tom.benchmarks.bird_exec import ExecBudget, GoldQueryError, QueryBudgetExceeded
+
+GOLD = "SELECT name FROM people WHERE age > 30"
+
+
+@pytest.fixture
+def db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    monkeypatch.setenv("CONFIDENCE_TOM_OUTPUT_ROOT", str(tmp_path / "out"))
+    monkeypatch.setattr(bird_exec, "gold_cache_dir", lambda: tmp_path / "out/cache/bird_gold")
+    monkeypatch.setattr(bird_exec, "_gold", {})
+    path = tmp_path / "people.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE people (name TEXT, age INTEGER)")
+    conn.executemany(
+        "INSERT INTO people VALUES (?, ?)", [(f"p{i}", 20 + i % 30) for i in range(300)]
+    )
+    conn.commit()
+    conn.close()
+    yield str(path)
+    bird_exec.close_connections()
+
+
+def test_execution_match_is_read_only_and_pools_connections(db: str) -> None:
+    assert bird_exec.execution_match("SELECT name FROM people WHERE age >= 31", GOLD, db)
+    assert not bird_exec.execution_match("SELECT name FROM people", GOLD, db)
+    assert not bird_exec.execution_match("DELETE FROM people", GOLD, db)
+    assert len(bird_exec.run_query("SELECT * FROM people", db)) == 300
+    assert sum(len(conns) for conns in bird_exec._idle.values()) == 1
+
+
+def test_runaway_join_is_interrupted_and_connection_reused(db: str) -> None:
+    cartesian = "SELECT count(*) FROM people a, people b, people c, people d"
+    with pytest.raises(QueryBudgetExceeded, match="VM steps"):
+        bird_exec.run_query(cartesian, db, ExecBudget(timeout_sec=0, max_vm_steps=100_000))
+    with pytest.raises(QueryBudgetExceeded, match="0.2s"):
+        bird_exec.run_query(cartesian, db, ExecBudget(timeout_sec=0.2, max_vm_steps=0))
+    assert not bird_exec.execution_match(cartesian, GOLD, db, budget=ExecBudget(0.2, 0))
+    assert bird_exec.run_query("SELECT count(*) FROM people", db) == {(300,)}
+
+
+def test_gold_results_are_cached_on_disk(db: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    first = bird_exec.gold_rows(GOLD, db, "people")
+    assert len(list(bird_exec.gold_cache_dir().glob("people-*.pkl"))) == 1
+
+    def no_run(*_: object, **__: object) -> None:
+        raise AssertionError("gold query should come from the cache")
+
+    monkeypatch.setattr(bird_exec, "_gold", {})
+    monkeypatch.setattr(bird_exec, "run_query", no_run)
+    assert bird_exec.gold_rows(GOLD, db, "people") == first
+
+
+def test_evaluate_many_in_process_pool_keeps_order(db: str) -> None:
+    items = [
+        ("SELECT name FROM people WHERE age > 30", GOLD, db, "people"),
+        ("SELECT name FROM people", GOLD, db, "people"),
+        ("SELECT count(*) FROM people a, people b, people c, people d", GOLD, db, "people"),
+        ("SELECT name FROM people WHERE age BETWEEN 31 AND 99", GOLD, db, "people"),
+    ]
+    budget = ExecBudget(timeout_sec=1, max_vm_steps=0)
+    assert bird_exec.evaluate_many(items, max_workers=2, budget=budget) == [
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_gold_runs_under_its_own_budget_and_failures_are_cached(
+    db: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CONFIDENCE_TOM_BIRD_SQL_MAX_VM_STEPS", "100000")
+    slow_gold = "SELECT count(*) FROM people a, people b"
+    with pytest.raises(QueryBudgetExceeded):
+        bird_exec.run_query(slow_gold, db)
+    assert bird_exec.gold_rows(slow_gold, db) == {(90_000,)}
+    assert not bird_exec.execution_match(slow_gold, slow_gold, db)
+
+    broken = "SELECT missing FROM people"
+    with pytest.raises(GoldQueryError, match="no such column"):
+        bird_exec.gold_rows(broken, db, "people")
+    calls = 0
+    real_run = bird_exec.run_query
+
+    def counting_run(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        return real_run(*args, **kwargs)
+
+    monkeypatch.setattr(bird_exec, "_gold", {})
+    monkeypatch.setattr(bird_exec, "run_query", counting_run)
+    items = [("SELECT name FROM people", broken, db, "people")] * 3
+    assert bird_exec.evaluate_many(items, max_workers=2) == [False, False, False]
+    assert calls == 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from confidence_tom.benchmarks import bird_schema
+
+
+@pytest.fixture
+def db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(bird_schema, "schema_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(bird_schema, "_schemas", {})
+    path = tmp_path / "school" / "school.sqlite"
+    path.parent.mkdir()
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE schools (CDSCode TEXT PRIMARY KEY, County TEXT, Phone TEXT);
+        CREATE TABLE satscores (
+            cds TEXT PRIMARY KEY REFERENCES schools(CDSCode),
+            AvgScrMath INTEGER,
+            NumTstTakr INTEGER
+        );
+        CREATE TABLE "frpm data" (CDSCode TEXT, "Free Meal Count" REAL, Notes TEXT);
+        INSERT INTO schools VALUES ('01', 'Alameda', '555-0100'), ('02', 'Fresno', NULL);
+        INSERT INTO satscores VALUES ('01', 480, 12);
+        """
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_full_schema_matches_sqlite_master_and_is_cached_on_disk(
+    db: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = sqlite3.connect(db)
+    expected = "\n\n".join(
+        row[0]
+        for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND sql IS NOT NULL"
+        )
+    )
+    conn.close()
+
+    assert bird_schema.prompt_schema(db) == expected
+    assert len(list((bird_schema.schema_dir()).glob("school-*.json"))) == 1
+
+    def no_read(*_: object, **__: object) -> None:
+        raise AssertionError("schema should come from the disk cache")
+
+    monkeypatch.setattr(bird_schema, "_schemas", {})
+    monkeypatch.setattr(bird_schema, "read_schema", no_read)
+    assert bird_schema.prompt_schema(db) == expected
+
+
+def test_linking_keeps_matched_columns_keys_and_joins(db: Path) -> None:
+    pruned = bird_schema.prompt_schema(
+        db,
+        "What is the average math score of schools in Alameda?",
+        "average math score refers to AvgScrMath",
+        linking=True,
+    )
+
+    assert "County TEXT" in pruned  # matched through the value 'Alameda'
+    assert "AvgScrMath INTEGER" in pruned
+    assert "FOREIGN KEY (cds) REFERENCES schools(CDSCode)" in pruned
+    assert "Phone" not in pruned and "NumTstTakr" not in pruned
+    assert "frpm" not in pruned
+
+
+def test_linking_falls_back_to_full_schema_without_matches(db: Path) -> None:
+    full = bird_schema.prompt_schema(db)
+    assert bird_schema.prompt_schema(db, "Anything?", linking=True) == full
+    assert '"Free Meal Count" REAL' in bird_schema.prompt_schema(
+        db, "free meal counts", linking=True
+    )
+
+
+def test_foreign_keys_resolve_case_and_implicit_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(bird_schema, "schema_dir", lambda: tmp_path / "cache")
+    monkeypatch.setattr(bird_schema, "_schemas", {})
+    path = tmp_path / "league.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE Teams (team_id INTEGER PRIMARY KEY, city TEXT);
+        CREATE TABLE seasons (year INTEGER, league TEXT, PRIMARY KEY (year, league));
+        CREATE TABLE results (
+            home INTEGER REFERENCES teams,
+            year INTEGER,
+            league TEXT,
+            goals INTEGER,
+            FOREIGN KEY (year, league) REFERENCES SEASONS
+        );
+        """
+    )
+    conn.close()
+
+    schema = bird_schema.load_schema(path)
+    (results,) = [t for t in schema.tables if t.name == "results"]
+    assert set(results.foreign_keys) == {
+        ("home", "Teams", "team_id"),
+        ("year", "seasons", "year"),
+        ("league", "seasons", "league"),
+    }
+
+    keep = bird_schema.link_schema(schema, "goals per city")
+    assert keep["Teams"] >= {"team_id", "city"} and "home" in keep["results"]
+    rendered = bird_schema.render_schema(schema, {**keep, "seasons": {"year", "league"}})
+    assert "FOREIGN KEY (home) REFERENCES Teams(team_id)" in rendered
+    assert "  PRIMARY KEY (year, league)" in rendered
+    assert "year INTEGER PRIMARY KEY" not in rendered
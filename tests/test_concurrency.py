@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+from confidence_tom.infra.concurrency import AdaptiveConcurrency, note_overload
+
+
+def test_overload_halves_limit_once_per_burst() -> None:
+    sem = AdaptiveConcurrency(8, max_limit=16)
+    sem.record(0.1, ok=False, overload=True)
+    assert sem.limit == 4
+    sem.record(0.1, ok=False, overload=True)  # same burst, still draining old limit
+    assert sem.limit == 4
+
+
+def test_healthy_completions_raise_limit() -> None:
+    sem = AdaptiveConcurrency(2, max_limit=4, window=4)
+    for _ in range(20):
+        sem.record(0.1, ok=True)
+    assert sem.limit == 4
+
+
+def test_process_wide_overload_signal_decreases_limit() -> None:
+    sem = AdaptiveConcurrency(6)
+    note_overload()
+    sem.record(0.1, ok=True)
+    assert sem.limit == 3
+
+
+def test_in_flight_never_exceeds_limit() -> None:
+    sem = AdaptiveConcurrency(3, max_limit=3)
+    peak = 0
+
+    async def _work() -> None:
+        nonlocal peak
+        async with sem:
+            peak = max(peak, sem.in_flight)
+            await asyncio.sleep(0.001)
+
+    async def _run() -> None:
+        await asyncio.gather(*(_work() for _ in range(20)))
+
+    asyncio.run(_run())
+    assert peak == 3
+    assert sem.in_flight == 0
+
+
+def test_timeout_escaping_slot_counts_once_as_overload() -> None:
+    sem = AdaptiveConcurrency(8, max_limit=16)
+
+    async def _run() -> None:
+        try:
+            async with sem:
+                await asyncio.wait_for(asyncio.sleep(1), timeout=0.001)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(_run())
+    assert list(sem._outcomes) == [False]
+    assert not sem._latencies
+    assert sem.limit == 4
+
+
+def test_cancelled_woken_waiter_hands_its_slot_on() -> None:
+    async def _run() -> list[str]:
+        sem = AdaptiveConcurrency(initial=1, max_limit=1)
+        await sem.acquire()
+        got: list[str] = []
+
+        async def waiter(name: str) -> None:
+            await sem.acquire()
+            got.append(name)
+
+        first = asyncio.create_task(waiter("first"))
+        second = asyncio.create_task(waiter("second"))
+        await asyncio.sleep(0)
+        sem.release()  # wakes "first" ...
+        first.cancel()  # ... which is cancelled before it takes the slot
+        await asyncio.wait_for(second, timeout=1.0)
+        assert first.cancelled()
+        return got
+
+    assert asyncio.run(_run()) == ["second"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from confidence_tom.data import snapshot
+from confidence_tom.data.dataset_models import StaticTask
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(snapshot, "snapshot_dir", lambda: tmp_path)
+    monkeypatch.delenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", raising=False)
+    return tmp_path
+
+
+def _counting_loader() -> tuple[list[int], Callable[..., list[StaticTask]]]:
+    calls: list[int] = []
+
+    @snapshot.snapshotted(seed=7)
+    def load_fake(num_samples: int = 2, split: str = "test") -> list[StaticTask]:
+        calls.append(num_samples)
+        return [
+            StaticTask(
+                id=f"fake_{i}",
+                question=f"Q{i}",
+                choices=["A) x", "B) y"] if i % 2 else [],
+                category="math",
+                source="fake",
+                metadata={"split": split, "nested": {"i": i}},
+            )
+            for i in range(num_samples)
+        ]
+
+    return calls, load_fake
+
+
+def test_snapshot_round_trips_and_skips_the_loader(snapshot_dir: Path) -> None:
+    calls, load_fake = _counting_loader()
+    first = load_fake(3)
+    second = load_fake(num_samples=3, split="test")
+
+    assert calls == [3]
+    assert second == first
+    assert len(list(snapshot_dir.glob("load_fake-*.arrow"))) == 1
+
+
+def test_snapshot_key_covers_parameters_and_can_be_disabled(
+    snapshot_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls, load_fake = _counting_loader()
+    load_fake(2)
+    load_fake(2, split="train")
+    assert load_fake(0) == []
+    assert load_fake(0) == []
+    monkeypatch.setenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", "0")
+    load_fake(2)
+
+    assert calls == [2, 2, 0, 2]
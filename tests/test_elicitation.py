@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from confidence_tom.data.task_models import RunSummary
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.client_utils import elicitation_messages
+
+
+def test_elicitation_messages_rewrite_tool_artifacts_and_trim() -> None:
+    messages: list[dict[str, Any]] = [{"role": "system", "content": "sys"}]
+    messages += [{"role": "user", "content": f"turn {i}"} for i in range(10)]
+    messages += [
+        {
+            "role": "assistant",
+            "content": None,
+            "reasoning": "hidden",
+            "tool_calls": [{"function": {"name": "lookup", "arguments": '{"id": 1}'}}],
+        },
+        {"role": "tool", "name": "lookup", "content": "found"},
+    ]
+    sanitized = elicitation_messages(messages)
+
+    assert sanitized[0] == {"role": "system", "content": "sys"}
+    assert len(sanitized) == 9
+    assert sanitized[-2] == {"role": "assistant", "content": '[called lookup({"id": 1})]'}
+    assert sanitized[-1] == {"role": "user", "content": "Tool result (lookup): found"}
+
+
+def test_summary_with_confidence_uses_one_structured_call() -> None:
+    client = LLMClient(model="qwen/qwen3-14b", backend="ollama")
+    calls: list[list[dict[str, Any]]] = []
+
+    async def fake_parsed(messages: list[dict[str, Any]], response_model: Any) -> Any:
+        calls.append(messages)
+        return RunSummary(
+            plan="p", trajectory=[], summary="s", final_answer="a", final_confidence=70
+        )
+
+    client.agenerate_parsed = fake_parsed  # type: ignore[method-assign]
+    summary, confidence = asyncio.run(
+        client.aelicit_summary_with_confidence([{"role": "user", "content": "task"}])
+    )
+
+    assert summary is not None and summary.final_answer == "a"
+    assert confidence == 0.7
+    assert len(calls) == 1 and "final_confidence" in calls[0][-1]["content"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.embedding_cache import EmbeddingCache
+
+
+def test_cache_round_trips_and_is_shared_across_instances(tmp_path: Path) -> None:
+    cache = EmbeddingCache("google/gemini-embedding-001", root=tmp_path)
+    cache.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+    cache.put_many(["b", "c"], [[9.0, 9.0], [5.0, 6.0]])  # "b" is kept, not duplicated
+
+    reopened = EmbeddingCache("google/gemini-embedding-001", root=tmp_path)
+    assert reopened.get_many(["c", "x", "b"]) == [[5.0, 6.0], None, [3.0, 4.0]]
+    assert reopened.stats()["rows"] == 3
+    assert (tmp_path / "google__gemini-embedding-001" / "vectors.f32").stat().st_size == 3 * 2 * 4
+
+
+def test_aembed_batch_chunks_dedupes_and_skips_cached(tmp_path: Path) -> None:
+    client = LLMClient(model="qwen/qwen3-14b:nitro", backend="ollama")
+    cache = EmbeddingCache("embed-model", root=tmp_path)
+    cache.put_many(["cached"], [[0.0, 0.0]])
+    requests: list[list[str]] = []
+
+    async def fake_create(*, model: str, input: list[str]) -> Any:
+        requests.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), 1.0])
+            for i, text in reversed(list(enumerate(input)))
+        ]
+        return SimpleNamespace(data=data)
+
+    async def _run() -> list[list[float]]:
+        aclient = client.aclient
+        assert aclient is not None
+        aclient.embeddings.create = fake_create  # type: ignore[method-assign]
+        return await client.aembed_batch(
+            ["aa", "cached", "bbb", "aa", "c"], model="embed-model", batch_size=2, cache=cache
+        )
+
+    vectors = asyncio.run(_run())
+    assert vectors == [[2.0, 1.0], [0.0, 0.0], [3.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert sorted(len(chunk) for chunk in requests) == [1, 2]
+    assert cache.get_many(["c"]) == [[1.0, 1.0]]
+
+
+def test_custom_endpoints_get_their_own_embedding_namespace(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.delenv("OPENROUTER_BASE_URL", raising=False)
+    assert LLMClient(model="m")._embedding_cache_namespace() == ""
+
+    monkeypatch.setenv("OPENROUTER_BASE_URL", "http://127.0.0.1:8099/v1")
+    stub = LLMClient(model="m")._embedding_cache_namespace()
+    assert stub and stub.startswith("openrouter-")
+
+    ollama = LLMClient(model="qwen/qwen3-14b", backend="ollama")._embedding_cache_namespace()
+    assert ollama and ollama.startswith("ollama-") and ollama != stub
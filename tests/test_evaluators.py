@@ -5,6 +5,7 @@ from typing import Any
 
 import pytest
 
+from confidence_tom.benchmarks import bird_exec
 from confidence_tom.data.task_models import DynamicTask
 from confidence_tom.eval.evaluators import (
     build_evaluator,
@@ -20,7 +21,8 @@ def test_extract_sql_from_code_fence() -> None:
     assert extract_sql(text) == "SELECT 1"
 
 
-def test_bird_sql_accepts_wrapped_sql(tmp_path: Any) -> None:
+def test_bird_sql_accepts_wrapped_sql(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(bird_exec, "gold_cache_dir", lambda: tmp_path / "gold")
     db_path = tmp_path / "sample.sqlite"
     conn = sqlite3.connect(db_path)
     conn.execute("CREATE TABLE numbers (value INTEGER)")
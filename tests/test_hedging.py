@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from confidence_tom.infra import hedging
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.hedging import HedgePolicy, hedge_delay, record_latency
+
+
+def _response(text: str) -> Any:
+    message = SimpleNamespace(content=text, reasoning=None)
+    return SimpleNamespace(
+        id="gen", model="m", usage=None, choices=[SimpleNamespace(message=message)]
+    )
+
+
+def _client(
+    monkeypatch: pytest.MonkeyPatch,
+    delays: dict[str, float],
+    hedge: HedgePolicy | None = None,
+) -> tuple[LLMClient, list]:
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+    client = LLMClient(
+        model="qwen/qwen3-14b",
+        hedge=hedge
+        or HedgePolicy(initial_delay_sec=0.05, min_delay_sec=0.0, model="qwen/qwen3-32b"),
+    )
+    client.rate_limiter = None
+    sent: list[tuple[str, str | None]] = []
+    cancelled: list[str] = []
+
+    async def fake_asend(
+        aclient: Any, kind: str, messages: Any, *, label: str | None = None, **kwargs: Any
+    ) -> Any:
+        sent.append((kwargs["model"], label))
+        try:
+            await asyncio.sleep(delays[kwargs["model"]])
+        except asyncio.CancelledError:
+            cancelled.append(kwargs["model"])
+            raise
+        return _response(kwargs["model"])
+
+    client._asend = fake_asend  # type: ignore[method-assign]
+    return client, [sent, cancelled]
+
+
+def test_slow_primary_loses_to_hedge(monkeypatch: pytest.MonkeyPatch) -> None:
+    client, (sent, cancelled) = _client(
+        monkeypatch, {"qwen/qwen3-14b": 5.0, "qwen/qwen3-32b": 0.01}
+    )
+    text, trace = asyncio.run(
+        client.agenerate_text_with_trace([{"role": "user", "content": "q"}], use_cache=False)
+    )
+
+    assert text == "qwen/qwen3-32b"
+    assert trace.hedge_path == "hedge"
+    assert sent == [("qwen/qwen3-14b", None), ("qwen/qwen3-32b", "chat.hedge")]
+    assert cancelled == ["qwen/qwen3-14b"]
+
+
+def test_fast_primary_sends_no_hedge(monkeypatch: pytest.MonkeyPatch) -> None:
+    client, (sent, cancelled) = _client(monkeypatch, {"qwen/qwen3-14b": 0.0, "qwen/qwen3-32b": 0.0})
+    text, trace = asyncio.run(
+        client.agenerate_text_with_trace([{"role": "user", "content": "q"}], use_cache=False)
+    )
+
+    assert text == "qwen/qwen3-14b"
+    assert trace.hedge_path == ""
+    assert sent == [("qwen/qwen3-14b", None)] and not cancelled
+
+
+def test_no_alternate_route_sends_no_duplicate(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(hedging, "hedge_alternate", lambda _: None)
+    policy = HedgePolicy(initial_delay_sec=0.0, min_delay_sec=0.0)
+    assert policy.hedge_kwargs({"model": "qwen/qwen3-14b"}) is None
+
+    client, (sent, cancelled) = _client(monkeypatch, {"qwen/qwen3-14b": 0.05}, hedge=policy)
+    text, trace = asyncio.run(
+        client.agenerate_text_with_trace([{"role": "user", "content": "q"}], use_cache=False)
+    )
+
+    assert text == "qwen/qwen3-14b"
+    assert trace.hedge_path == ""
+    assert sent == [("qwen/qwen3-14b", None)] and not cancelled
+
+
+class _FakeStream:
+    def __init__(self, text: str, first_token_delay: float, closed: list[str]) -> None:
+        self._pieces = [None, *text.split(" ")]
+        self._delay = first_token_delay
+        self._text = text
+        self._closed = closed
+
+    def __aiter__(self) -> _FakeStream:
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self._pieces:
+            raise StopAsyncIteration
+        piece = self._pieces.pop(0)
+        if piece is not None and self._delay:
+            await asyncio.sleep(self._delay)
+            self._delay = 0.0
+        delta = SimpleNamespace(content=piece and f"{piece} ", reasoning=None)
+        choice = SimpleNamespace(delta=delta, logprobs=None)
+        return SimpleNamespace(id="gen", model=self._text, usage=None, choices=[choice])
+
+    async def close(self) -> None:
+        self._closed.append(self._text)
+
+
+def test_stream_hedges_until_first_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+    client = LLMClient(
+        model="qwen/qwen3-14b",
+        hedge=HedgePolicy(initial_delay_sec=0.05, min_delay_sec=0.0, model="qwen/qwen3-32b"),
+    )
+    client.rate_limiter = None
+    delays = {"qwen/qwen3-14b": 5.0, "qwen/qwen3-32b": 0.01}
+    sent: list[tuple[str, str | None]] = []
+    closed: list[str] = []
+
+    async def fake_asend(
+        aclient: Any,
+        kind: str,
+        messages: Any,
+        *,
+        timing: Any = None,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        assert kind == "stream"
+        sent.append((kwargs["model"], label))
+        if timing is not None:
+            timing.update(started=0.0, queue_wait=0.0)
+        return _FakeStream(kwargs["model"], delays[kwargs["model"]], closed)
+
+    client._asend = fake_asend  # type: ignore[method-assign]
+    text, trace = asyncio.run(
+        client.agenerate_text_stream_with_trace(
+            [{"role": "user", "content": "q"}], stop_when=(), use_cache=False
+        )
+    )
+
+    assert text.strip() == "qwen/qwen3-32b"
+    assert trace.hedge_path == "hedge"
+    assert sent == [("qwen/qwen3-14b", None), ("qwen/qwen3-32b", "stream.hedge")]
+    assert sorted(closed) == ["qwen/qwen3-14b", "qwen/qwen3-32b"]
+
+
+def test_hedge_delay_tracks_percentile_within_bounds() -> None:
+    key = ("test", "delay-model", "chat")
+    policy = HedgePolicy(percentile=0.9, min_samples=10, min_delay_sec=0.5, max_delay_sec=5.0)
+    assert hedge_delay(key, policy) == 5.0  # initial 60s clamped to the max
+
+    for i in range(1, 11):
+        record_latency(key, float(i))
+    assert hedge_delay(key, policy) == 5.0
+    assert hedge_delay(key, HedgePolicy(percentile=0.2, min_samples=10)) == 2.0
+    assert hedge_delay(key, HedgePolicy(percentile=0.0, min_samples=10, min_delay_sec=1.5)) == 1.5
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+from openai import AsyncOpenAI
+
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.http_pool import closing_shared_clients
+
+
+def test_clients_for_same_endpoint_share_one_pool() -> None:
+    first = LLMClient(model="qwen/qwen3-14b:nitro", backend="ollama")
+    second = LLMClient(model="meta-llama/llama-4-scout", backend="ollama")
+    assert first.client is second.client
+
+    async def _pair() -> tuple[AsyncOpenAI | None, AsyncOpenAI | None]:
+        return first.aclient, second.aclient
+
+    a, b = asyncio.run(_pair())
+    assert a is not None and a is b
+
+    c, _ = asyncio.run(_pair())
+    assert c is not a  # a new event loop gets its own async transport
+
+
+def test_local_backend_has_no_api_client() -> None:
+    client = LLMClient(model="Qwen/Qwen3-0.6B", backend="local")
+    assert client.client is None
+    assert client.aclient is None
+
+
+def test_loop_clients_are_closed_before_the_loop_ends() -> None:
+    client = LLMClient(model="qwen/qwen3-14b:nitro", backend="ollama")
+
+    async def _use() -> AsyncOpenAI | None:
+        return client.aclient
+
+    aclient = asyncio.run(closing_shared_clients(_use()))
+    assert aclient is not None and aclient.is_closed()
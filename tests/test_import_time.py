@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_HEAVY = ("openai", "tenacity", "dotenv", "datasets", "pandas", "numpy", "torch", "transformers")
+
+# Cumulative self+children import time, generous enough for a loaded CI box.
+_BUDGET_US = {
+    "confidence_tom.infra.paths": 300_000,
+    "confidence_tom.infra": 300_000,
+    "confidence_tom.data.task_models": 800_000,
+    "confidence_tom.data.scale_dataset": 800_000,
+    "confidence_tom.eval.static_evaluators": 800_000,
+    "confidence_tom.intervention": 800_000,
+}
+
+
+def _importtime(module: str) -> dict[str, int]:
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line.split("|")
+        cumulative[name.strip()] = int(total_us)
+    return cumulative
+
+
+@pytest.mark.parametrize("module", sorted(_BUDGET_US))
+def test_lightweight_modules_stay_within_import_budget(module: str) -> None:
+    cumulative = _importtime(module)
+    assert not [name for name in _HEAVY if name in cumulative], sorted(cumulative)
+    assert cumulative[module] <= _BUDGET_US[module]
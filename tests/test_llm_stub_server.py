@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import sys
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, Field
+
+from confidence_tom.infra.client import LLMClient
+
+_TOOL = Path(__file__).resolve().parents[1] / "tools" / "llm_stub_server.py"
+
+
+def _load_stub() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("llm_stub_server", _TOOL)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+stub = _load_stub()
+
+
+class _Verdict(BaseModel):
+    answer: str
+    confidence: int = Field(ge=0, le=100)
+    steps: list[str]
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    srv, _ = stub.serve_in_thread(stub.StubConfig(latency="fixed", median_sec=0.0, seed=0))
+    monkeypatch.setenv("OPENROUTER_BASE_URL", srv.base_url)
+    monkeypatch.setenv("OPENROUTER_API_KEY", "stub")
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_client_round_trips_through_stub(server: Any) -> None:
+    client = LLMClient(model="stub/model", reasoning_effort="low")
+    messages = [{"role": "user", "content": "solve"}]
+
+    async def _run() -> tuple[Any, ...]:
+        parsed = await client.agenerate_parsed(messages, _Verdict)
+        text, trace = await client.agenerate_text_with_trace(messages, use_cache=False)
+        streamed, _ = await client.agenerate_text_stream_with_trace(messages, use_cache=False)
+        vectors = await client.aembed_batch(["a", "b"], use_cache=False)
+        return parsed, text, trace, streamed, vectors
+
+    parsed, text, trace, streamed, vectors = asyncio.run(_run())
+
+    assert isinstance(parsed, _Verdict) and 0 <= parsed.confidence <= 100
+    assert "Final Answer:" in text and trace.reasoning_tokens > 0 and trace.reasoning_content
+    assert streamed.rstrip().endswith("}")
+    assert len(vectors) == 2 and len(vectors[0]) == 256
+    stats = server.stats.snapshot()
+    assert stats["requests"] == {"parse": 1, "chat": 1, "chat.stream": 1, "embeddings": 1}
+    assert stats["reasoning_tokens"] > 0
+
+
+def test_injected_429_carries_retry_after(server: Any) -> None:
+    server.config.rate_429 = 1.0
+    request = urllib.request.Request(
+        server.base_url + "/chat/completions",
+        data=json.dumps({"model": "m", "messages": []}).encode(),
+        method="POST",
+    )
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(request)
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers["retry-after"] == "1.0"
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.local_batching import LocalBatcher
+
+
+def test_concurrent_requests_share_batches_per_temperature() -> None:
+    calls: list[tuple[int, float]] = []
+
+    def run_batch(
+        *, batch: list[list[dict[str, Any]]], max_tokens: list[int], temperature: float
+    ) -> list[tuple[str, ApiTrace]]:
+        calls.append((len(batch), temperature))
+        return [
+            (str(messages[0]["content"]), ApiTrace(completion_tokens=n))
+            for messages, n in zip(batch, max_tokens)
+        ]
+
+    batcher = LocalBatcher(run_batch, max_batch_size=4, max_wait_ms=50)
+
+    async def _run() -> list[tuple[str, ApiTrace]]:
+        return await asyncio.gather(
+            *(
+                batcher.submit(
+                    [{"role": "user", "content": f"p{i}"}],
+                    max_tokens=i,
+                    temperature=0.0 if i < 5 else 0.7,
+                )
+                for i in range(6)
+            )
+        )
+
+    results = asyncio.run(_run())
+    assert [text for text, _ in results] == [f"p{i}" for i in range(6)]
+    assert [trace.completion_tokens for _, trace in results] == list(range(6))
+    assert calls == [(4, 0.0), (1, 0.0), (1, 0.7)]
+    assert batcher.stats()["largest_batch"] == 4
+
+
+def test_batch_failure_is_raised_to_every_caller() -> None:
+    def run_batch(**_: Any) -> list[tuple[str, ApiTrace]]:
+        raise RuntimeError("out of memory")
+
+    batcher = LocalBatcher(run_batch, max_batch_size=2, max_wait_ms=50)
+
+    async def _run() -> list[Any]:
+        return await asyncio.gather(
+            *(batcher.submit([], max_tokens=8, temperature=0.0) for _ in range(2)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(_run())
+    assert all(isinstance(err, RuntimeError) for err in errors)
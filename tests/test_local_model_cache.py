@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from confidence_tom.infra.client_local import LocalModelCache
+
+_SIZES = {"a": 40, "b": 40, "c": 40}
+
+
+class _FakeModel:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def get_memory_footprint(self) -> int:
+        return _SIZES[self.name]
+
+
+def _cache(max_bytes: int) -> tuple[LocalModelCache, list[str]]:
+    loaded: list[str] = []
+    torch = SimpleNamespace(cuda=SimpleNamespace(is_available=lambda: False))
+
+    def loader(name: str, trust_remote_code: bool) -> tuple[Any, Any, Any]:
+        loaded.append(name)
+        return torch, object(), _FakeModel(name)
+
+    return LocalModelCache(max_bytes, loader=loader, estimate=lambda name: _SIZES[name]), loaded
+
+
+def test_evicts_lru_to_fit_budget_and_counts() -> None:
+    cache, loaded = _cache(max_bytes=100)
+    cache.get("a", False)
+    cache.get("b", False)
+    cache.get("a", False)
+    cache.get("c", False)
+
+    stats = cache.stats()
+    assert loaded == ["a", "b", "c"]
+    assert stats["models"] == ["a", "c"]
+    assert stats["resident_bytes"] == 80
+    assert (stats["loads"], stats["hits"], stats["evictions"]) == (3, 1, 1)
+
+
+def test_pinned_models_survive_eviction() -> None:
+    cache, loaded = _cache(max_bytes=100)
+    with cache.pinned("a"):
+        cache.get("a", False)
+        cache.get("b", False)
+        cache.get("c", False)
+        assert cache.stats()["models"] == ["a", "c"]
+    assert cache.stats()["pinned"] == []
+    assert cache.evict("a") and cache.stats()["models"] == ["c"]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Any
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.client_utils import extract_trace
+from confidence_tom.infra.logprob_confidence import (
+    TokenLogprob,
+    answer_span,
+    logprob_confidence,
+)
+
+
+def _tok(token: str, prob: float, top: dict[str, float] | None = None) -> TokenLogprob:
+    alts = tuple((t, math.log(p)) for t, p in (top or {}).items())
+    return TokenLogprob(token=token, logprob=math.log(prob), top=alts)
+
+
+def test_answer_span_prefers_boxed_then_final_answer_line() -> None:
+    text = "work \\boxed{\\frac{1}{2}} more"
+    start, end = answer_span(text) or (0, 0)
+    assert text[start:end] == "\\frac{1}{2}"
+    text = "Step 1.\nFinal Answer: B  \n"
+    start, end = answer_span(text) or (0, 0)
+    assert text[start:end] == "B"
+
+
+def test_answer_prob_and_expected_confidence() -> None:
+    tokens = [
+        _tok("Final Answer:", 0.99),
+        _tok(" 4", 0.5),
+        _tok("2", 0.8),
+        _tok("\nConfidence:", 0.99),
+        _tok(" 8", 0.6, {" 8": 0.6, " 9": 0.3, " 7": 0.1}),
+        _tok("0", 0.9),
+    ]
+    signal = logprob_confidence(tokens)
+
+    assert signal.answer_tokens == 2
+    assert signal.answer_prob == pytest.approx(0.4)
+    assert signal.confidence_distribution == pytest.approx({70: 0.1, 80: 0.6, 90: 0.3})
+    assert signal.expected_confidence == pytest.approx(0.82)
+
+
+def test_extract_trace_reads_choice_logprobs() -> None:
+    content = [
+        {"token": "Final Answer: ", "logprob": 0.0, "bytes": None, "top_logprobs": []},
+        {"token": "C", "logprob": math.log(0.25), "bytes": None, "top_logprobs": []},
+    ]
+    response = ChatCompletion.model_validate(
+        {
+            "id": "gen",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "m",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Final Answer: C"},
+                    "logprobs": {"content": content},
+                }
+            ],
+        }
+    )
+    trace = extract_trace(response)
+    assert trace.answer_prob == pytest.approx(0.25)
+    assert trace.expected_confidence is None
+
+
+def test_logprob_mode_requests_logprobs_and_skips_elicitation() -> None:
+    client = LLMClient(model="qwen/qwen3-14b", backend="ollama", logprob_confidence=True)
+    assert client._completion_kwargs()["top_logprobs"] == 5
+
+    async def no_call(*_: Any, **__: Any) -> Any:
+        raise AssertionError("elicitation call should be skipped")
+
+    client._acreate = no_call  # type: ignore[method-assign]
+    trace = ApiTrace(answer_prob=0.7, expected_confidence=0.65)
+    assert asyncio.run(client.aelicit_confidence([], trace=trace)) == 0.65
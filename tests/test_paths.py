@@ -37,3 +37,14 @@ def test_output_root_defaults_to_outputs_and_supports_env_override(
     assert paths.output_root() == Path("/tmp/confidence-tom-out")
     assert paths.results_root() == Path("/tmp/confidence-tom-out") / "results"
     assert paths.logs_root() == Path("/tmp/confidence-tom-out") / "logs"
+
+
+def test_project_root_loads_dotenv_for_scripts(monkeypatch: MonkeyPatch) -> None:
+    calls: list[None] = []
+    monkeypatch.setattr(paths, "load_env", lambda: calls.append(None))
+    paths.project_root.cache_clear()
+    try:
+        assert paths.project_root() == ROOT
+    finally:
+        paths.project_root.cache_clear()
+    assert calls == [None]
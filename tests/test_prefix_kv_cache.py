@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+
+import numpy as np
+import pytest
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra import client_local
+from confidence_tom.infra.client_local import PrefixKVCache, _row_clone
+
+
+@dataclass
+class _Tensor:
+    n: int
+
+    def numel(self) -> int:
+        return self.n
+
+    def element_size(self) -> int:
+        return 4
+
+
+@dataclass
+class _Layer:
+    keys: _Tensor
+    values: _Tensor
+
+
+@dataclass
+class _FakeCache:
+    length: int
+    layers: list[_Layer] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.crop(self.length)
+
+    def crop(self, max_length: int) -> None:
+        self.length = min(self.length, max_length)
+        self.layers = [_Layer(_Tensor(self.length), _Tensor(self.length))]
+
+
+def test_longest_common_prefix_is_reused_and_cropped() -> None:
+    cache = PrefixKVCache(max_bytes=10_000)
+    cache.store((1, 2, 3, 4, 5), _FakeCache(7))
+    cache.store((1, 2, 9), _FakeCache(3))
+
+    past, reused = cache.lookup((1, 2, 3, 4, 8, 8))
+    assert reused == 4
+    assert past.length == 4
+    assert cache.lookup((1, 2, 3, 4, 5))[1] == 4  # always leave one token to prefill
+    assert cache.lookup((7, 7)) == (None, 0)
+    assert cache.stats()["hits"] == 2
+
+
+def test_extending_prompt_supersedes_and_budget_evicts_lru() -> None:
+    cache = PrefixKVCache(max_bytes=100)
+    cache.store((1, 2), _FakeCache(2))
+    cache.store((1, 2, 3), _FakeCache(3))
+    assert cache.stats()["entries"] == 1
+
+    cache.store((5, 6, 7, 8, 9), _FakeCache(5))  # 3*8 + 5*8 bytes
+    cache.store((4, 4, 4, 4, 4, 4), _FakeCache(6))  # pushes out the oldest entry
+    assert cache.lookup((1, 2, 3, 0)) == (None, 0)
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_lookup_crops_a_shallow_clone_and_leaves_the_entry_intact(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = PrefixKVCache(max_bytes=10_000)
+    stored = _FakeCache(6)
+    cache.store((1, 2, 3, 4, 5, 6), stored)
+
+    def no_deepcopy(*_: object, **__: object) -> None:
+        raise AssertionError("lookup must not deep-copy the stored KV cache")
+
+    monkeypatch.setattr(copy, "deepcopy", no_deepcopy)
+    past, reused = cache.lookup((1, 2, 3, 9))
+    assert (reused, past.length) == (3, 3)
+    assert past is not stored and stored.length == 6
+    assert cache.lookup((1, 2, 3, 4, 5, 0))[1] == 5
+
+
+class _Array:
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+
+    def __getitem__(self, key: object) -> _Array:
+        return _Array(self.data[key])
+
+    def clone(self) -> _Array:
+        return _Array(self.data.copy())
+
+
+def test_row_clone_drops_left_padding_and_copies_the_row() -> None:
+    keys = _Array(np.arange(2 * 1 * 4).reshape(2, 1, 4))
+    batch = _FakeCache(4, layers=[])
+    batch.layers = [_Layer(keys, keys)]  # type: ignore[arg-type]
+
+    row = _row_clone(batch, 1, 1)
+    assert row.layers[0].keys.data.tolist() == [[[5, 6, 7]]]
+    assert not np.shares_memory(row.layers[0].keys.data, keys.data)
+    assert batch.layers[0].keys is keys
+
+
+def test_batch_routes_cached_prefixes_through_the_unpadded_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    kv_cache = PrefixKVCache(max_bytes=10_000)
+    kv_cache.store((ord("a"), ord("b"), ord("c")), _FakeCache(3))
+
+    def tokenize(text: str) -> dict[str, list[int]]:
+        return {"input_ids": [ord(ch) for ch in text]}
+
+    def single(*, messages: list[dict[str, str]], **_: object) -> tuple[str, ApiTrace]:
+        return "single:" + messages[0]["content"], ApiTrace()
+
+    padded_calls: list[list[str]] = []
+
+    def padded(*_: object, prompts: list[str], **__: object) -> list[tuple[str, ApiTrace]]:
+        padded_calls.append(prompts)
+        return [("padded:" + p, ApiTrace()) for p in prompts]
+
+    monkeypatch.setattr(client_local, "load_local_stack", lambda *_: (None, tokenize, None))
+    monkeypatch.setattr(client_local, "local_prompt_text", lambda m, _: m[0]["content"])
+    monkeypatch.setattr(client_local, "prefix_kv_cache", lambda _: kv_cache)
+    monkeypatch.setattr(client_local, "local_generate_text", single)
+    monkeypatch.setattr(client_local, "_generate_padded", padded)
+
+    def run(*prompts: str) -> list[str]:
+        return [
+            text
+            for text, _ in client_local.local_generate_batch(
+                model_name="m",
+                trust_remote_code=False,
+                batch=[[{"role": "user", "content": p}] for p in prompts],
+                max_tokens=[4] * len(prompts),
+                temperature=0.0,
+            )
+        ]
+
+    assert run("abcx", "xyz", "abcy", "qrs") == [
+        "single:abcx",
+        "padded:xyz",
+        "single:abcy",
+        "padded:qrs",
+    ]
+    assert padded_calls == [["xyz", "qrs"]]
+    # A single miss is not worth padding; it keeps the unpadded path too.
+    assert run("abcz", "xyz") == ["single:abcz", "single:xyz"]
+    assert kv_cache.stats()["hits"] == 0  # routing peeks without counting
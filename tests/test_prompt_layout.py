@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.client_utils import normalize_chat_message
+from confidence_tom.infra.prompt_layout import layered_messages, prefix_blocks
+from confidence_tom.intervention import ModelPricing, prompt_cache_summary, trace_to_cost
+
+
+def _continue_messages(prefix_text: str) -> list[dict[str, object]]:
+    return layered_messages(
+        "system",
+        "Problem:\nq\n\nReasoning prefix:\n",
+        prefix_blocks(prefix_text),
+        "Continue from this prefix and finish the task.",
+    )
+
+
+def test_layered_prompt_flattens_to_the_flat_prompt() -> None:
+    prefix_text = "1. a\n\n2. b"
+    user = normalize_chat_message(_continue_messages(prefix_text)[1])
+    assert user["content"] == (
+        "Problem:\nq\n\nReasoning prefix:\n1. a\n\n2. b\n\n"
+        "Continue from this prefix and finish the task."
+    )
+
+
+def test_consecutive_steps_share_a_part_prefix_with_breakpoints() -> None:
+    step_2 = _continue_messages("1. a\n\n2. b")[1]["content"]
+    step_3 = _continue_messages("1. a\n\n2. b\n\n3. c")[1]["content"]
+    assert isinstance(step_2, list) and isinstance(step_3, list)
+    shared = [p["text"] for p in step_2[:-1]]
+    assert [p["text"] for p in step_3[: len(shared)]] == shared
+    assert [("cache_control" in p) for p in step_3] == [True, False, False, True, False]
+
+
+def test_cached_input_tokens_are_priced_and_summarized() -> None:
+    trace = ApiTrace(prompt_tokens=1000, cache_read_tokens=800, completion_tokens=0)
+    cost = trace_to_cost(trace, ModelPricing(input_per_1k=1.0, cached_input_per_1k=0.1))
+    assert cost.estimated_cost_usd is not None
+    assert abs(cost.estimated_cost_usd - 0.28) < 1e-9
+    assert prompt_cache_summary([cost, trace_to_cost(ApiTrace(prompt_tokens=1000))]) == {
+        "input_tokens": 2000,
+        "cached_input_tokens": 800,
+        "cache_hit_ratio": 0.4,
+    }
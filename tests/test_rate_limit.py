@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from confidence_tom.infra.rate_limit import (
+    AdaptiveRateLimiter,
+    observe_response_headers,
+    parse_reset_seconds,
+    rate_limiter_for,
+    reset_rate_limiters,
+)
+
+
+def test_parse_reset_seconds_handles_durations_and_epochs() -> None:
+    assert parse_reset_seconds("6m0s") == 360.0
+    assert parse_reset_seconds("250ms") == 0.25
+    assert parse_reset_seconds("2") == 2.0
+    epoch_ms = str(int((time.time() + 30) * 1000))
+    assert 25.0 < (parse_reset_seconds(epoch_ms) or 0.0) <= 30.0
+    assert parse_reset_seconds("") is None
+
+
+def test_rate_limited_response_halves_rate_and_pauses() -> None:
+    limiter = AdaptiveRateLimiter(("openrouter", "m"), rpm=120.0)
+    limiter.record_rate_limited({"retry-after": "3"})
+
+    assert limiter.requests.per_minute == 60.0
+    assert limiter.blocked_until - time.monotonic() > 2.5
+    assert limiter._try_acquire(0) > 2.5
+
+    limiter.record_success()
+    assert limiter.requests.per_minute == 61.0
+
+
+def test_headers_set_ceiling_and_block_when_exhausted() -> None:
+    limiter = AdaptiveRateLimiter(("openrouter", "m"))
+    limiter.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "30",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+        }
+    )
+    assert limiter.requests.per_minute == 30.0
+    assert limiter.rpm_ceiling == 30.0
+    assert limiter.blocked_until > time.monotonic()
+
+
+def test_acquire_is_immediate_when_unconstrained() -> None:
+    limiter = AdaptiveRateLimiter(("ollama", "m"))
+    waited = asyncio.run(limiter.acquire(1000))
+    assert waited == 0.0
+
+
+def test_observe_response_headers_routes_by_request_model() -> None:
+    observe_response_headers(
+        "openrouter",
+        b'{"model": "test/observed-model", "messages": []}',
+        {"x-ratelimit-limit-requests": "42"},
+    )
+    assert rate_limiter_for("openrouter", "test/observed-model").rpm_ceiling == 42.0
+
+
+def test_reset_forgets_learned_limits() -> None:
+    limiter = rate_limiter_for("openrouter", "reset/model")
+    limiter.record_rate_limited({"retry-after": "30"})
+    reset_rate_limiters()
+    fresh = rate_limiter_for("openrouter", "reset/model")
+    assert fresh is not limiter and fresh.rate_limited == 0
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra import client as client_module
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.replay import (
+    Cassette,
+    CassetteEntry,
+    CassetteRecorder,
+    ReplayMiss,
+    build_cassette,
+    write_cassette,
+)
+
+
+class _Answer(BaseModel):
+    answer: str
+    confidence: int
+
+
+def test_recorded_calls_replay_exactly(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    recorder = CassetteRecorder(path)
+    messages = [{"role": "user", "content": "What is 6*7?"}]
+    recorder.record(
+        "chat",
+        "qwen/qwen3-14b",
+        messages,
+        ApiTrace(response_content="Final Answer: 42", prompt_tokens=9, completion_tokens=4),
+        latency_sec=1.5,
+    )
+    recorder.record(
+        "chat",
+        "qwen/qwen3-14b",
+        [{"role": "user", "content": "other"}],
+        ApiTrace(response_content="Final Answer: 1"),
+        latency_sec=0.5,
+    )
+
+    client = LLMClient(model="qwen/qwen3-14b", backend="replay", replay_cassette=str(path))
+    text, trace = asyncio.run(client.agenerate_text_with_trace(messages))
+
+    assert text == "Final Answer: 42"
+    assert trace.prompt_tokens == 9 and trace.completion_tokens == 4
+    streamed, stream_trace = asyncio.run(client.agenerate_text_stream_with_trace(messages))
+    assert streamed == "Final Answer: 42"
+    assert stream_trace.completion_tokens == 4
+
+
+def test_harvested_traces_serve_structured_and_unmatched_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    partials = tmp_path / "partials"
+    partials.mkdir()
+    payload = {
+        "status": "full_trace_done",
+        "full_trace_api_trace": {
+            "model_id": "openai/gpt-5.4-2026-03-05",
+            "response_content": json.dumps({"answer": "B", "confidence": 80}),
+            "prompt_tokens": 100,
+        },
+    }
+    (partials / "task-1.json").write_text(json.dumps(payload))
+    telemetry = tmp_path / "llm_calls.jsonl"
+    telemetry.write_text(
+        json.dumps({"model": "openai/gpt-5.4", "kind": "chat", "outcome": "ok", "latency_sec": 3})
+        + "\n"
+    )
+
+    entries = build_cassette([partials], telemetry_path=telemetry)
+    assert len(entries) == 1 and entries[0].latency_sec == 3
+    path = tmp_path / "cassette.jsonl"
+    write_cassette(entries, path)
+
+    client = LLMClient(model="openai/gpt-5.4", backend="replay", replay_cassette=str(path))
+    parsed, trace = asyncio.run(
+        client.agenerate_with_trace([{"role": "user", "content": "new prompt"}], _Answer)
+    )
+    assert parsed == _Answer(answer="B", confidence=80)
+    assert trace.model_id == "openai/gpt-5.4-2026-03-05"
+
+    def no_store(*_: Any, **__: Any) -> None:
+        raise AssertionError("replayed vectors must not reach the embedding cache")
+
+    monkeypatch.setattr(client_module, "embedding_cache_for", no_store)
+    vectors = asyncio.run(client.aembed_batch(["a", "b", "a"]))
+    assert vectors[0] == vectors[2] and vectors[0] != vectors[1]
+
+
+def test_fallback_rotates_through_model_entries() -> None:
+    cassette = Cassette(
+        [
+            CassetteEntry(model="m", response_content="one"),
+            CassetteEntry(model="m", response_content="two"),
+            CassetteEntry(model="other", response_content="three"),
+        ]
+    )
+    served = [cassette.match("m", [{"role": "user", "content": str(i)}]) for i in range(3)]
+
+    assert [entry.response_content for entry in served] == ["one", "two", "one"]
+    assert cassette.stats() == {"entries": 3, "exact": 0, "fallback": 3, "misses": 0}
+
+
+def test_fallback_never_crosses_model_or_call_kind() -> None:
+    cassette = Cassette(
+        [
+            CassetteEntry(model="worker", response_content="Final Answer: B"),
+            CassetteEntry(model="extractor", kind="parse", response_content='{"answer": "B"}'),
+        ]
+    )
+    assert cassette.match("worker", [], "stream").response_content == "Final Answer: B"
+    with pytest.raises(ReplayMiss):
+        cassette.match("worker", [], "parse")
+    with pytest.raises(ReplayMiss):
+        cassette.match("judge", [])
+    assert cassette.stats() == {"entries": 2, "exact": 0, "fallback": 1, "misses": 2}
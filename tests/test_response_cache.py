@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from confidence_tom.data.task_models import ApiTrace
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.response_cache import ResponseCache, request_key
+
+
+def test_request_key_is_order_independent() -> None:
+    a = request_key("text", {"model": "m", "temperature": 0.0})
+    b = request_key("text", {"temperature": 0.0, "model": "m"})
+    assert a == b
+    assert a != request_key("parsed", {"model": "m", "temperature": 0.0})
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache("run", root=tmp_path, max_bytes=10_000)
+    payload = {"text": "x" * 3000}
+    for idx, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, payload)
+        path = tmp_path / "run" / key[:2] / f"{key}.json"
+        os.utime(path, (1_000 + idx, 1_000 + idx))
+    assert cache.get("aa01") is not None  # refresh the oldest entry
+
+    cache.put("dd04", payload)
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("dd04") is not None
+
+
+def test_llm_client_serves_repeat_calls_from_cache(tmp_path: Path) -> None:
+    cache = ResponseCache("run", root=tmp_path)
+    client = LLMClient(model="qwen/qwen3-14b:nitro", backend="ollama", response_cache=cache)
+    calls: list[int] = []
+
+    async def fake_uncached(messages: list[dict[str, Any]], **kwargs: Any) -> tuple[str, ApiTrace]:
+        calls.append(1)
+        return "Final Answer: 4", ApiTrace(request_id="req-1", completion_tokens=5)
+
+    client._agenerate_text_with_trace_uncached = fake_uncached  # type: ignore[method-assign]
+    messages = [{"role": "user", "content": "2+2?"}]
+
+    first_text, first_trace = asyncio.run(client.agenerate_text_with_trace(messages))
+    second_text, second_trace = asyncio.run(client.agenerate_text_with_trace(messages))
+    asyncio.run(client.agenerate_text_with_trace(messages, use_cache=False))
+
+    assert first_text == second_text == "Final Answer: 4"
+    assert not first_trace.cache_hit
+    assert second_trace.cache_hit and second_trace.request_id == "req-1"
+    assert len(calls) == 2
+
+    asyncio.run(client.agenerate_text_with_trace(messages, temperature=0.7))
+    assert len(calls) == 3
+
+
+def test_stub_endpoint_does_not_share_cache_keys_with_real_api(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ResponseCache("run", root=tmp_path)
+    messages = [{"role": "user", "content": "q"}]
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.delenv("OPENROUTER_BASE_URL", raising=False)
+    real = LLMClient(model="m", temperature=0.0, response_cache=cache)
+    monkeypatch.setenv("OPENROUTER_BASE_URL", "http://127.0.0.1:8099/v1")
+    stub = LLMClient(model="m", temperature=0.0, response_cache=cache)
+
+    assert real._cache_key("text", messages) != stub._cache_key("text", messages)
+
+    stub._cache_put(stub._cache_key("text", messages), {"text": "stub"})
+    assert real._cache_get(real._cache_key("text", messages)) is None
+
+    async def embed(client: LLMClient, value: float) -> list[float]:
+        async def fake_create(**_: Any) -> Any:
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[value])])
+
+        aclient = client.aclient
+        assert aclient is not None
+        aclient.embeddings.create = fake_create  # type: ignore[method-assign]
+        return await client.aembed_text("hello", model="e")
+
+    assert asyncio.run(embed(stub, 1.0)) == [1.0]
+    assert asyncio.run(embed(real, 2.0)) == [2.0]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import pytest
+from datasets import Dataset
+
+from confidence_tom.data import scale_dataset
+from confidence_tom.data.sampling import hash_rank, hash_sample
+
+
+@pytest.fixture(autouse=True)
+def no_snapshots(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", "0")
+
+
+def test_hash_sample_is_prefix_stable_and_order_independent() -> None:
+    rows = [f"r{i}" for i in range(500)]
+    small = hash_sample(rows, 10, key=str, seed=7, convert=str)
+    large = hash_sample(list(reversed(rows)), 40, key=str, seed=7, convert=str)
+
+    assert large[:10] == small
+    assert small == sorted(rows, key=lambda r: hash_rank(r, 7))[:10]
+    assert hash_sample(rows, 10, key=str, seed=8, convert=str) != small
+
+
+def test_hash_sample_converts_only_heap_candidates_and_skips_rejects() -> None:
+    converted: list[int] = []
+
+    def convert(row: int) -> Optional[int]:
+        converted.append(row)
+        return None if row % 2 else row
+
+    picked = hash_sample(range(10_000), 5, key=str, seed=1, convert=convert)
+
+    assert len(picked) == 5 and all(row % 2 == 0 for row in picked)
+    assert (
+        picked
+        == sorted((r for r in range(10_000) if r % 2 == 0), key=lambda r: hash_rank(str(r), 1))[:5]
+    )
+    assert len(converted) < 500
+
+
+def _supergpqa(n: int) -> Dataset:
+    rows: dict[str, list[Any]] = {
+        "uuid": [f"u{i}" for i in range(n)],
+        "question": [f"Q{i}" for i in range(n)],
+        "options": [["a", "b", "c"] if i % 5 == 0 else ["a", "b", "c", "d"] for i in range(n)],
+        "answer_letter": ["B"] * n,
+        "difficulty": ["hard"] * n,
+    }
+    return Dataset.from_dict(rows)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_supergpqa_hash_sampling_grows_without_reshuffling(
+    monkeypatch: pytest.MonkeyPatch, streaming: bool
+) -> None:
+    dataset = _supergpqa(60)
+    served = dataset.to_iterable_dataset(num_shards=3) if streaming else dataset
+    monkeypatch.setattr(scale_dataset, "_load_dataset", lambda *a, **k: served)
+
+    small = scale_dataset.load_supergpqa_mc(num_samples=5, sampling="hash", streaming=streaming)
+    large = scale_dataset.load_supergpqa_mc(num_samples=20, sampling="hash", streaming=streaming)
+
+    assert [q.id for q in large[:5]] == [q.id for q in small]
+    assert all(int(q.id.split("_u")[1]) % 5 for q in large)
+    assert len({q.id for q in large}) == 20
+
+
+def test_streaming_requires_hash_sampling() -> None:
+    with pytest.raises(ValueError, match="sampling='hash'"):
+        scale_dataset.load_supergpqa_mc(num_samples=5, streaming=True)
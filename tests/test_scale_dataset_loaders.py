@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+from datasets import Dataset
+
+from confidence_tom.data import scale_dataset
+from confidence_tom.data.dataset_models import MCQuestion
+
+
+@pytest.fixture(autouse=True)
+def no_snapshots(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CONFIDENCE_TOM_DATASET_SNAPSHOTS", "0")
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, dataset: Dataset) -> None:
+    monkeypatch.setattr(scale_dataset, "_load_dataset", lambda *a, **k: dataset)
+
+
+def test_olympiadbench_filters_on_arrow_and_keeps_shuffled_positions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    n = 40
+    rows: dict[str, list[Any]] = {
+        "id": list(range(n)),
+        "question": [f"Q{i}" for i in range(n)],
+        "context": [None if i % 3 else f"C{i}" for i in range(n)],
+        "final_answer": [[] if i % 7 == 0 else [f"{i}"] for i in range(n)],
+        "modality": ["Text-only" if i % 4 else "Multimodal" for i in range(n)],
+        "question_type": ["Open-ended" if i % 5 else "Theorem proof" for i in range(n)],
+        "difficulty": ["Competition"] * n,
+        "solution": ["long worked solution " * 50] * n,
+    }
+    dataset = Dataset.from_dict(rows)
+    _serve(monkeypatch, dataset)
+
+    expected = []
+    for i, item in enumerate(dataset.shuffle(seed=42)):
+        if (
+            item["modality"].lower() == "text-only"
+            and item["question_type"].lower() == "open-ended"
+            and item["final_answer"]
+        ):
+            expected.append((f"olympiadbench_{item['id']}_{i:04d}", item["final_answer"][0]))
+    questions = scale_dataset.load_olympiadbench(num_samples=8)
+
+    assert [(q.id, q.reference_answer) for q in questions] == expected[:8]
+    with_context = [q for q in questions if "Context:" in q.question]
+    assert all(int(q.id.split("_")[1]) % 3 == 0 for q in with_context)
+
+
+def test_hle_skips_image_rows_without_decoding_media(monkeypatch: pytest.MonkeyPatch) -> None:
+    n = 30
+    question = "Pick one.\nA) a\nB) b\nC) c\nD) d"
+    dataset = Dataset.from_dict(
+        {
+            "id": [f"h{i}" for i in range(n)],
+            "question": [question] * n,
+            "image": ["data:image/png;base64,AAAA" if i % 3 == 0 else "" for i in range(n)],
+            "answer_type": ["multipleChoice" if i % 2 else "exactMatch" for i in range(n)],
+            "answer": ["B"] * n,
+            "category": ["Math"] * n,
+            "image_preview": [b"\x89PNG" * 100] * n,
+        }
+    )
+    _serve(monkeypatch, dataset)
+    questions = scale_dataset.load_hle_mc_text_only(num_samples=100)
+
+    kept = {int(q.id.split("_")[2][1:]) for q in questions}
+    assert kept == {i for i in range(n) if i % 3 and i % 2}
+    assert all(q.correct_answer == "B" and len(q.choices) == 4 for q in questions)
+
+
+def test_parallel_source_loading_keeps_serial_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake(source: str, delay: float) -> Any:
+        def load(num_samples: int) -> list[MCQuestion]:
+            time.sleep(delay)
+            return [
+                MCQuestion(id=f"{source}_{i}", question="q", category=source, source=source)
+                for i in range(num_samples)
+            ]
+
+        return load
+
+    called: list[str] = []
+    for name, source, delay in [
+        ("load_hle_mc_text_only", "hle", 0.05),
+        ("load_supergpqa_mc", "super", 0.0),
+        ("load_olympiadbench", "olympiad", 0.02),
+    ]:
+        monkeypatch.setattr(scale_dataset, name, fake(source, delay))
+    monkeypatch.setattr(scale_dataset, "load_musr", lambda **_: called.append("musr") or [])
+
+    counts = {"hle_mc": 3, "supergpqa": 4, "olympiadbench": 2}
+    serial = scale_dataset.load_scale_experiment_dataset(counts=counts, max_workers=1)
+    parallel = scale_dataset.load_scale_experiment_dataset(counts=counts, max_workers=8)
+
+    assert [q.id for q in parallel] == [q.id for q in serial]
+    assert len(serial) == 9 and called == []
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from types import SimpleNamespace
+from typing import Any
+
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.client_utils import (
+    FINAL_ANSWER_STOPS,
+    first_stop,
+    stop_after_final_answer_line,
+    stop_predicate_key,
+)
+
+
+def test_final_answer_predicates_cut_after_answer() -> None:
+    text = "1. Expand.\n**Final Answer:** 42\nLet me double-check..."
+    cut = first_stop(text, FINAL_ANSWER_STOPS)
+    assert cut is not None and text[:cut].endswith("**Final Answer:** 42")
+
+    boxed = "Final Answer:\n\\boxed{\\frac{1}{2}} and more"
+    cut = first_stop(boxed, FINAL_ANSWER_STOPS)
+    assert cut is not None and boxed[:cut].endswith("\\frac{1}{2}}")
+
+    assert first_stop("Final Answer: 4", FINAL_ANSWER_STOPS) is None
+    assert first_stop("so \\boxed{3} for now\n", FINAL_ANSWER_STOPS) is None
+
+
+def _stop_at(marker: str, text: str) -> int | None:
+    idx = text.find(marker)
+    return idx if idx != -1 else None
+
+
+def test_stop_predicate_keys_distinguish_partials_and_skip_lambdas() -> None:
+    assert stop_predicate_key(stop_after_final_answer_line) == (
+        "confidence_tom.infra.client_utils.stop_after_final_answer_line"
+    )
+    a = stop_predicate_key(functools.partial(_stop_at, "A\n"))
+    b = stop_predicate_key(functools.partial(_stop_at, "B\n"))
+    assert a is not None and b is not None and a != b
+    assert stop_predicate_key(lambda text: None) is None
+    assert stop_predicate_key(functools.partial(lambda m, t: None, "x")) is None
+
+
+class _FakeStream:
+    def __init__(self, pieces: list[str]) -> None:
+        self.pieces = pieces
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self) -> _FakeStream:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.consumed >= len(self.pieces):
+            raise StopAsyncIteration
+        piece = self.pieces[self.consumed]
+        self.consumed += 1
+        delta = SimpleNamespace(content=piece, reasoning=None)
+        return SimpleNamespace(
+            id="gen-1", model="m", usage=None, choices=[SimpleNamespace(delta=delta)]
+        )
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_stream_closes_once_final_answer_line_completes() -> None:
+    client = LLMClient(model="qwen/qwen3-14b:nitro", backend="ollama")
+    stream = _FakeStream(["Step 1.\n", "Final Answer: ", "7", "\n", "Extra ", "text"])
+
+    async def fake_acreate(kind: str, messages: list[dict[str, Any]], **_: Any) -> Any:
+        assert kind == "stream"
+        return stream
+
+    client._acreate = fake_acreate  # type: ignore[method-assign]
+    text, trace = asyncio.run(
+        client.agenerate_text_stream_with_trace([{"role": "user", "content": "q"}])
+    )
+
+    assert text == "Step 1.\nFinal Answer: 7"
+    assert stream.closed and stream.consumed == 4
+    assert trace.stopped_early and trace.tokens_estimated
+    assert trace.request_id == "gen-1"
+    assert trace.completion_tokens == 4
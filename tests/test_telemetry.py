@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from pydantic import BaseModel
+
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.telemetry import CallEvent, Histogram, TelemetrySink, telemetry
+
+
+def test_histogram_quantiles_use_bucket_edges() -> None:
+    hist = Histogram()
+    for value in [0.02] * 90 + [3.0] * 10:
+        hist.add(value)
+    assert hist.quantile(0.5) == 0.025
+    assert hist.quantile(0.95) == 4.0
+
+
+def test_sink_aggregates_and_writes_jsonl(tmp_path: Path) -> None:
+    sink = TelemetrySink()
+    sink.configure(tmp_path / "calls.jsonl")
+    sink.emit(CallEvent("m", "openrouter", "chat", "ok", 1.2, prompt_tokens=10))
+    sink.emit(CallEvent("m", "openrouter", "chat", "rate_limited", 0.1, error="429"))
+    sink.configure(None)
+
+    (row,) = sink.summary()
+    assert row["calls"] == 2
+    assert row["outcomes"] == {"ok": 1, "rate_limited": 1}
+    assert row["prompt_tokens"] == 10
+    lines = (tmp_path / "calls.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["outcome"] for line in lines] == ["ok", "rate_limited"]
+
+
+def test_client_calls_are_recorded() -> None:
+    client = LLMClient(model="telemetry-test-model", backend="ollama", local_model_name="tm")
+
+    async def fake_create(**_: Any) -> Any:
+        usage = SimpleNamespace(prompt_tokens=5, completion_tokens=3, total_tokens=8)
+        message = SimpleNamespace(content="hi", reasoning=None)
+        return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=message)])
+
+    async def _run() -> str:
+        aclient = client.aclient
+        assert aclient is not None
+        aclient.chat.completions.create = fake_create  # type: ignore[method-assign]
+        return await client.agenerate_text([{"role": "user", "content": "q"}])
+
+    assert asyncio.run(_run()) == "hi"
+    (row,) = [r for r in telemetry().summary() if r["model"] == "tm"]
+    assert row["kind"] == "chat" and row["outcomes"] == {"ok": 1}
+    assert row["completion_tokens"] == 3
+
+
+def test_single_embedding_calls_are_recorded() -> None:
+    client = LLMClient(model="telemetry-embed-model", backend="ollama", local_model_name="te")
+    client.response_cache = None
+    outcomes = iter([None, ValueError("boom")])
+
+    async def fake_create(**_: Any) -> Any:
+        if (error := next(outcomes)) is not None:
+            raise error
+        usage = SimpleNamespace(prompt_tokens=4, total_tokens=4)
+        return SimpleNamespace(usage=usage, data=[SimpleNamespace(embedding=[0.5])])
+
+    async def _run() -> None:
+        aclient = client.aclient
+        assert aclient is not None
+        aclient.embeddings.create = fake_create  # type: ignore[method-assign]
+        assert await client.aembed_text("q", model="telemetry-embed") == [0.5]
+        try:
+            await client.aembed_text("r", model="telemetry-embed")
+        except ValueError:
+            pass
+
+    asyncio.run(_run())
+    (row,) = [r for r in telemetry().summary() if r["model"] == "telemetry-embed"]
+    assert row["kind"] == "embed" and row["outcomes"] == {"ok": 1, "error": 1}
+    assert row["prompt_tokens"] == 4
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def test_retried_and_sync_calls_carry_attempt_numbers() -> None:
+    from openai import RateLimitError
+
+    client = LLMClient(model="telemetry-retry-model", backend="ollama", local_model_name="tr")
+    client.rate_limiter = None  # a 429 would throttle the shared limiter for seconds
+    usage = SimpleNamespace(prompt_tokens=5, completion_tokens=3, total_tokens=8)
+    response = SimpleNamespace(
+        usage=usage,
+        choices=[SimpleNamespace(message=SimpleNamespace(content="hi", parsed=Answer(text="hi")))],
+    )
+    calls = 0
+
+    async def flaky_parse(**_: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RateLimitError(
+                "429",
+                response=SimpleNamespace(request=None, status_code=429, headers={}),
+                body=None,
+            )
+        return response
+
+    async def no_wait(*_: Any, **__: Any) -> None:
+        return None
+
+    async def _run() -> None:
+        aclient = client.aclient
+        assert aclient is not None
+        aclient.beta.chat.completions.parse = flaky_parse  # type: ignore[method-assign]
+        await client.agenerate_with_trace([{"role": "user", "content": "q"}], Answer)
+
+    assert client.client is not None
+    client.client.chat.completions.create = lambda **_: response  # type: ignore[method-assign]
+    LLMClient._agenerate_with_trace_inner.retry.sleep = no_wait  # type: ignore[attr-defined]
+    events: list[CallEvent] = []
+    sink = telemetry()
+    original_emit = sink.emit
+    sink.emit = events.append  # type: ignore[method-assign]
+    try:
+        asyncio.run(_run())
+        assert client.generate_text([{"role": "user", "content": "q"}]) == "hi"
+    finally:
+        sink.emit = original_emit  # type: ignore[method-assign]
+
+    assert [(e.kind, e.outcome, e.attempt) for e in events] == [
+        ("parse", "rate_limited", 1),
+        ("parse", "ok", 2),
+        ("chat", "ok", 1),
+    ]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+from confidence_tom.infra.client import LLMClient
+from confidence_tom.infra.token_budget import (
+    PromptTooLongError,
+    TokenBudget,
+    calibrate,
+    chars_per_token,
+    preflight,
+)
+
+
+class _Answer(BaseModel):
+    answer: str
+
+
+def _messages(chars: int) -> list[dict[str, Any]]:
+    return [
+        {"role": "system", "content": "Solve the problem."},
+        {"role": "user", "content": "x" * chars},
+    ]
+
+
+def test_preflight_fits_max_tokens_and_refuses_overflow() -> None:
+    budget = TokenBudget(min_completion_tokens=100, margin_tokens=0)
+    fitted = preflight(_messages(3000), model="m", max_tokens=4096, window=2000, budget=budget)
+    assert fitted.prompt_tokens == 755 + 8
+    assert fitted.max_tokens == 2000 - 763
+    with pytest.raises(PromptTooLongError):
+        preflight(_messages(8000), model="m", max_tokens=4096, window=2000, budget=budget)
+
+
+def test_preflight_trims_middle_of_longest_message() -> None:
+    budget = TokenBudget(overflow="trim", min_completion_tokens=100, margin_tokens=0)
+    messages = _messages(8000)
+    messages[1]["content"] = "HEAD" + "x" * 7992 + "TAIL"
+    fitted = preflight(messages, model="m", max_tokens=4096, window=2000, budget=budget)
+    content = fitted.messages[1]["content"]
+    assert fitted.trimmed_chars > 0 and "characters trimmed" in content
+    assert content.startswith("HEAD") and content.endswith("TAIL")
+    assert fitted.max_tokens >= 100 and fitted.messages[0] == messages[0]
+
+
+def test_calibration_tracks_observed_prompt_tokens() -> None:
+    calibrate("calibrated/model", _messages(3000), 1508)
+    assert chars_per_token("calibrated/model") == pytest.approx(3018 / 1500)
+
+
+def test_ollama_request_gets_num_predict_and_num_ctx() -> None:
+    client = LLMClient(
+        model="qwen/qwen3-14b",
+        backend="ollama",
+        local_model_name="qwen3:14b",
+        max_tokens=8192,
+        num_ctx=6144,
+        token_budget=TokenBudget(),
+    )
+    sent: dict[str, Any] = {}
+
+    async def fake_send(aclient: Any, kind: str, messages: Any, **kwargs: Any) -> Any:
+        sent.update(kwargs)
+
+    client._asend = fake_send  # type: ignore[method-assign]
+    asyncio.run(client._acreate("chat", _messages(12000), **client._completion_kwargs()))
+
+    assert sent["max_tokens"] == 6144 - 3013 - 64
+    assert sent["extra_body"]["options"] == {"num_ctx": 6144, "num_predict": sent["max_tokens"]}
+
+
+def test_ollama_num_ctx_is_fixed_across_request_sizes() -> None:
+    client = LLMClient(
+        model="qwen/qwen3-14b",
+        backend="ollama",
+        local_model_name="qwen3:14b",
+        max_tokens=1024,
+        token_budget=TokenBudget(context_window=16384),
+    )
+    sent: list[dict[str, Any]] = []
+
+    async def fake_send(aclient: Any, kind: str, messages: Any, **kwargs: Any) -> Any:
+        sent.append(kwargs["extra_body"]["options"])
+
+    client._asend = fake_send  # type: ignore[method-assign]
+    for chars in (400, 20000):
+        asyncio.run(client._acreate("chat", _messages(chars), **client._completion_kwargs()))
+
+    assert [options["num_ctx"] for options in sent] == [16384, 16384]
+    assert all(options["num_predict"] == 1024 for options in sent)
+
+
+def test_prompt_overflow_propagates_from_public_methods() -> None:
+    client = LLMClient(
+        model="qwen/qwen3-14b",
+        backend="ollama",
+        local_model_name="qwen3:14b",
+        token_budget=TokenBudget(context_window=2000),
+    )
+    messages = _messages(20000)
+
+    async def fail_send(*_: Any, **__: Any) -> Any:
+        raise AssertionError("an oversized prompt must not be sent")
+
+    client._asend = fail_send  # type: ignore[method-assign]
+    with pytest.raises(PromptTooLongError):
+        asyncio.run(client.agenerate_text(messages))
+    with pytest.raises(PromptTooLongError):
+        asyncio.run(client.agenerate_text_with_trace(messages))
+    with pytest.raises(PromptTooLongError):
+        asyncio.run(client.agenerate_with_trace(messages, _Answer))
+    with pytest.raises(PromptTooLongError):
+        client.generate_text(messages)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Build a replay cassette from stored ApiTrace dumps (result files, partial stores)."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from confidence_tom.infra.replay import build_cassette, write_cassette
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a replay cassette for backend='replay'")
+    parser.add_argument("sources", nargs="+", type=Path, help="JSON/JSONL files or directories")
+    parser.add_argument("--out", type=Path, required=True, help="Cassette JSONL to write")
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        default=None,
+        help="llm_calls.jsonl from the same run, used for latency emulation",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    entries = build_cassette(args.sources, telemetry_path=args.telemetry)
+    count = write_cassette(entries, args.out)
+    models = sorted({entry.model for entry in entries})
+    print(f"wrote {count} entries for {len(models)} models to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
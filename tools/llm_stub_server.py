@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""Fault-injecting OpenAI-compatible stub server for load tests.
+
+Serves ``/v1/chat/completions`` (plain, ``response_format`` structured output and
+SSE streaming), ``/v1/embeddings`` and ``/v1/models`` with configurable latency
+distributions, 429/5xx injection, an optional requests/min budget enforced with
+``x-ratelimit-*`` headers, token accounting and ``reasoning`` fields. Point
+``LLMClient`` at it with ``OPENROUTER_BASE_URL=http://127.0.0.1:<port>/v1`` (or
+``OLLAMA_BASE_URL``). ``GET /stats`` reports what was served and ``POST
+/stats/reset`` clears it between load levels.
+
+    python tools/llm_stub_server.py --port 8765 --median-sec 1.5 --rate-429 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+_MAX_LATENCY_SAMPLES = 100_000
+
+
+@dataclass
+class StubConfig:
+    latency: str = "lognormal"  # fixed | uniform | lognormal
+    median_sec: float = 0.5
+    sigma: float = 0.5
+    per_token_ms: float = 0.0
+    ttft_frac: float = 0.2
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after_sec: float = 1.0
+    rpm_limit: float = 0.0
+    completion_tokens: int = 256
+    reasoning_tokens: int = 64
+    embedding_dim: int = 256
+    seed: int | None = None
+
+
+def add_stub_args(parser: argparse.ArgumentParser) -> None:
+    defaults = StubConfig()
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median-sec", type=float, default=defaults.median_sec)
+    parser.add_argument("--sigma", type=float, default=defaults.sigma, help="lognormal sigma")
+    parser.add_argument("--per-token-ms", type=float, default=defaults.per_token_ms)
+    parser.add_argument("--ttft-frac", type=float, default=defaults.ttft_frac)
+    parser.add_argument("--rate-429", type=float, default=defaults.rate_429)
+    parser.add_argument("--rate-5xx", type=float, default=defaults.rate_5xx)
+    parser.add_argument("--retry-after-sec", type=float, default=defaults.retry_after_sec)
+    parser.add_argument("--rpm-limit", type=float, default=defaults.rpm_limit, help="0 = none")
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens)
+    parser.add_argument("--reasoning-tokens", type=int, default=defaults.reasoning_tokens)
+    parser.add_argument("--embedding-dim", type=int, default=defaults.embedding_dim)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(**{f.name: getattr(args, f.name) for f in fields(StubConfig)})
+
+
+def _quantile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))], 4)
+
+
+class StubStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.requests: dict[str, int] = {}
+            self.statuses: dict[str, int] = {}
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.reasoning_tokens = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.latencies: deque[float] = deque(maxlen=_MAX_LATENCY_SAMPLES)
+
+    def begin(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def end(self, status: int, latency: float, usage: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+            if status == 200:
+                self.latencies.append(latency)
+            if usage:
+                self.prompt_tokens += int(usage.get("prompt_tokens", 0))
+                self.completion_tokens += int(usage.get("completion_tokens", 0))
+                details = usage.get("completion_tokens_details") or {}
+                self.reasoning_tokens += int(details.get("reasoning_tokens", 0))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                "elapsed_sec": round(time.time() - self.started, 3),
+                "requests": dict(self.requests),
+                "statuses": dict(self.statuses),
+                "ok": len(latencies),
+                "peak_in_flight": self.peak_in_flight,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "reasoning_tokens": self.reasoning_tokens,
+                "latency_sec": {
+                    "p50": _quantile(latencies, 0.5),
+                    "p95": _quantile(latencies, 0.95),
+                    "p99": _quantile(latencies, 0.99),
+                },
+            }
+
+
+class _RequestBudget:
+    """Sliding one-minute request window used to emit realistic 429s."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sent: deque[float] = deque()
+
+    def take(self, rpm: float) -> tuple[bool, int, float]:
+        now = time.monotonic()
+        with self._lock:
+            while self._sent and now - self._sent[0] >= 60.0:
+                self._sent.popleft()
+            reset = 60.0 - (now - self._sent[0]) if self._sent else 60.0
+            if len(self._sent) >= rpm:
+                return False, 0, reset
+            self._sent.append(now)
+            return True, int(rpm) - len(self._sent), reset
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    chars = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            chars += sum(
+                len(str(part.get("text", ""))) for part in content if isinstance(part, dict)
+            )
+        else:
+            chars += len(str(content))
+    return max(1, chars // 4)
+
+
+def _sample_schema(schema: dict[str, Any], defs: dict[str, Any], rng: random.Random) -> Any:
+    if "$ref" in schema:
+        return _sample_schema(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs, rng)
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if combinator in schema:
+            options = [s for s in schema[combinator] if s.get("type") != "null"]
+            return _sample_schema(options[0] if options else {}, defs, rng)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        return {
+            name: _sample_schema(prop, defs, rng)
+            for name, prop in (schema.get("properties") or {}).items()
+        }
+    if kind == "array":
+        count = max(int(schema.get("minItems", 1)), min(3, int(schema.get("maxItems", 3))))
+        return [_sample_schema(schema.get("items") or {}, defs, rng) for _ in range(count)]
+    if kind in {"integer", "number"}:
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", low + 100))
+        value = rng.uniform(low, high)
+        return int(round(value)) if kind == "integer" else round(value, 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return "stub"
+
+
+def _text_completion(rng: random.Random, tokens: int) -> str:
+    steps = max(1, tokens // 48)
+    lines = [
+        f"Step {i}: " + " ".join(f"w{rng.randint(0, 999)}" for _ in range(8))
+        for i in range(1, steps + 1)
+    ]
+    lines.append(f"Final Answer: \\boxed{{{rng.randint(0, 99)}}}")
+    return "\n".join(lines)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], config: StubConfig) -> None:
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = StubStats()
+        self.budget = _RequestBudget()
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def draw(self) -> tuple[float, float]:
+        """Return ``(uniform draw for fault injection, sampled base latency)``."""
+        config = self.config
+        with self.rng_lock:
+            roll = self.rng.random()
+            if config.latency == "fixed":
+                latency = config.median_sec
+            elif config.latency == "uniform":
+                latency = self.rng.uniform(0.0, 2 * config.median_sec)
+            else:
+                latency = config.median_sec * math.exp(self.rng.gauss(0.0, config.sigma))
+        return roll, max(0.0, latency)
+
+    def request_rng(self) -> random.Random:
+        with self.rng_lock:
+            return random.Random(self.rng.getrandbits(64))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def _send_json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.server.stats.snapshot())
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub/model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        path = self.path.rstrip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+        if path.endswith("/stats/reset"):
+            self.server.stats.reset()
+            self._send_json(200, {"ok": True})
+            return
+        if path.endswith("/chat/completions"):
+            endpoint = "chat.stream" if body.get("stream") else "chat"
+            if "response_format" in body:
+                endpoint = "parse"
+        elif path.endswith("/embeddings"):
+            endpoint = "embeddings"
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        stats = self.server.stats
+        stats.begin(endpoint)
+        started = time.monotonic()
+        status, usage = 500, None
+        try:
+            status, usage = self._serve(endpoint, body)
+        finally:
+            stats.end(status, time.monotonic() - started, usage)
+
+    def _inject_fault(self, roll: float, latency: float) -> tuple[int | None, dict[str, str]]:
+        """Send an error response when this request draws a fault; else return rate headers."""
+        config = self.server.config
+        headers: dict[str, str] = {}
+        if config.rpm_limit > 0:
+            allowed, remaining, reset = self.server.budget.take(config.rpm_limit)
+            headers = {
+                "x-ratelimit-limit-requests": str(int(config.rpm_limit)),
+                "x-ratelimit-remaining-requests": str(remaining),
+                "x-ratelimit-reset-requests": f"{reset:.3f}s",
+            }
+            if not allowed:
+                headers["retry-after"] = f"{reset:.3f}"
+                self._send_json(429, {"error": {"message": "rate limited (rpm)"}}, headers)
+                return 429, headers
+        if roll < config.rate_429:
+            headers["retry-after"] = str(config.retry_after_sec)
+            self._send_json(429, {"error": {"message": "rate limited (injected)"}}, headers)
+            return 429, headers
+        if roll < config.rate_429 + config.rate_5xx:
+            time.sleep(latency * 0.5)
+            status = (500, 502, 503)[int(roll * 1000) % 3]
+            self._send_json(status, {"error": {"message": "injected upstream error"}})
+            return status, headers
+        return None, headers
+
+    def _serve(self, endpoint: str, body: dict[str, Any]) -> tuple[int, dict[str, Any] | None]:
+        config = self.server.config
+        roll, latency = self.server.draw()
+        status, headers = self._inject_fault(roll, latency)
+        if status is not None:
+            return status, None
+        if endpoint == "embeddings":
+            return self._embeddings(body, latency, headers)
+
+        rng = self.server.request_rng()
+        messages = body.get("messages") or []
+        prompt_tokens = _prompt_tokens(messages)
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = (response_format.get("json_schema") or {}).get("schema") or {}
+            content = json.dumps(_sample_schema(schema, schema.get("$defs", {}), rng))
+        else:
+            budget = min(config.completion_tokens, int(body.get("max_tokens") or 10**9))
+            content = _text_completion(rng, budget)
+        reasoning_cfg = body.get("reasoning") or {}
+        wants_reasoning = bool(reasoning_cfg) and reasoning_cfg.get("effort") != "none"
+        reasoning = (
+            " ".join(f"r{rng.randint(0, 999)}" for _ in range(config.reasoning_tokens))
+            if wants_reasoning and config.reasoning_tokens
+            else ""
+        )
+        completion_tokens = _estimate_tokens(content)
+        reasoning_tokens = len(reasoning.split()) if reasoning else 0
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens + reasoning_tokens,
+            "total_tokens": prompt_tokens + completion_tokens + reasoning_tokens,
+            "completion_tokens_details": {"reasoning_tokens": reasoning_tokens},
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        total = latency + (completion_tokens + reasoning_tokens) * config.per_token_ms / 1000.0
+        response_id = f"gen-stub-{uuid.uuid4().hex[:16]}"
+        model = str(body.get("model") or "stub/model")
+        if body.get("stream"):
+            self._stream(response_id, model, content, reasoning, usage, total, headers)
+            return 200, usage
+        time.sleep(total)
+        message: dict[str, Any] = {"role": "assistant", "content": content}
+        if reasoning:
+            message["reasoning"] = reasoning
+        self._send_json(
+            200,
+            {
+                "id": response_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+                "usage": usage,
+            },
+            headers,
+        )
+        return 200, usage
+
+    def _stream(
+        self,
+        response_id: str,
+        model: str,
+        content: str,
+        reasoning: str,
+        usage: dict[str, Any],
+        total: float,
+        headers: dict[str, str],
+    ) -> None:
+        config = self.server.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        pieces = content.splitlines(keepends=True)
+        deltas: list[dict[str, Any]] = [{"reasoning": reasoning}] if reasoning else []
+        deltas += [{"content": piece} for piece in pieces]
+        ttft = total * config.ttft_frac
+        gap = (total - ttft) / max(1, len(deltas))
+        time.sleep(ttft)
+
+        def _event(choices: list[dict[str, Any]], **extra: Any) -> bytes:
+            chunk = {
+                "id": response_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        try:
+            for i, delta in enumerate(deltas):
+                if i:
+                    time.sleep(gap)
+                self._write_chunk(_event([{"index": 0, "delta": delta}]))
+            self._write_chunk(_event([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            self._write_chunk(_event([], usage=usage))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early (e.g. after the Final Answer line).
+            self.close_connection = True
+
+    def _embeddings(
+        self, body: dict[str, Any], latency: float, headers: dict[str, str]
+    ) -> tuple[int, dict[str, Any]]:
+        dim = self.server.config.embedding_dim
+        inputs = body.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = []
+        for i, text in enumerate(inputs):
+            seed = int.from_bytes(hashlib.sha256(str(text).encode()).digest()[:8], "little")
+            rng = random.Random(seed)
+            vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+            norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+            data.append(
+                {"object": "embedding", "index": i, "embedding": [x / norm for x in vector]}
+            )
+        tokens = sum(_estimate_tokens(str(text)) for text in inputs)
+        usage = {"prompt_tokens": tokens, "total_tokens": tokens}
+        time.sleep(latency)
+        self._send_json(
+            200,
+            {"object": "list", "model": body.get("model", ""), "data": data, "usage": usage},
+            headers,
+        )
+        return 200, usage
+
+
+def serve_in_thread(
+    config: StubConfig, host: str = "127.0.0.1", port: int = 0
+) -> tuple[StubServer, threading.Thread]:
+    """Start a stub server on a daemon thread; ``port=0`` picks a free port."""
+    server = StubServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fault-injecting stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_args(parser)
+    args = parser.parse_args()
+    config = config_from_args(args)
+    server = StubServer((args.host, args.port), config)
+    print(f"llm stub listening on {server.base_url} config={json.dumps(asdict(config))}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
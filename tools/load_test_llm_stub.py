@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Throughput and latency curves for LLM call paths against the stub server.
+
+Starts ``tools/llm_stub_server.py`` in-process and, for each concurrency level,
+either drives ``LLMClient`` directly (``--mode client``: a mix of text, parse,
+stream and embedding calls through the real retry, rate-limit and pooling code)
+or runs a real runner command against the stub (``--mode runner``; ``{concurrency}``
+and ``{out_dir}`` in ``--runner-cmd`` are substituted per level). In client
+mode, learned rate limits, hedge latency windows and telemetry are reset before
+each level so every point is measured from the same cold state. Results are
+printed as a table, written as JSON and optionally plotted.
+
+    python tools/load_test_llm_stub.py --levels 1,8,64,256,500 --rate-429 0.02
+    python tools/load_test_llm_stub.py --mode runner --levels 4,16,64 --runner-cmd \\
+        "python experiments/mainline/run/core/run_prefix_reentry_controls.py \\
+         --max-rows 20 --concurrency {concurrency} --output-dir {out_dir}"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shlex
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from llm_stub_server import (  # noqa: E402
+    StubServer,
+    add_stub_args,
+    config_from_args,
+    serve_in_thread,
+)
+
+from confidence_tom.infra.http_pool import closing_shared_clients  # noqa: E402
+from confidence_tom.infra.paths import output_root  # noqa: E402
+
+
+class _StubAnswer(BaseModel):
+    reasoning: str = ""
+    answer: str = ""
+    confidence: int = Field(default=50, ge=0, le=100)
+
+
+def _quantile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))], 4)
+
+
+def _stub_call(server: StubServer, path: str, method: str = "GET") -> dict[str, Any]:
+    request = urllib.request.Request(
+        server.base_url + path, method=method, data=b"{}" if method == "POST" else None
+    )
+    with urllib.request.urlopen(request) as response:
+        return dict(json.loads(response.read()))
+
+
+async def _client_level(concurrency: int, total: int, mix: list[str], model: str) -> dict[str, Any]:
+    from confidence_tom.infra.client import LLMClient
+    from confidence_tom.infra.hedging import reset_latencies
+    from confidence_tom.infra.rate_limit import reset_rate_limiters
+    from confidence_tom.infra.telemetry import telemetry, telemetry_summary
+
+    reset_rate_limiters()
+    reset_latencies()
+    telemetry().reset()
+    client = LLMClient(model=model, max_tokens=512)
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def _one(i: int) -> None:
+        nonlocal failures
+        kind = mix[i % len(mix)]
+        messages = [{"role": "user", "content": f"Load test request {i}: solve 2+{i}."}]
+        async with sem:
+            started = time.monotonic()
+            if kind == "parse":
+                ok = (await client.agenerate_parsed(messages, _StubAnswer)) is not None
+            elif kind == "stream":
+                text, _ = await client.agenerate_text_stream_with_trace(messages, use_cache=False)
+                ok = bool(text)
+            elif kind == "embed":
+                ok = bool(await client.aembed_batch([messages[0]["content"]], use_cache=False))
+            else:
+                text, _ = await client.agenerate_text_with_trace(messages, use_cache=False)
+                ok = bool(text)
+            latencies.append(time.monotonic() - started)
+        if not ok:
+            failures += 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(_one(i) for i in range(total)), return_exceptions=False)
+    wall = time.monotonic() - started
+    return {
+        "wall_sec": round(wall, 3),
+        "calls": total,
+        "failures": failures,
+        "throughput_rps": round((total - failures) / wall, 3) if wall else None,
+        "latency_sec": {
+            "p50": _quantile(latencies, 0.5),
+            "p95": _quantile(latencies, 0.95),
+            "p99": _quantile(latencies, 0.99),
+        },
+        "llm_calls": telemetry_summary(),
+    }
+
+
+def _runner_level(cmd: str, concurrency: int, out_dir: Path, env: dict[str, str]) -> dict[str, Any]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    command = cmd.format(concurrency=concurrency, out_dir=out_dir)
+    started = time.monotonic()
+    result = subprocess.run(
+        shlex.split(command),
+        env=env,
+        stdout=(out_dir / "stdout.log").open("w"),
+        stderr=subprocess.STDOUT,
+    )
+    return {"wall_sec": round(time.monotonic() - started, 3), "returncode": result.returncode}
+
+
+def _plot(rows: list[dict[str, Any]], path: Path) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    levels = [row["concurrency"] for row in rows]
+    fig, (ax_tp, ax_lat) = plt.subplots(1, 2, figsize=(11, 4))
+    ax_tp.plot(levels, [row["throughput_rps"] for row in rows], marker="o")
+    ax_tp.set(xscale="log", xlabel="concurrency", ylabel="ok responses / s", title="Throughput")
+    for q in ("p50", "p95", "p99"):
+        ax_lat.plot(levels, [row["latency_sec"][q] for row in rows], marker="o", label=q)
+    ax_lat.set(xscale="log", xlabel="concurrency", ylabel="seconds", title="Latency")
+    ax_lat.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test LLM call paths against a stub server")
+    parser.add_argument("--mode", choices=["client", "runner"], default="client")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64,128,256,500")
+    parser.add_argument("--calls-per-level", type=int, default=0, help="default 4x level (>=50)")
+    parser.add_argument("--mix", default="text,parse,stream,embed")
+    parser.add_argument("--model", default="stub/model")
+    parser.add_argument("--runner-cmd", default="")
+    parser.add_argument("--backend-env", choices=["openrouter", "ollama"], default="openrouter")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--plot", action="store_true")
+    add_stub_args(parser)
+    args = parser.parse_args()
+    if args.mode == "runner" and not args.runner_cmd:
+        parser.error("--mode runner needs --runner-cmd")
+
+    server, _ = serve_in_thread(config_from_args(args), port=args.port)
+    base_url = server.base_url
+    if args.backend_env == "openrouter":
+        stub_env = {"OPENROUTER_BASE_URL": base_url, "OPENROUTER_API_KEY": "stub"}
+    else:
+        stub_env = {"OLLAMA_BASE_URL": base_url, "OLLAMA_API_KEY": "stub"}
+    os.environ.update(stub_env)
+    out_root = args.out or output_root() / "load_tests" / datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_root.mkdir(parents=True, exist_ok=True)
+    print(f"stub at {base_url}; writing to {out_root}")
+
+    rows: list[dict[str, Any]] = []
+    for level in [int(x) for x in args.levels.split(",") if x.strip()]:
+        _stub_call(server, "/stats/reset", method="POST")
+        if args.mode == "client":
+            total = args.calls_per_level or max(50, 4 * level)
+            mix = [m.strip() for m in args.mix.split(",") if m.strip()]
+            measured = asyncio.run(
+                closing_shared_clients(_client_level(level, total, mix, args.model))
+            )
+        else:
+            measured = _runner_level(
+                args.runner_cmd, level, out_root / f"c{level}", {**os.environ, **stub_env}
+            )
+        stub = _stub_call(server, "/stats")
+        if args.mode == "runner":
+            wall = measured["wall_sec"]
+            measured["throughput_rps"] = round(stub["ok"] / wall, 3) if wall else None
+            measured["latency_sec"] = stub["latency_sec"]
+        row = {"concurrency": level, **measured, "stub": stub}
+        rows.append(row)
+        statuses = ", ".join(f"{k}={v}" for k, v in sorted(stub["statuses"].items()))
+        print(
+            f"c={level:>4} wall={measured['wall_sec']:>8.2f}s "
+            f"tput={measured['throughput_rps']} rps "
+            f"p50={measured['latency_sec']['p50']} p95={measured['latency_sec']['p95']} "
+            f"peak_in_flight={stub['peak_in_flight']} ({statuses})",
+            flush=True,
+        )
+
+    (out_root / "load_test.json").write_text(json.dumps(rows, indent=2))
+    if args.plot:
+        _plot(rows, out_root / "load_test.png")
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 """Run BIRD-SQL with benchmark-native execution evaluation.
 
 Generation is still model-driven here, but evaluation is the official
-execution-match style used by BIRD.
+execution-match style used by BIRD. Predictions are written as they are
+generated and then scored in one batch with ``bird_exec.evaluate_many``.
 """
 
 from __future__ import annotations
@@ -9,7 +10,6 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
-import sqlite3
 import sys
 from pathlib import Path
 from typing import Any
@@ -17,8 +17,11 @@ from typing import Any
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
+from confidence_tom.benchmarks.bird_exec import evaluate_many  # noqa: E402
+from confidence_tom.benchmarks.bird_schema import prompt_schema  # noqa: E402
 from confidence_tom.eval.evaluators import extract_sql  # noqa: E402
 from confidence_tom.infra.client import LLMClient  # noqa: E402
+from confidence_tom.infra.http_pool import closing_shared_clients  # noqa: E402
 
 
 def load_items(split: str) -> tuple[list[dict[str, Any]], Path]:
@@ -33,27 +36,29 @@ def load_items(split: str) -> tuple[list[dict[str, Any]], Path]:
     return json.loads(questions_file.read_text(encoding="utf-8")), db_dir
 
 
-def schema_for_db(db_path: Path) -> str:
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
-    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND sql IS NOT NULL")
-    rows = [row[0] for row in cursor.fetchall() if row[0]]
-    conn.close()
-    return "\n\n".join(rows)
+def schema_for_db(
+    db_path: Path, question: str = "", evidence: str = "", linking: bool = False
+) -> str:
+    return prompt_schema(db_path, question, evidence, linking=linking)
 
 
-def evaluate(pred_sql: str, gold_sql: str, db_path: Path) -> bool:
-    try:
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-        cursor.execute(pred_sql)
-        pred_rows = set(map(tuple, cursor.fetchall()))
-        cursor.execute(gold_sql)
-        gold_rows = set(map(tuple, cursor.fetchall()))
-        conn.close()
-        return pred_rows == gold_rows
-    except Exception:
-        return False
+def evaluate(results: list[dict[str, Any]], db_dir: Path, max_workers: int | None) -> None:
+    items = [
+        (
+            row["predicted_sql"],
+            row["ground_truth_sql"],
+            str(db_dir / row["db_id"] / f"{row['db_id']}.sqlite"),
+            row["db_id"],
+        )
+        for row in results
+    ]
+    for row, correct in zip(results, evaluate_many(items, max_workers=max_workers)):
+        row["correct"] = correct
+
+
+def write_results(path: Path, results: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
 async def amain() -> None:
@@ -62,15 +67,29 @@ async def amain() -> None:
     parser.add_argument("--split", default="dev")
     parser.add_argument("--num-samples", type=int, default=10)
     parser.add_argument("--output", default="outputs/results/bird_sql_native.json")
+    parser.add_argument(
+        "--schema-linking",
+        action="store_true",
+        help="Prompt with only the tables/columns matching the question and hint",
+    )
+    parser.add_argument(
+        "--eval-workers",
+        type=int,
+        default=None,
+        help="Processes for execution-match evaluation (default: CPU count)",
+    )
     args = parser.parse_args()
 
     client = LLMClient(model=args.model, temperature=0.0, max_tokens=1024)
     items, db_dir = load_items(args.split)
+    output = Path(args.output)
     results = []
     for idx, item in enumerate(items[: args.num_samples]):
         db_id = item["db_id"]
         db_path = db_dir / db_id / f"{db_id}.sqlite"
-        schema = schema_for_db(db_path)
+        schema = schema_for_db(
+            db_path, item["question"], item.get("evidence", ""), args.schema_linking
+        )
         prompt = (
             f"Database: {db_id}\n\n"
             f"Question: {item['question']}\n\n"
@@ -92,17 +111,16 @@ async def amain() -> None:
                 "db_id": db_id,
                 "predicted_sql": sql,
                 "ground_truth_sql": item["SQL"],
-                "correct": evaluate(sql, item["SQL"], db_path),
             }
         )
-        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-        Path(args.output).write_text(
-            json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        write_results(output, results)
+
+    evaluate(results, db_dir, args.eval_workers)
+    write_results(output, results)
 
 
 def main() -> None:
-    asyncio.run(amain())
+    asyncio.run(closing_shared_clients(amain()))
 
 
 if __name__ == "__main__":
@@ -19,6 +19,7 @@ sys.path.insert(0, str(ROOT / "src"))
 from plancraft.simple import PlancraftGymWrapper, get_plancraft_examples  # noqa: E402
 
 from confidence_tom.infra.client import LLMClient  # noqa: E402
+from confidence_tom.infra.http_pool import closing_shared_clients  # noqa: E402
 
 SYSTEM_PROMPT = """You are solving a Plancraft task in the native environment.
 You must output exactly one next action each turn.
@@ -101,7 +102,7 @@ async def amain() -> None:
 
 
 def main() -> None:
-    asyncio.run(amain())
+    asyncio.run(closing_shared_clients(amain()))
 
 
 if __name__ == "__main__":
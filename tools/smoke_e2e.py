@@ -604,7 +604,9 @@ async def amain() -> None:
 
 
 def main() -> None:
-    asyncio.run(amain())
+    from confidence_tom.infra.http_pool import closing_shared_clients
+
+    asyncio.run(closing_shared_clients(amain()))
 
 
 if __name__ == "__main__":
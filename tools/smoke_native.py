@@ -238,4 +238,6 @@ async def amain() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(amain())
+    from confidence_tom.infra.http_pool import closing_shared_clients
+
+    asyncio.run(closing_shared_clients(amain()))